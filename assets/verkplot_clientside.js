@@ -0,0 +1,208 @@
+// Clientside link budget callbacks (enabled with VERKPLOT_CLIENTSIDE=1)
+// Mirrors link_budget_figures / build_line_figure in wireless_link_budget_dashboard.py:
+// the server ships the device table and base path loss curves, the browser applies the
+// device offsets (tx_power + tx_eff + rx_eff - PL) and builds the figures locally.
+//--------------------------------------------------------------------------------------
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    verkplot: {
+        update_link_budget: function(tx_dropdown, rx_dropdown, path_loss, link_settings, devices) {
+            if (!path_loss || !devices || !(tx_dropdown in devices.records) || !(rx_dropdown in devices.records)) {
+                return [{}, {}, {}, {}];
+            }
+
+            var settings = Object.assign({
+                tx_ant_height: path_loss.tx_ant_height,
+                rx_ant_height: path_loss.rx_ant_height,
+                distance_target: path_loss.distance_target
+            }, link_settings || {});
+
+            var tx_device = devices.records[tx_dropdown];
+            var rx_device = devices.records[rx_dropdown];
+            var distance_list = path_loss.distance;
+            var models = path_loss.models;
+
+            var uplink = path_loss.uplink;
+            var downlink = path_loss.downlink;
+            if (settings.tx_ant_height !== path_loss.tx_ant_height || settings.rx_ant_height !== path_loss.rx_ant_height) {
+                uplink = propagation_curves(path_loss, distance_list, settings.tx_ant_height, settings.rx_ant_height, path_loss.uplink);
+                downlink = propagation_curves(path_loss, distance_list, settings.rx_ant_height, settings.tx_ant_height, path_loss.downlink);
+            }
+            var uplink_valid = validity_masks(path_loss, distance_list, settings.tx_ant_height, settings.rx_ant_height);
+            var downlink_valid = validity_masks(path_loss, distance_list, settings.rx_ant_height, settings.tx_ant_height);
+
+            var uplink_offset = tx_device['Transmit Power (dBm)'] + tx_device['Antenna Efficiency (dB)'] + rx_device['Antenna Efficiency (dB)'];
+            var downlink_offset = rx_device['Transmit Power (dBm)'] + rx_device['Antenna Efficiency (dB)'] + tx_device['Antenna Efficiency (dB)'];
+
+            var path_loss_traces = [];
+            var uplink_traces = [];
+            var downlink_traces = [];
+            models.forEach(function(model, k) {
+                path_loss_traces.push([model + '_uplink', uplink[k], uplink_valid[k]]);
+                uplink_traces.push(['rssi_' + model + '_uplink', rssi_calc(uplink_offset, uplink[k]), uplink_valid[k]]);
+                downlink_traces.push(['rssi_' + model + '_downlink', rssi_calc(downlink_offset, downlink[k]), downlink_valid[k]]);
+            });
+            models.forEach(function(model, k) {
+                path_loss_traces.push([model + '_downlink', downlink[k], downlink_valid[k]]);
+            });
+
+            var table = {
+                namespace: 'dash_table',
+                type: 'DataTable',
+                props: {
+                    id: 'datatable-interactivity',
+                    columns: devices.columns.map(function(column) { return {name: column, id: column}; }),
+                    data: [tx_device, rx_device],
+                    style_cell: {textAlign: 'center'},
+                    style_header: {fontWeight: 'bold', backgroundColor: 'rgb(230, 230, 230)', border: '1px solid black'},
+                    style_data: {border: '1px solid black'}
+                }
+            };
+
+            return [
+                line_figure(distance_list, path_loss_traces, 'Path Loss - ' + path_loss.label, 'Path Loss (dB)', settings.distance_target, path_loss.log_x),
+                line_figure(distance_list, uplink_traces, 'RSSI uplink - ' + path_loss.label, 'RSSI (dBm)', null, path_loss.log_x),
+                line_figure(distance_list, downlink_traces, 'RSSI downlink - ' + path_loss.label, 'RSSI (dBm)', null, path_loss.log_x),
+                [table]
+            ];
+        },
+
+        update_link_settings: function(distance_target, tx_ant_height, rx_ant_height, link_settings) {
+            var settings = Object.assign({}, link_settings || {});
+            if (distance_target !== null && distance_target !== undefined) {
+                settings.distance_target = distance_target;
+            }
+            if (tx_ant_height > 0) {
+                settings.tx_ant_height = tx_ant_height;
+            }
+            if (rx_ant_height > 0) {
+                settings.rx_ant_height = rx_ant_height;
+            }
+            return settings;
+        }
+    }
+});
+
+
+// RSSI = tx_power + tx_eff + rx_eff - PL, keeping undefined points (d <= 0) as gaps
+function rssi_calc(offset, path_loss_values) {
+    return path_loss_values.map(function(value) {
+        return value === null ? null : offset - value;
+    });
+}
+
+
+// Log-distance propagation models, same kernels as the built-in models registered in
+// PROPAGATION_MODEL_REGISTRY. Models without a kernel here keep their shipped curve.
+function propagation_curves(path_loss, distance_list, tx_ant_height, rx_ant_height, base_curves) {
+    var log_f = Math.log10(path_loss.frequency_MHz);
+    var log_hb = Math.log10(tx_ant_height);
+    var a_hm = rx_ant_height*1.1*log_f - 0.7*rx_ant_height - 1.56*log_f + 0.8;
+    var hata_slope = 44.9 - 6.55*log_hb;
+    var hata_intercept = 69.55 + 26.16*log_f - 13.82*log_hb - a_hm - 3*hata_slope;
+    var coefficients = {
+        'FSPL': [20*log_f - 27.55, 20],
+        'ITU_Indoor_PL': [20*log_f + path_loss.itu_coefficients[1] - 28, path_loss.itu_coefficients[0]],
+        'Okumura_Hata_PL': [hata_intercept, hata_slope],
+        'Okumura_Hata_Suburban_PL': [hata_intercept - 2*Math.pow(log_f - Math.log10(28), 2) - 5.4, hata_slope],
+        'COST231_Walfisch_Ikegami_PL': [42.6 + 20*log_f - 3*26, 26],
+        'Two_Ray_Ground_PL': [-20*log_hb - 20*Math.log10(rx_ant_height), 40]
+    };
+
+    return path_loss.models.map(function(model, k) {
+        if (!(model in coefficients)) {
+            return base_curves[k];
+        }
+        var intercept = coefficients[model][0];
+        var slope = coefficients[model][1];
+        return distance_list.map(function(distance) {
+            return distance > 0 ? intercept + slope*Math.log10(distance) : null;
+        });
+    });
+}
+
+
+// Frequency/height dependent distance limits, same as the models' distance_bounds
+var DISTANCE_BOUNDS = {
+    'Two_Ray_Ground_PL': function(frequency_MHz, tx_ant_height, rx_ant_height) {
+        return [4*Math.PI*tx_ant_height*rx_ant_height*frequency_MHz/299.792458, null];
+    }
+};
+
+
+// Per model flags of the distances inside the model's declared validity range, same as
+// propagation_validity_mask (ranges are [lower, upper], null for an open end)
+function validity_masks(path_loss, distance_list, tx_ant_height, rx_ant_height) {
+    var values = {frequency_MHz: path_loss.frequency_MHz, tx_ant_height: tx_ant_height, rx_ant_height: rx_ant_height};
+    var inside = function(value, range) {
+        return (range[0] === null || value >= range[0]) && (range[1] === null || value <= range[1]);
+    };
+
+    return path_loss.models.map(function(model) {
+        var validity = path_loss.validity[model] || {};
+        var fixed_valid = Object.keys(validity).every(function(parameter) {
+            return parameter === 'distance_m' || inside(values[parameter], validity[parameter]);
+        });
+        var bounds = model in DISTANCE_BOUNDS ? DISTANCE_BOUNDS[model](path_loss.frequency_MHz, tx_ant_height, rx_ant_height) : null;
+        return distance_list.map(function(distance) {
+            return fixed_valid && (!validity.distance_m || inside(distance, validity.distance_m)) && (!bounds || inside(distance, bounds));
+        });
+    });
+}
+
+
+// PLOTLY_COLORWAY and the dotted '(outside validity range)' traces mirror build_line_figure
+var PLOTLY_COLORWAY = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf'];
+
+
+function line_figure(distance_list, traces, title, yaxis_title, distance_target, log_x) {
+    var layout = {
+        colorway: PLOTLY_COLORWAY,
+        title: {text: title},
+        xaxis: {title: {text: 'Distance (m)'}},
+        yaxis: {title: {text: yaxis_title}},
+        legend: {title: {text: 'variable'}, tracegroupgap: 0},
+        margin: {t: 60},
+        hovermode: 'closest'
+    };
+    if (log_x) {
+        layout.xaxis.type = 'log';
+    }
+
+    if (distance_target !== null) {
+        layout.shapes = [{type: 'line', xref: 'x', yref: 'y domain', x0: distance_target, x1: distance_target, y0: 0, y1: 1, line: {dash: 'dash'}}];
+        layout.annotations = [{x: distance_target, xref: 'x', xanchor: 'left', y: 0, yref: 'y domain', yanchor: 'bottom', showarrow: false, text: 'Target Distance = ' + distance_target + ' m', font: {size: 15}}];
+    }
+
+    var data = [];
+    var outside = [];
+    traces.forEach(function(trace, index) {
+        var x = distance_list;
+        var y = trace[1];
+        var valid = trace[2];
+        if (valid && valid.indexOf(true) === -1) {
+            // No valid point: the dotted trace carries the curve, the solid one only its legend entry
+            outside.push({
+                type: 'scattergl', mode: 'lines', name: trace[0] + ' (outside validity range)', legendgroup: trace[0], x: distance_list, y: y,
+                line: {color: PLOTLY_COLORWAY[index % PLOTLY_COLORWAY.length], dash: 'dot'}
+            });
+            x = [];
+            y = [];
+        } else if (valid && valid.indexOf(false) !== -1) {
+            var shown = valid.map(function(flag, i) {
+                return !flag || (i > 0 && !valid[i - 1]) || (i < valid.length - 1 && !valid[i + 1]);
+            });
+            outside.push({
+                type: 'scattergl', mode: 'lines', name: trace[0] + ' (outside validity range)', legendgroup: trace[0], x: distance_list,
+                y: y.map(function(value, i) { return shown[i] ? value : null; }),
+                line: {color: PLOTLY_COLORWAY[index % PLOTLY_COLORWAY.length], dash: 'dot'}
+            });
+            y = y.map(function(value, i) { return valid[i] ? value : null; });
+        }
+        data.push({type: 'scattergl', mode: 'lines', name: trace[0], legendgroup: trace[0], x: x, y: y});
+    });
+
+    return {
+        data: data.concat(outside),
+        layout: layout
+    };
+}
@@ -0,0 +1,238 @@
+# [Title - Wireless Link Budget Dashboard - benchmark suite]
+# Times the propagation models, RSSI calculation, device spec ingestion and the end to end
+# update_datatable callback across distance sweep sizes (200 -> 10^6 points) and device
+# catalog sizes (13 -> 100k rows), and compares the results against a JSON baseline.
+#
+#   python benchmarks/benchmark_link_budget.py                    run and compare to baseline.json
+#   python benchmarks/benchmark_link_budget.py --save-baseline    run and store a new baseline
+#   python benchmarks/benchmark_link_budget.py --quick -k RSSI    small sizes, names containing RSSI
+#
+# A benchmark regresses when its median exceeds baseline median x threshold (the baseline's
+# per benchmark 'threshold', else --threshold). Regressions make the script exit with 1.
+# Baselines are machine specific: regenerate them on the machine that runs the comparison.
+
+
+# Import all python modules and dependencies
+#---------------------------------------------------------
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import statistics
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import wireless_link_budget_dashboard as dashboard
+#---------------------------------------------------------
+
+
+# Benchmark parameters
+#---------------------------------------------------------
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DEFAULT_THRESHOLD = 1.5
+# Sub 0.1 ms benchmarks are dominated by timer and interpreter noise
+SMALL_BENCHMARK_S = 1e-4
+SMALL_BENCHMARK_THRESHOLD = 2.5
+DISTANCE_SIZES = (200, 10**4, 10**6)
+CATALOG_SIZES = (13, 10**4, 10**5)
+QUICK_DISTANCE_SIZES = (200, 10**4)
+QUICK_CATALOG_SIZES = (13, 10**4)
+# Target wall time per benchmark, repeats stop once it is spent (at least MIN_REPEATS)
+TIME_BUDGET_S = 1.0
+MIN_REPEATS = 5
+MAX_REPEATS = 200
+MIN_TIMING_S = 0.001
+#---------------------------------------------------------
+
+
+# Timing helpers
+#---------------------------------------------------------
+# Fast functions are called `number` times per timing so every timing lasts at least
+# MIN_TIMING_S; benchmarks with a setup step are always timed one call at a time.
+def measure(function, setup=None):
+    number = 1
+    if setup is None:
+        start = time.perf_counter()
+        function()
+        number = max(1, int(MIN_TIMING_S / max(time.perf_counter() - start, 1e-9)))
+
+    timings = []
+    deadline = time.perf_counter() + TIME_BUDGET_S
+    while len(timings) < MIN_REPEATS or (len(timings) < MAX_REPEATS and time.perf_counter() < deadline):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        timings.append((time.perf_counter() - start) / number)
+
+    return {'median_s': statistics.median(timings), 'min_s': min(timings), 'repeats': len(timings), 'number': number}
+
+
+def synthetic_catalog(num_devices, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+                            'Device': ['device_{}'.format(i) for i in range(num_devices)],
+                            'Transmit Power (dBm)': rng.uniform(-10, 20, num_devices).round(1).astype(np.float32),
+                            'Receive Sensitivity (dBm)': rng.integers(-115, -80, num_devices).astype(np.float32),
+                            'Antenna Efficiency (dB)': rng.uniform(-8, 0, num_devices).round(1).astype(np.float32),
+                        })
+
+
+def clear_caches():
+    dashboard.invalidate_derived_caches()
+#---------------------------------------------------------
+
+
+# Benchmarks
+# Every benchmark is (name, function, setup). Distances for the model benchmarks start at
+# 1 m so no NaN handling is timed.
+#---------------------------------------------------------
+def model_benchmarks(distance_sizes):
+    for num_points in distance_sizes:
+        distance_list = np.linspace(1, 10**4, num_points)
+        path_loss = np.stack(dashboard.subG_propagation_models(distance_list, 915, dashboard.DEFAULT_TX_ANTENNA_HEIGHT_M, dashboard.DEFAULT_RX_ANTENNA_HEIGHT_M))
+
+        yield 'BLE_propagation_models[{}]'.format(num_points), lambda d=distance_list: dashboard.BLE_propagation_models(d, 2440), None
+        yield 'subG_propagation_models[{}]'.format(num_points), lambda d=distance_list: dashboard.subG_propagation_models(d, 915, dashboard.DEFAULT_TX_ANTENNA_HEIGHT_M, dashboard.DEFAULT_RX_ANTENNA_HEIGHT_M), None
+        yield 'RSSI_calc[{}]'.format(num_points), lambda d=distance_list, pl=path_loss: dashboard.RSSI_calc(d, 10.9, -2, -6, pl), None
+
+
+# update_datatable caps sweeps at MAX_DISTANCE_POINTS, larger sizes run at the cap.
+# 'cold' clears every derived cache first, 'cached' measures a repeated view.
+def callback_benchmarks(distance_sizes, catalog_sizes):
+    for num_devices in catalog_sizes:
+        registry = dashboard.DeviceRegistry(synthetic_catalog(num_devices))
+        tx, rx = registry.names[0], registry.names[-1]
+
+        for num_points in distance_sizes:
+            num_points = min(num_points, dashboard.MAX_DISTANCE_POINTS)
+            for technology in ('BLE', 'Sub GHz'):
+                def run(technology=technology, num_points=num_points, registry=registry, tx=tx, rx=rx):
+                    dashboard.device_registry = registry
+                    return dashboard.update_datatable(tx, rx, technology, 10**4, num_points, 'log', 100)
+
+                name = 'update_datatable[{}, {} devices, {} points]'.format(technology, num_devices, num_points)
+                yield name + ' cold', run, clear_caches
+                yield name + ' cached', run, None
+
+
+def ingestion_benchmarks(catalog_sizes):
+    # Removed once the benchmarks are consumed, or when the generator is closed early
+    with tempfile.TemporaryDirectory(prefix='verkplot_benchmark_') as directory:
+        for num_devices in catalog_sizes:
+            path = os.path.join(directory, 'catalog_{}.csv'.format(num_devices))
+            synthetic_catalog(num_devices).to_csv(path, index=False, encoding='utf-8-sig')
+            spec_table = dashboard.ingest_device_specifications(path).to_frame()
+
+            yield 'ingest_device_specifications[{} devices]'.format(num_devices), lambda path=path: dashboard.ingest_device_specifications(path), None
+            yield 'DeviceRegistry[{} devices]'.format(num_devices), lambda spec_table=spec_table: dashboard.DeviceRegistry(spec_table), None
+
+
+def run_benchmarks(quick=False, name_filter=None):
+    distance_sizes = QUICK_DISTANCE_SIZES if quick else DISTANCE_SIZES
+    catalog_sizes = QUICK_CATALOG_SIZES if quick else CATALOG_SIZES
+    original_registry = dashboard.device_registry
+    results = {}
+
+    try:
+        for benchmarks in (model_benchmarks(distance_sizes), callback_benchmarks(distance_sizes, catalog_sizes), ingestion_benchmarks(catalog_sizes)):
+            for name, function, setup in benchmarks:
+                if name_filter and name_filter not in name:
+                    continue
+                # One untimed call to build lazily created state
+                function()
+                results[name] = measure(function, setup)
+                print('{:<75} {:>10.3f} ms  (min {:.3f} ms, {} runs)'.format(name, 1e3*results[name]['median_s'], 1e3*results[name]['min_s'], results[name]['repeats']))
+    finally:
+        dashboard.device_registry = original_registry
+
+    return results
+#---------------------------------------------------------
+
+
+# Baselines
+#---------------------------------------------------------
+def environment():
+    return {
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'pandas': pd.__version__,
+                'machine': platform.machine(),
+                'processor': platform.processor(),
+                'cpu_count': os.cpu_count(),
+            }
+
+
+def save_baseline(results, path, threshold):
+    baseline = {
+                    'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+                    'environment': environment(),
+                    'default_threshold': threshold,
+                    'benchmarks': {name: dict(result, threshold=max(threshold, SMALL_BENCHMARK_THRESHOLD) if result['median_s'] < SMALL_BENCHMARK_S else threshold) for name, result in results.items()},
+                }
+    with open(path, 'w') as baseline_file:
+        json.dump(baseline, baseline_file, indent=2, sort_keys=True)
+        baseline_file.write('\n')
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, result in sorted(results.items()):
+        reference = baseline['benchmarks'].get(name)
+        if reference is None:
+            print('{:<75} no baseline'.format(name))
+            continue
+        limit = reference.get('threshold', baseline.get('default_threshold', threshold))
+        ratio = result['median_s'] / reference['median_s']
+        status = 'REGRESSION' if ratio > limit else 'ok'
+        print('{:<75} {:>7.2f}x baseline (limit {:.2f}x) {}'.format(name, ratio, limit, status))
+        if ratio > limit:
+            regressions.append(name)
+    return regressions
+#---------------------------------------------------------
+
+
+# Command line
+#---------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Wireless link budget dashboard benchmarks')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='baseline JSON file')
+    parser.add_argument('--save-baseline', action='store_true', help='store the results as the new baseline')
+    parser.add_argument('--output', help='also write the raw results to this JSON file')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='allowed slowdown factor')
+    parser.add_argument('--quick', action='store_true', help='skip the largest sweep and catalog sizes')
+    parser.add_argument('-k', dest='name_filter', help='only run benchmarks whose name contains this text')
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.quick, args.name_filter)
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump({'environment': environment(), 'benchmarks': results}, output_file, indent=2, sort_keys=True)
+
+    if args.save_baseline:
+        save_baseline(results, args.baseline, args.threshold)
+        print('Baseline written to {}'.format(args.baseline))
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print('No baseline at {}, run with --save-baseline first'.format(args.baseline))
+        return 0
+
+    with open(args.baseline) as baseline_file:
+        regressions = compare(results, json.load(baseline_file), args.threshold)
+    if regressions:
+        print('{} benchmark(s) regressed'.format(len(regressions)))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
+#---------------------------------------------------------
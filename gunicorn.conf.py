@@ -0,0 +1,66 @@
+# [Title - Wireless Link Budget Dashboard - production gunicorn profile]
+# Usage: gunicorn -c gunicorn.conf.py
+#
+# The dashboard is imported once in the master (preload_app) and warmed up before the
+# workers fork, so every worker shares the device table, path loss tables and layout
+# copy-on-write and starts without re-importing anything. The link budget callbacks are
+# CPU bound numpy work: one process per core does the computing and a couple of threads
+# per worker keep requests flowing while another request is serialized or waits on I/O.
+#
+# Overrides: VERKPLOT_BIND, VERKPLOT_WORKERS, VERKPLOT_THREADS, VERKPLOT_TIMEOUT
+
+
+# Import all python modules and dependencies
+#---------------------------------------------------------
+import gc
+import os
+#---------------------------------------------------------
+
+
+# Keep numeric libraries and the Monte Carlo pool from oversubscribing the cores the
+# workers already use (read by the app module at import, which happens after this file)
+#---------------------------------------------------------
+for variable in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS'):
+    os.environ.setdefault(variable, '1')
+os.environ.setdefault('VERKPLOT_MONTE_CARLO_PROCESSES', '1')
+#---------------------------------------------------------
+
+
+# Server settings
+#---------------------------------------------------------
+wsgi_app = 'wireless_link_budget_dashboard:server'
+bind = os.environ.get('VERKPLOT_BIND', '0.0.0.0:8050')
+preload_app = True
+
+workers = int(os.environ.get('VERKPLOT_WORKERS', str(os.cpu_count() or 1)))
+worker_class = 'gthread'
+threads = int(os.environ.get('VERKPLOT_THREADS', '2'))
+timeout = int(os.environ.get('VERKPLOT_TIMEOUT', '60'))
+graceful_timeout = 30
+keepalive = 5
+
+# Recycled workers are forked from the warm master, so restarts stay cheap
+max_requests = 2000
+max_requests_jitter = 200
+#---------------------------------------------------------
+
+
+# Server hooks
+#---------------------------------------------------------
+def when_ready(server):
+    import wireless_link_budget_dashboard
+
+    wireless_link_budget_dashboard.warm_up()
+    # Move everything built so far out of the garbage collector's reach, so the collector
+    # running in the workers does not write to (and un-share) the inherited pages
+    gc.collect()
+    gc.freeze()
+    server.log.info('VerkPlot preloaded: %d devices, spec version %s', len(wireless_link_budget_dashboard.device_registry), wireless_link_budget_dashboard.device_registry.version)
+
+
+# Spec file hot reload runs in every worker (threads are not inherited across fork)
+def post_fork(server, worker):
+    import wireless_link_budget_dashboard
+
+    wireless_link_budget_dashboard.start_spec_watcher()
+#---------------------------------------------------------
@@ -0,0 +1,8 @@
+# [Title - Wireless Link Budget Dashboard - test configuration]
+# The dashboard is a single module next to this directory; tests import it as dashboard.
+#
+#   python -m pytest tests
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,81 @@
+# [Title - Wireless Link Budget Dashboard - API validation tests]
+# Invalid requests must come back as a JSON error with a 4xx status, never a 500.
+import pytest
+
+import wireless_link_budget_dashboard as dashboard
+
+
+@pytest.fixture
+def client():
+    return dashboard.server.test_client()
+
+
+def device_names():
+    return dashboard.device_registry.sorted_names[:2]
+
+
+@pytest.mark.parametrize('body, message', [
+    ([1, 2], 'Request body must be a JSON object'),
+    ({'technology': 'LoRa'}, 'technology must be one of'),
+    ({'technology': 'BLE', 'distances': ['near', 'far']}, 'distances must be a list of numbers'),
+    ({'technology': 'BLE', 'sampling': 'adaptive'}, 'sampling must be linear or log'),
+    ({'technology': 'BLE', 'distance_max': 'inf'}, 'distance_max must be a finite number'),
+    ({'technology': 'BLE', 'tx': 1, 'rx': 'Mantis'}, 'Device names must be strings'),
+    ({'technology': 'BLE', 'tx': ['Mantis'], 'rx': 'Mantis'}, 'Device names must be strings'),
+    ({'technology': 'BLE', 'tx': {'name': 'Mantis'}, 'rx': None}, 'Device names must be strings'),
+])
+def test_link_budget_rejects_invalid_requests(client, body, message):
+    response = client.post('/api/v1/link-budget', json=body)
+    assert response.status_code == 400
+    assert message in response.get_json()['error']
+
+
+def test_link_budget_unknown_device_is_404(client):
+    tx, _ = device_names()
+    response = client.post('/api/v1/link-budget', json={'technology': 'BLE', 'tx': tx, 'rx': 'No such device'})
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize('pairs, message', [
+    ('Mantis,Simon', 'pairs must be a list of [tx, rx] device names'),
+    ([['Mantis']], 'pairs must be a list of [tx, rx] device names'),
+    ([[['Mantis'], 'Simon']], 'Device names must be strings'),
+    ([[None, 7]], 'Device names must be strings'),
+])
+def test_batch_rejects_invalid_pairs(client, pairs, message):
+    response = client.post('/api/v1/link-budget/batch', json={'technology': 'BLE', 'pairs': pairs})
+    assert response.status_code == 400
+    assert message in response.get_json()['error']
+
+
+def test_max_range_rejects_non_finite_fade_margin(client):
+    tx, rx = device_names()
+    response = client.post('/api/v1/max-range', json={'technology': 'BLE', 'tx': tx, 'rx': rx, 'fade_margin': 'nan'})
+    assert response.status_code == 400
+    assert 'fade_margin must be a finite number' in response.get_json()['error']
+
+
+def sinr_body(**node):
+    tx, rx = device_names()
+    nodes = [{'device': tx, 'x': 0, 'y': 0}, dict({'device': rx, 'x': 10, 'y': 0, 'serving': 0}, **node)]
+    return {'technology': 'BLE', 'nodes': nodes}
+
+
+@pytest.mark.parametrize('body, message', [
+    ({'technology': 'BLE', 'nodes': {'device': 'Mantis'}}, 'nodes must be a list'),
+    (dict(sinr_body(), band='60 GHz'), 'band must be one of'),
+    (dict(sinr_body(), model='No_Such_PL'), 'model must be one of'),
+    (sinr_body(device=3), 'Device names must be strings'),
+    (sinr_body(x='east'), 'must be numbers'),
+    (sinr_body(x=float('inf')), 'must be finite numbers'),
+    (sinr_body(duty_cycle=float('nan')), 'must be finite numbers'),
+])
+def test_sinr_rejects_invalid_requests(client, body, message):
+    response = client.post('/api/v1/sinr', json=body)
+    assert response.status_code == 400
+    assert message in response.get_json()['error']
+
+
+def test_sinr_accepts_valid_request(client):
+    response = client.post('/api/v1/sinr', json=sinr_body(), query_string={'format': 'json'})
+    assert response.status_code == 200
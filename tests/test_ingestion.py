@@ -0,0 +1,69 @@
+# [Title - Wireless Link Budget Dashboard - device spec ingestion tests]
+# Invalid spec rows are dropped and reported by line number, for a fresh parse and for the
+# pickled table read back from the spec cache.
+import io
+import os
+import logging
+
+import pytest
+
+import wireless_link_budget_dashboard as dashboard
+
+HEADER = 'Device,Transmit Power (dBm),Receive Sensitivity (dBm),Antenna Efficiency (dB)'
+ROWS = [
+            'Alpha,10,-98,-2',                  # line 2
+            'Bravo,ten,-98,-2',                 # line 3, not a number
+            'Charlie,3,-98',                    # line 4, missing a field
+            ',3,-98,-2',                        # line 5, missing name
+            'Delta,90,-98,-2',                  # line 6, out of range
+            'Alpha,4,-95,-3',                   # line 7, duplicate name
+            'Echo,0,-95,-10',                   # line 8
+        ]
+
+
+def spec_csv():
+    return '\n'.join([HEADER] + ROWS) + '\n'
+
+
+def test_invalid_rows_are_rejected():
+    spec_table = dashboard.ingest_device_specifications(io.StringIO(spec_csv())).to_frame()
+    assert list(spec_table['Device']) == ['Alpha', 'Echo']
+    assert spec_table.attrs['rejected_count'] == 5
+    reasons = {line: reason for line, reason, _ in spec_table.attrs['rejected_rows']}
+    assert 'not a number' in reasons[3]
+    assert reasons[4] == 'expected 4 fields, found 3'
+    assert reasons[5] == 'missing Device name'
+    assert 'out of range' in reasons[6]
+    assert 'duplicate Device name' in reasons[7]
+
+
+@pytest.mark.parametrize('chunk_rows', [1, 3, 100])
+def test_rejected_rows_are_reported_by_line(chunk_rows):
+    # Field count errors are found while reading, value errors per chunk
+    store = dashboard.ingest_device_specifications(io.StringIO(spec_csv()), chunk_rows=chunk_rows)
+    assert [line for line, _, _ in store.reported_rows()] == [3, 4, 5, 6, 7]
+    assert store.reported_rows()[0][2] == 'Bravo,ten,-98,-2'
+
+
+def test_reported_rows_keep_the_lowest_lines(monkeypatch):
+    monkeypatch.setattr(dashboard, 'SPEC_MAX_REPORTED_ROWS', 2)
+    store = dashboard.ingest_device_specifications(io.StringIO(spec_csv()), chunk_rows=100)
+    assert store.rejected_count == 5
+    assert [line for line, _, _ in store.reported_rows()] == [3, 4]
+
+
+def test_rejections_are_logged_on_cache_hits(tmp_path, monkeypatch, caplog):
+    path = tmp_path / 'specs.csv'
+    path.write_text(spec_csv(), encoding='utf-8')
+    monkeypatch.setattr(dashboard, 'SPEC_CACHE_DIRECTORY', str(tmp_path / 'cache'))
+
+    with caplog.at_level(logging.WARNING):
+        fresh = dashboard.load_device_specifications(str(path))
+        assert os.path.exists(dashboard._spec_cache_path(str(path)))
+        cached = dashboard.load_device_specifications(str(path))
+
+    assert list(cached['Device']) == list(fresh['Device'])
+    assert cached.attrs['rejected_rows'] == fresh.attrs['rejected_rows']
+    warnings = [record.getMessage() for record in caplog.records if 'rows rejected' in record.getMessage()]
+    assert len(warnings) == 2
+    assert all('5 device specification rows rejected' in message and 'first: line 3' in message for message in warnings)
@@ -0,0 +1,87 @@
+# [Title - Wireless Link Budget Dashboard - result cache tests]
+# The file backend is shared by every worker: entries written by one process are read by
+# another, and invalidating in one process must never delete the shared files.
+import os
+import sys
+import json
+import subprocess
+
+import pytest
+
+import wireless_link_budget_dashboard as dashboard
+
+REPOSITORY_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WORKER = '''
+import sys, json
+import wireless_link_budget_dashboard as dashboard
+command = sys.argv[1]
+if command == 'set':
+    dashboard.result_cache.set(('shared', 1), 'value')
+elif command == 'invalidate':
+    dashboard.invalidate_derived_caches()
+elif command == 'toggle':
+    dashboard.set_enabled_propagation_models(['FSPL'])
+print(json.dumps(dashboard.result_cache.get(('shared', 1))))
+'''
+
+
+@pytest.fixture
+def worker(tmp_path):
+    environment = dict(os.environ, VERKPLOT_RESULT_CACHE_DIR=str(tmp_path / 'results'), VERKPLOT_CACHE_DIR=str(tmp_path / 'specs'), PYTHONPATH=REPOSITORY_DIRECTORY)
+
+    def run(command):
+        output = subprocess.run([sys.executable, '-c', WORKER, command], env=environment, capture_output=True, text=True, check=True).stdout
+        return json.loads(output.splitlines()[-1])
+    return run
+
+
+def cached_files(tmp_path):
+    return sorted(name for name in os.listdir(tmp_path / 'results') if name.endswith('.pkl'))
+
+
+def test_entries_are_shared_between_processes(worker, tmp_path):
+    assert worker('set') == 'value'
+    assert worker('get') == 'value'
+
+
+def test_import_and_invalidation_keep_shared_entries(worker, tmp_path):
+    worker('set')
+    files = cached_files(tmp_path)
+    assert files
+
+    # Another worker starting up and invalidating its own caches, the entry is read back
+    assert worker('invalidate') == 'value'
+    assert cached_files(tmp_path) == files
+
+
+def test_model_change_misses_without_deleting(worker, tmp_path):
+    worker('set')
+    files = cached_files(tmp_path)
+
+    assert worker('toggle') is None
+    assert cached_files(tmp_path) == files
+    assert worker('get') == 'value'
+
+
+def test_file_backend_bounds_entries_and_expires(tmp_path):
+    backend = dashboard.FileCacheBackend(str(tmp_path), maxsize=2, ttl_seconds=60)
+    for key in range(4):
+        backend.set(key, key)
+    assert len(os.listdir(tmp_path)) == 2
+    assert backend.get(3) == 3
+
+    expired = dashboard.time.time() - 120
+    for name in os.listdir(tmp_path):
+        os.utime(tmp_path / name, (expired, expired))
+    assert backend.get(3) is None
+    backend.set('fresh', 1)
+    assert os.listdir(tmp_path) == [os.path.basename(backend._path('fresh'))]
+
+
+def test_clear_rereads_the_namespace():
+    cache = dashboard.ResultCache(namespace=lambda: tuple(sorted(dashboard.TECHNOLOGY_MODELS.items())))
+    cache.set('key', 'value')
+    cache.clear()
+    assert cache.get('key') is None
+    assert cache.stats()['size'] == 0
@@ -5,13 +5,34 @@
 
 # Import all python modules and dependencies
 #---------------------------------------------------------
+import os
+import sys
+import io
+import re
+import csv
+import pickle
+import hashlib
+import threading
+import functools
+import time
+import json
+import uuid
+import multiprocessing
+import subprocess
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+try:
+    import fcntl        # POSIX only, host wide job queue locks
+except ImportError:
+    fcntl = None
 import pandas as pd     #(version 1.0.0)
-import math
-import plotly.express as px
+import numpy as np
 import dash             #(version 1.9.1) pip install dash==1.9.1
 import dash_bootstrap_components as dbc
-from dash import Dash, dcc, html, Input, Output, dash_table
+from dash import Dash, dcc, html, Input, Output, State, dash_table, ClientsideFunction
 from dash.exceptions import PreventUpdate
+from flask import Response, g, jsonify, request, send_file
 #--------------------------------------------------------
 
 
@@ -23,12 +44,846 @@ server = app.server
 #--------------------------------------------------------
 
 
-# Read device specification file from directory
+# Device specification source
+# Specs are read from local disk (device_specifications_csv.csv next to this file or the
+# path in VERKPLOT_SPEC_PATH) by a streaming, validating ingester. The parsed, typed table
+# is pickled into VERKPLOT_CACHE_DIR keyed by the file path, mtime and size, so worker
+# start up never touches the network.
+# The GitHub copy is only used when the local file is missing and remote loading is
+# allowed (allow_remote=True or VERKPLOT_ALLOW_REMOTE_SPECS=1).
 #--------------------------------------------------------
-#df = pd.read_csv('device_specifications_csv.csv')
-#df = pd.read_csv('https://github.com/VinayGHegde/wireless_link_budget_dashboard/device_specifications_csv.csv')
+APP_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+SPEC_FILE_PATH = os.environ.get('VERKPLOT_SPEC_PATH', os.path.join(APP_DIRECTORY, 'device_specifications_csv.csv'))
+SPEC_CACHE_DIRECTORY = os.environ.get('VERKPLOT_CACHE_DIR', os.path.join(APP_DIRECTORY, '.verkplot_cache'))
+SPEC_ALLOW_REMOTE = os.environ.get('VERKPLOT_ALLOW_REMOTE_SPECS', '').lower() in ('1', 'true', 'yes')
 url = 'https://github.com/VinayGHegde/wireless_link_budget_dashboard/blob/main/device_specifications_csv.csv?raw=true'
-df = pd.read_csv(url, on_bad_lines='skip')
+
+SPEC_COLUMN_DTYPES = {
+                            'Device': str,
+                            'Transmit Power (dBm)': np.float32,
+                            'Receive Sensitivity (dBm)': np.float32,
+                            'Antenna Efficiency (dB)': np.float32,
+                    }
+
+# Plausible range of every numeric spec column, rows outside it are rejected
+SPEC_VALUE_RANGES = {
+                            'Transmit Power (dBm)': (-60, 60),
+                            'Receive Sensitivity (dBm)': (-160, 0),
+                            'Antenna Efficiency (dB)': (-40, 20),
+                    }
+
+# Bumped whenever the cached table layout or the row validation changes
+SPEC_CACHE_FORMAT = 4
+SPEC_INGEST_CHUNK_ROWS = int(os.environ.get('VERKPLOT_SPEC_CHUNK_ROWS', '50000'))
+SPEC_MAX_REPORTED_ROWS = 1000
+
+
+# Columnar device specification store
+# Rows are appended chunk by chunk: numeric columns as float32 arrays, text columns as
+# object arrays. Chunks are concatenated once on first column access, so loading is linear
+# in the number of rows and appending a delta file never re-reads what is already stored.
+# Rejected rows are kept as (line number, reason, raw row) for the SPEC_MAX_REPORTED_ROWS
+# lowest line numbers plus a total count; rows are rejected out of line order (field count
+# while reading, values per chunk), reported_rows() sorts them. device_lines maps every
+# stored device name to its line so repeated names are rejected, also across chunks and
+# appended sources.
+class DeviceSpecStore:
+    __slots__ = ('columns', 'num_rows', 'rejected_rows', 'rejected_count', 'device_lines', '_chunks')
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self.num_rows = 0
+        self.rejected_rows = []
+        self.rejected_count = 0
+        self.device_lines = {}
+        self._chunks = {column: [] for column in self.columns}
+
+    def __len__(self):
+        return self.num_rows
+
+    def append(self, chunk):
+        num_rows = len(chunk[self.columns[0]])
+        if num_rows:
+            for column in self.columns:
+                self._chunks[column].append(chunk[column])
+            self.num_rows += num_rows
+
+    def reject(self, line_number, reason, row):
+        self.rejected_count += 1
+        self.rejected_rows.append((line_number, reason, ','.join(row)))
+        if len(self.rejected_rows) >= 2*SPEC_MAX_REPORTED_ROWS:
+            self.rejected_rows = self.reported_rows()
+
+    def reported_rows(self):
+        return sorted(self.rejected_rows)[:SPEC_MAX_REPORTED_ROWS]
+
+    def column(self, column):
+        chunks = self._chunks[column]
+        if len(chunks) != 1:
+            dtype = SPEC_COLUMN_DTYPES.get(column)
+            chunks[:] = [np.concatenate(chunks) if chunks else np.empty(0, dtype=np.float32 if dtype is np.float32 else object)]
+        return chunks[0]
+
+    def to_frame(self):
+        spec_table = pd.DataFrame({column: self.column(column) for column in self.columns}, columns=self.columns)
+        spec_table.attrs['rejected_rows'] = self.reported_rows()
+        spec_table.attrs['rejected_count'] = self.rejected_count
+        return spec_table
+
+
+def _open_spec_source(source):
+    if hasattr(source, 'read'):
+        return source
+    if str(source).startswith(('http://', 'https://')):
+        from urllib.request import urlopen
+        return io.TextIOWrapper(urlopen(source), encoding='utf-8-sig', newline='')
+    return open(source, encoding='utf-8-sig', newline='')
+
+
+def _ingest_chunk(store, header, rows, line_numbers):
+    columns = list(zip(*rows))
+    valid = np.ones(len(rows), dtype=bool)
+    reasons = [None]*len(rows)
+    chunk = {}
+
+    for position, column in enumerate(header):
+        if column == 'Device':
+            values = np.array([value.strip() for value in columns[position]], dtype=object)
+            for row in np.flatnonzero(values == ''):
+                reasons[row] = reasons[row] or 'missing Device name'
+        elif SPEC_COLUMN_DTYPES.get(column) is np.float32:
+            values = pd.to_numeric(pd.Series(columns[position], dtype=object), errors='coerce').to_numpy(dtype=float)
+            lower, upper = SPEC_VALUE_RANGES.get(column, (-np.inf, np.inf))
+            for row in np.flatnonzero(~np.isfinite(values)):
+                reasons[row] = reasons[row] or '{} is not a number: {!r}'.format(column, columns[position][row])
+            for row in np.flatnonzero((values < lower) | (values > upper)):
+                reasons[row] = reasons[row] or '{} out of range [{}, {}]: {}'.format(column, lower, upper, columns[position][row])
+            values = values.astype(np.float32)
+        else:
+            values = np.array(columns[position], dtype=object)
+        chunk[column] = values
+
+    names = chunk['Device']
+    for row, reason in enumerate(reasons):
+        if reason is None:
+            first_line = store.device_lines.setdefault(names[row], line_numbers[row])
+            if first_line != line_numbers[row]:
+                reason = 'duplicate Device name {!r}, first on line {}'.format(names[row], first_line)
+        if reason is not None:
+            valid[row] = False
+            store.reject(line_numbers[row], reason, rows[row])
+
+    store.append({column: values[valid] for column, values in chunk.items()})
+
+
+# Streams a spec CSV (path, URL or text file object) in chunks of chunk_rows rows into a
+# DeviceSpecStore, validating every row. Pass an existing store to append to it; the new
+# source must have the same columns.
+def ingest_device_specifications(source, store=None, chunk_rows=SPEC_INGEST_CHUNK_ROWS):
+    stream = _open_spec_source(source)
+    try:
+        reader = csv.reader(stream)
+        header = [column.strip().lstrip('\ufeff') for column in next(reader, [])]
+        missing = [column for column in SPEC_COLUMN_DTYPES if column not in header]
+        if missing:
+            raise ValueError('Device specification columns missing: {}'.format(', '.join(missing)))
+
+        if store is None:
+            store = DeviceSpecStore(header)
+        elif sorted(store.columns) != sorted(header):
+            raise ValueError('Cannot append device specifications with columns {} to a store with columns {}'.format(header, store.columns))
+
+        rows, line_numbers = [], []
+        for row in reader:
+            if not row or (len(row) == 1 and not row[0].strip()):
+                continue
+            if len(row) != len(header):
+                store.reject(reader.line_num, 'expected {} fields, found {}'.format(len(header), len(row)), row)
+                continue
+            rows.append(row)
+            line_numbers.append(reader.line_num)
+            if len(rows) >= chunk_rows:
+                _ingest_chunk(store, header, rows, line_numbers)
+                rows, line_numbers = [], []
+
+        if rows:
+            _ingest_chunk(store, header, rows, line_numbers)
+    finally:
+        if stream is not source:
+            stream.close()
+
+    return store
+
+
+# Logged for a fresh parse and for a cached table alike, so a restart still reports them
+def _log_rejected_rows(spec_table, source):
+    if spec_table.attrs.get('rejected_count'):
+        server.logger.warning('%d device specification rows rejected in %s, first: line %d - %s', spec_table.attrs['rejected_count'], source, *spec_table.attrs['rejected_rows'][0][:2])
+
+
+def _parse_device_specifications(source):
+    spec_table = ingest_device_specifications(source).to_frame()
+    _log_rejected_rows(spec_table, source)
+    return spec_table
+
+
+def _spec_cache_path(path):
+    path_hash = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()[:12]
+    return os.path.join(SPEC_CACHE_DIRECTORY, 'device_specifications_{}.pkl'.format(path_hash))
+
+
+def load_device_specifications(path=SPEC_FILE_PATH, allow_remote=SPEC_ALLOW_REMOTE, use_cache=True):
+    if not os.path.exists(path):
+        if allow_remote:
+            return _parse_device_specifications(url)
+        raise FileNotFoundError('Device specification file not found: {} (set VERKPLOT_SPEC_PATH or allow remote loading)'.format(path))
+
+    file_stat = os.stat(path)
+    cache_key = (SPEC_CACHE_FORMAT, os.path.abspath(path), file_stat.st_mtime_ns, file_stat.st_size)
+    cache_path = _spec_cache_path(path)
+
+    if use_cache:
+        try:
+            with open(cache_path, 'rb') as cache_file:
+                cached = pickle.load(cache_file)
+            if cached['key'] == cache_key:
+                _log_rejected_rows(cached['table'], path)
+                return cached['table']
+        except (OSError, EOFError, KeyError, TypeError, pickle.UnpicklingError):
+            pass
+
+    spec_table = _parse_device_specifications(path)
+
+    if use_cache:
+        # Write to a temporary file first so concurrent workers never read a partial cache
+        try:
+            os.makedirs(SPEC_CACHE_DIRECTORY, exist_ok=True)
+            temp_path = '{}.{}.tmp'.format(cache_path, os.getpid())
+            with open(temp_path, 'wb') as cache_file:
+                pickle.dump({'key': cache_key, 'table': spec_table}, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_path)
+        except OSError:
+            pass
+
+    return spec_table
+
+
+def spec_file_signature(path=SPEC_FILE_PATH):
+    try:
+        file_stat = os.stat(path)
+    except OSError:
+        return None
+    return file_stat.st_mtime_ns, file_stat.st_size
+
+
+# Taken before loading so a change made while loading is picked up by the spec watcher
+spec_signature = spec_file_signature()
+df = load_device_specifications()
+#--------------------------------------------------------
+
+
+# Device registry
+# Built once per spec table. RF parameters live in contiguous numpy arrays and a dict maps
+# each device name to its row, so callbacks get O(1) lookups instead of DataFrame scans.
+# Duplicate device names keep their first row, later rows are dropped and reported as
+# (row, reason, name) in rejected_rows.
+#--------------------------------------------------------
+# float32 spec values are widened through their shortest decimal form, so 10.9 stays 10.9
+# in the specification table and the link budget maths instead of 10.899999618530273
+def _widen_spec_column(values):
+    values = values.to_numpy()
+    if values.dtype == np.float32:
+        return values.astype(str).astype(float)
+    return values
+
+
+class DeviceRegistry:
+    __slots__ = ('columns', 'names', 'sorted_names', 'index', 'rows', 'tx_power_dBm', 'rx_sensitivity_dBm', 'ant_efficiency_dB', 'rejected_rows', 'version')
+
+    def __init__(self, spec_table):
+        self.columns = list(spec_table.columns)
+        self.names = spec_table['Device'].tolist()
+        self.index = {}
+        self.rejected_rows = []
+        for row, name in enumerate(self.names):
+            first_row = self.index.setdefault(name, row)
+            if first_row != row:
+                self.rejected_rows.append((row, 'duplicate Device name {!r}, first on row {}'.format(name, first_row), name))
+        if self.rejected_rows:
+            server.logger.warning('%d duplicate device names dropped, first: row %d - %s', len(self.rejected_rows), *self.rejected_rows[0][:2])
+            spec_table = spec_table.iloc[sorted(self.index.values())]
+            self.names = spec_table['Device'].tolist()
+            self.index = {name: row for row, name in enumerate(self.names)}
+        self.sorted_names = sorted(self.index)
+        columns = {column: _widen_spec_column(spec_table[column]) for column in self.columns}
+        self.rows = list(zip(*(columns[column].tolist() for column in self.columns)))
+        self.tx_power_dBm = columns['Transmit Power (dBm)']
+        self.rx_sensitivity_dBm = columns['Receive Sensitivity (dBm)']
+        self.ant_efficiency_dB = columns['Antenna Efficiency (dB)']
+        # Content hash of the spec table, used to key every derived cache
+        self.version = hashlib.sha1(repr((self.columns, self.rows)).encode('utf-8')).hexdigest()[:16]
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def parameters(self, name):
+        row = self.index[name]
+        return {
+                    'tx_power': float(self.tx_power_dBm[row]),
+                    'ant_efficiency': float(self.ant_efficiency_dB[row]),
+                    'rx_sensitivity': float(self.rx_sensitivity_dBm[row]),
+                }
+
+    def records(self, names):
+        return [dict(zip(self.columns, self.rows[self.index[name]])) for name in names]
+
+
+device_registry = DeviceRegistry(df)
+#--------------------------------------------------------
+
+
+# Derived cache invalidation
+# Caches derived from the propagation model registry or the device specifications register
+# their clear function here so they can all be dropped together
+#--------------------------------------------------------
+DERIVED_CACHE_INVALIDATORS = []
+
+
+def invalidate_derived_caches():
+    for invalidate in DERIVED_CACHE_INVALIDATORS:
+        invalidate()
+#--------------------------------------------------------
+
+
+# Device search
+# Device pickers only ship DEVICE_SEARCH_LIMIT options with the layout and ask the server for
+# the top matches on every keystroke, so the layout payload does not grow with the catalog.
+# Every query term has to match the device name or one of the DEVICE_SEARCH_COLUMNS present
+# in the spec table, either as a word prefix (binary search in the sorted word list) or, for terms
+# of DEVICE_SEARCH_NGRAM or more characters, as a substring (n-gram posting lists). Results
+# are ranked name prefix > word prefix > substring, then alphabetically.
+#--------------------------------------------------------
+DEVICE_SEARCH_COLUMNS = [column.strip() for column in os.environ.get('VERKPLOT_DEVICE_SEARCH_COLUMNS', 'Technology,Band,Vendor').split(',') if column.strip()]
+DEVICE_SEARCH_LIMIT = int(os.environ.get('VERKPLOT_DEVICE_SEARCH_LIMIT', '50'))
+DEVICE_SEARCH_NGRAM = 3
+_search_word_pattern = re.compile(r'[^\W_]+')
+
+
+class DeviceSearchIndex:
+    __slots__ = ('names', 'texts', 'option_search', 'sorted_names', 'name_positions', 'words', 'word_positions', 'ngram_codes', 'ngram_offsets', 'ngram_positions')
+
+    def __init__(self, devices):
+        self.names = devices.sorted_names
+        attribute_columns = [devices.columns.index(column) for column in DEVICE_SEARCH_COLUMNS if column in devices.columns]
+        self.texts = []
+        # The dropdown still filters the returned options in the browser, attribute matches
+        # need the attributes in the option's search string to survive that
+        self.option_search = {}
+        for name in self.names:
+            row = devices.rows[devices.index[name]]
+            fields = [str(name)] + [str(row[column]) for column in attribute_columns if row[column] is not None]
+            self.texts.append('\x00'.join(fields).lower())
+            if attribute_columns:
+                self.option_search[name] = ' '.join(fields)
+
+        self.sorted_names, self.name_positions = self._sorted_keys([text.split('\x00', 1)[0] for text in self.texts], np.arange(len(self.texts)))
+
+        words = [_search_word_pattern.findall(text) for text in self.texts]
+        self.words, self.word_positions = self._sorted_keys(
+                                                                [word for text_words in words for word in text_words],
+                                                                np.repeat(np.arange(len(self.texts)), [len(text_words) for text_words in words]),
+                                                            )
+
+        # Posting lists of every n-gram as slices of one position array sorted by n-gram code
+        ngrams = [[text[start:start + DEVICE_SEARCH_NGRAM] for start in range(len(text) - DEVICE_SEARCH_NGRAM + 1)] for text in self.texts]
+        codes, uniques = pd.factorize(pd.Series([ngram for text_ngrams in ngrams for ngram in text_ngrams], dtype=object))
+        positions = np.repeat(np.arange(len(self.texts), dtype=np.int64), [len(text_ngrams) for text_ngrams in ngrams])
+        postings = np.sort(codes.astype(np.int64)*max(len(self.texts), 1) + positions)
+        postings = postings[np.r_[True, postings[1:] != postings[:-1]]] if len(postings) else postings
+        self.ngram_codes = dict(zip(uniques.tolist(), range(len(uniques))))
+        self.ngram_offsets = np.searchsorted(postings // max(len(self.texts), 1), np.arange(len(uniques) + 1))
+        self.ngram_positions = postings % max(len(self.texts), 1)
+
+    @staticmethod
+    def _sorted_keys(keys, positions):
+        keys = np.array(keys, dtype=str) if keys else np.array([], dtype=str)
+        order = np.argsort(keys, kind='stable')
+        return keys[order], np.asarray(positions, dtype=np.int64)[order]
+
+    def __len__(self):
+        return len(self.names)
+
+    def _prefix_mask(self, keys, positions, prefix):
+        mask = np.zeros(len(self.names), dtype=bool)
+        mask[positions[np.searchsorted(keys, prefix, 'left'):np.searchsorted(keys, prefix + '\uffff', 'left')]] = True
+        return mask
+
+    def _posting(self, ngram):
+        code = self.ngram_codes.get(ngram)
+        if code is None:
+            return self.ngram_positions[:0]
+        return self.ngram_positions[self.ngram_offsets[code]:self.ngram_offsets[code + 1]]
+
+    # Substring matches outside the excluded (already matched) positions
+    def _substring_mask(self, term, excluded):
+        mask = np.zeros(len(self.names), dtype=bool)
+        if len(term) < DEVICE_SEARCH_NGRAM:
+            return mask
+        postings = sorted((self._posting(term[start:start + DEVICE_SEARCH_NGRAM]) for start in range(len(term) - DEVICE_SEARCH_NGRAM + 1)), key=len)
+        candidates = functools.reduce(lambda left, right: np.intersect1d(left, right, assume_unique=True), postings)
+        candidates = candidates[~excluded[candidates]]
+        if len(term) > DEVICE_SEARCH_NGRAM:
+            candidates = [position for position in candidates.tolist() if term in self.texts[position]]
+        mask[candidates] = True
+        return mask
+
+    def search(self, query, limit=DEVICE_SEARCH_LIMIT):
+        query = (query or '').strip().lower()
+        if not query:
+            return self.names[:limit]
+
+        matched = np.ones(len(self.names), dtype=bool)
+        word_prefix = np.ones(len(self.names), dtype=bool)
+        for term in _search_word_pattern.findall(query) or [query]:
+            prefix = self._prefix_mask(self.words, self.word_positions, term)
+            matched &= prefix | self._substring_mask(term, prefix | ~matched)
+            word_prefix &= prefix
+        # Whole query, e.g. 'pixel 7' or 'apollo_s', against the start of the device name
+        name_prefix = self._prefix_mask(self.sorted_names, self.name_positions, query)
+        matched |= name_prefix
+
+        candidates = np.flatnonzero(matched)
+        rank = np.where(name_prefix[candidates], 0, np.where(word_prefix[candidates], 1, 2))
+        return [self.names[position] for position in candidates[np.argsort(rank, kind='stable')][:limit].tolist()]
+
+
+@functools.lru_cache(maxsize=2)
+def device_search_index(devices):
+    return DeviceSearchIndex(devices)
+
+
+# Dropdown options for the top matches of search_value. The selected device is always kept
+# in the options, otherwise the dropdown would drop its label.
+def device_search_options(devices, search_value='', value=None, limit=DEVICE_SEARCH_LIMIT):
+    index = device_search_index(devices)
+    names = index.search(search_value, limit)
+    if value in devices and value not in names:
+        names = [value] + names
+    options = [{'label': str(x), 'value': x} for x in names]
+    for option in options:
+        if option['value'] in index.option_search:
+            option['search'] = index.option_search[option['value']]
+    return options
+
+
+DERIVED_CACHE_INVALIDATORS.append(device_search_index.cache_clear)
+#--------------------------------------------------------
+
+
+# Link budget result cache
+# Bounded LRU cache with a TTL for computed link budget results (figure dicts). Keys must
+# include the spec version. An optional FileCacheBackend (VERKPLOT_RESULT_CACHE_DIR) shares
+# entries between gunicorn workers; the in-process LRU sits in front of it. Every key is
+# stored under namespace() (the enabled propagation models), so clear() only drops the
+# local entries and re-reads the namespace - the shared files of other workers are never
+# deleted, stale ones age out through the TTL and the size bound.
+#--------------------------------------------------------
+class FileCacheBackend:
+    def __init__(self, directory, maxsize=1024, ttl_seconds=None):
+        self.directory = directory
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha1(repr(key).encode('utf-8')).hexdigest() + '.pkl')
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            if self.ttl_seconds is not None and time.time() - os.path.getmtime(path) > self.ttl_seconds:
+                return None
+            with open(path, 'rb') as cache_file:
+                stored_key, value = pickle.load(cache_file)
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+            return None
+        return value if stored_key == key else None
+
+    def set(self, key, value):
+        path = self._path(key)
+        temp_path = '{}.{}.tmp'.format(path, os.getpid())
+        try:
+            with open(temp_path, 'wb') as cache_file:
+                pickle.dump((key, value), cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+        except OSError:
+            return
+        self._prune()
+
+    def _prune(self):
+        try:
+            entries = [os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith('.pkl')]
+            entries.sort(key=os.path.getmtime)
+            expired = time.time() - self.ttl_seconds if self.ttl_seconds is not None else None
+            for position, path in enumerate(entries):
+                if position >= len(entries) - self.maxsize and (expired is None or os.path.getmtime(path) >= expired):
+                    break
+                os.remove(path)
+        except OSError:
+            pass
+
+
+class ResultCache:
+    def __init__(self, maxsize=256, ttl_seconds=600, backend=None, namespace=None):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.backend = backend
+        self.namespace = namespace
+        self._namespace = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _namespaced(self, key):
+        if self._namespace is None:
+            self._namespace = self.namespace() if self.namespace is not None else ()
+        return self._namespace, key
+
+    def get(self, key):
+        key = self._namespaced(key)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self.ttl_seconds is None or now - entry[0] <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+                self.evictions += 1
+
+        value = self.backend.get(key) if self.backend is not None else None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store(key, value, now)
+        return value
+
+    def set(self, key, value):
+        key = self._namespaced(key)
+        with self._lock:
+            self._store(key, value, time.monotonic())
+        if self.backend is not None:
+            self.backend.set(key, value)
+
+    def _store(self, key, value, now):
+        self._entries[key] = (now, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._namespace = None
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                        'size': len(self._entries),
+                        'maxsize': self.maxsize,
+                        'hits': self.hits,
+                        'misses': self.misses,
+                        'evictions': self.evictions,
+                        'hit_rate': self.hits / lookups if lookups else 0.0,
+                    }
+
+
+RESULT_CACHE_SIZE = int(os.environ.get('VERKPLOT_RESULT_CACHE_SIZE', '256'))
+RESULT_CACHE_TTL = float(os.environ.get('VERKPLOT_RESULT_CACHE_TTL', '600'))
+RESULT_CACHE_DIRECTORY = os.environ.get('VERKPLOT_RESULT_CACHE_DIR')
+
+result_cache = ResultCache(
+                                maxsize=RESULT_CACHE_SIZE,
+                                ttl_seconds=RESULT_CACHE_TTL,
+                                backend=FileCacheBackend(RESULT_CACHE_DIRECTORY, maxsize=4*RESULT_CACHE_SIZE, ttl_seconds=RESULT_CACHE_TTL) if RESULT_CACHE_DIRECTORY else None,
+                                namespace=lambda: tuple(sorted(TECHNOLOGY_MODELS.items())),
+                        )
+
+DERIVED_CACHE_INVALIDATORS.append(result_cache.clear)
+#--------------------------------------------------------
+
+
+# Hot path instrumentation
+# Per process metrics in Prometheus text format at /metrics (loopback clients only unless
+# VERKPLOT_METRICS_PUBLIC=1; every gunicorn worker keeps its own):
+#   verkplot_request_seconds / verkplot_response_bytes   per route, Dash callbacks by output
+#   verkplot_stage_seconds                               timed_stage() sections of the hot path
+#   cache hit/miss counters                              from the METRICS_COLLECTORS hooks
+# The 'dispatch_serialization' stage is what a Dash callback request spent outside the timed
+# callback itself (request parsing, JSON serialization). With VERKPLOT_PROFILER=cprofile or
+# pyinstrument, requests carrying an X-Verkplot-Profile header or a profile=1 query
+# parameter, plus a VERKPLOT_PROFILE_SAMPLE_RATE fraction of all requests, are profiled
+# into VERKPLOT_PROFILE_DIR.
+#--------------------------------------------------------
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+PAYLOAD_BUCKETS = (1e3, 1e4, 1e5, 1e6, 1e7)
+METRICS_PUBLIC = os.environ.get('VERKPLOT_METRICS_PUBLIC', '').lower() in ('1', 'true', 'yes')
+PROFILER = os.environ.get('VERKPLOT_PROFILER', '').lower()
+PROFILE_SAMPLE_RATE = float(os.environ.get('VERKPLOT_PROFILE_SAMPLE_RATE', '0'))
+PROFILE_DIRECTORY = os.environ.get('VERKPLOT_PROFILE_DIR', os.path.join(SPEC_CACHE_DIRECTORY, 'profiles'))
+
+# Functions returning (name, type, help, labels, value) samples, read on every scrape
+METRICS_COLLECTORS = []
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        with self._lock:
+            series = self.series.get(labels)
+            if series is None:
+                series = self.series[labels] = [[0]*len(self.buckets), 0.0, 0]
+            for position, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][position] += 1
+            series[1] += value
+            series[2] += 1
+
+    def exposition(self, name, label_name):
+        with self._lock:
+            series = {labels: (list(counts), total, count) for labels, (counts, total, count) in self.series.items()}
+        lines = []
+        for labels, (counts, total, count) in sorted(series.items()):
+            label = '{}="{}"'.format(label_name, _prometheus_escape(labels))
+            for bound, bucket_count in zip(self.buckets, counts):
+                lines.append('{}_bucket{{{},le="{:g}"}} {}'.format(name, label, bound, bucket_count))
+            lines.append('{}_bucket{{{},le="+Inf"}} {}'.format(name, label, count))
+            lines.append('{}_sum{{{}}} {!r}'.format(name, label, total))
+            lines.append('{}_count{{{}}} {}'.format(name, label, count))
+        return lines
+
+
+def _prometheus_escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+request_latency = Histogram(LATENCY_BUCKETS)
+response_size = Histogram(PAYLOAD_BUCKETS)
+stage_latency = Histogram(LATENCY_BUCKETS)
+_stage_context = threading.local()
+
+
+# Times a hot path section, usable as a context manager or a function decorator. Time spent
+# in outermost stages is also summed per request for the dispatch_serialization stage.
+class timed_stage:
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __call__(self, function):
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            with timed_stage(self.stage):
+                return function(*args, **kwargs)
+        return timed
+
+    def __enter__(self):
+        self.depth = getattr(_stage_context, 'depth', 0)
+        _stage_context.depth = self.depth + 1
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+        _stage_context.depth = self.depth
+        if self.depth == 0:
+            _stage_context.total = getattr(_stage_context, 'total', 0.0) + elapsed
+        stage_latency.observe(self.stage, elapsed)
+        return False
+
+
+def _request_route():
+    if request.path.endswith('_dash-update-component'):
+        body = request.get_json(silent=True) or {}
+        return 'callback:' + str(body.get('output', ''))
+    return request.url_rule.rule if request.url_rule is not None else 'unmatched'
+
+
+def _profiling_requested():
+    if PROFILER not in ('cprofile', 'pyinstrument'):
+        return False
+    if request.headers.get('X-Verkplot-Profile') or request.args.get('profile') == '1':
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and np.random.random() < PROFILE_SAMPLE_RATE
+
+
+@server.before_request
+def _start_request_instrumentation():
+    _stage_context.total = 0.0
+    g.verkplot_profiler = None
+    if _profiling_requested():
+        if PROFILER == 'pyinstrument':
+            import pyinstrument
+            g.verkplot_profiler = pyinstrument.Profiler()
+            g.verkplot_profiler.start()
+        else:
+            import cProfile
+            g.verkplot_profiler = cProfile.Profile()
+            g.verkplot_profiler.enable()
+    g.verkplot_request_start = time.perf_counter()
+
+
+@server.after_request
+def _record_request_instrumentation(response):
+    start = g.get('verkplot_request_start')
+    if start is None:
+        return response
+    elapsed = time.perf_counter() - start
+    route = _request_route()
+    request_latency.observe(route, elapsed)
+    if not response.is_streamed:
+        response_size.observe(route, response.calculate_content_length() or 0)
+    if route.startswith('callback:'):
+        stage_latency.observe('dispatch_serialization', max(0.0, elapsed - getattr(_stage_context, 'total', 0.0)))
+
+    profiler = g.get('verkplot_profiler')
+    if profiler is not None:
+        _save_profile(profiler, route)
+    return response
+
+
+def _save_profile(profiler, route):
+    try:
+        os.makedirs(PROFILE_DIRECTORY, exist_ok=True)
+        name = '{}_{}_{}'.format(time.strftime('%Y%m%d-%H%M%S'), os.getpid(), ''.join(character if character.isalnum() else '_' for character in route)[:80])
+        if PROFILER == 'pyinstrument':
+            profiler.stop()
+            with open(os.path.join(PROFILE_DIRECTORY, name + '.html'), 'w') as profile_file:
+                profile_file.write(profiler.output_html())
+        else:
+            profiler.disable()
+            profiler.dump_stats(os.path.join(PROFILE_DIRECTORY, name + '.prof'))
+    except OSError:
+        server.logger.exception('Saving the request profile failed')
+
+
+def _result_cache_metrics():
+    stats = result_cache.stats()
+    return [
+                ('verkplot_result_cache_hits_total', 'counter', 'Result cache hits', {}, stats['hits']),
+                ('verkplot_result_cache_misses_total', 'counter', 'Result cache misses', {}, stats['misses']),
+                ('verkplot_result_cache_evictions_total', 'counter', 'Result cache evictions', {}, stats['evictions']),
+                ('verkplot_result_cache_entries', 'gauge', 'Result cache entries', {}, stats['size']),
+                ('verkplot_result_cache_hit_ratio', 'gauge', 'Result cache hit ratio', {}, stats['hit_rate']),
+        ]
+
+
+METRICS_COLLECTORS.append(_result_cache_metrics)
+
+
+def metrics_exposition():
+    lines = []
+    for name, label_name, histogram, description in (
+                                                        ('verkplot_request_seconds', 'route', request_latency, 'Request latency'),
+                                                        ('verkplot_response_bytes', 'route', response_size, 'Response payload size'),
+                                                        ('verkplot_stage_seconds', 'stage', stage_latency, 'Hot path stage latency'),
+                                                    ):
+        lines += ['# HELP {} {}'.format(name, description), '# TYPE {} histogram'.format(name)]
+        lines += histogram.exposition(name, label_name)
+
+    described = set()
+    for collect in METRICS_COLLECTORS:
+        for name, metric_type, description, labels, value in collect():
+            if name not in described:
+                described.add(name)
+                lines += ['# HELP {} {}'.format(name, description), '# TYPE {} {}'.format(name, metric_type)]
+            label = ','.join('{}="{}"'.format(key, _prometheus_escape(item)) for key, item in sorted(labels.items()))
+            lines.append('{}{} {!r}'.format(name, '{' + label + '}' if label else '', float(value)))
+    return '\n'.join(lines) + '\n'
+
+
+@server.route('/metrics')
+def metrics():
+    if not METRICS_PUBLIC and request.remote_addr not in ('127.0.0.1', '::1'):
+        return Response('Forbidden\n', status=403, mimetype='text/plain')
+    return Response(metrics_exposition(), mimetype='text/plain; version=0.0.4')
+#--------------------------------------------------------
+
+
+# Device specification hot reload
+# A daemon thread polls the spec file every VERKPLOT_SPEC_RELOAD_INTERVAL seconds (0
+# disables it). A changed file is reloaded once its mtime/size stayed the same for one poll,
+# so half written files are skipped. Parsing and the new DeviceRegistry are built on the
+# watcher thread, then swapped in with a single assignment and the derived caches are
+# invalidated. Callbacks take one device_registry snapshot per request, so requests in
+# flight finish on the registry they started with. A file that fails to parse keeps the
+# current registry until the file changes again.
+#--------------------------------------------------------
+SPEC_RELOAD_INTERVAL = float(os.environ.get('VERKPLOT_SPEC_RELOAD_INTERVAL', '2'))
+
+_spec_reload_lock = threading.Lock()
+_spec_watcher_pid = None
+
+
+def reload_device_specifications(path=SPEC_FILE_PATH):
+    global df, device_registry, spec_signature
+    with _spec_reload_lock:
+        signature = spec_file_signature(path)
+        spec_table = load_device_specifications(path)
+        registry = DeviceRegistry(spec_table)
+        spec_signature = signature
+        if registry.version == device_registry.version:
+            return False
+
+        df = spec_table
+        device_registry = registry
+        invalidate_derived_caches()
+        # Built here, in the watcher thread, rather than on the next keystroke
+        device_search_index(registry)
+        return True
+
+
+def _watch_spec_file(path, interval):
+    global spec_signature
+    pending_signature = None
+    while True:
+        time.sleep(interval)
+        signature = spec_file_signature(path)
+        if signature is None or signature == spec_signature:
+            pending_signature = None
+        elif signature != pending_signature:
+            pending_signature = signature
+        else:
+            try:
+                reload_device_specifications(path)
+            except Exception:
+                server.logger.exception('Reloading device specifications from %s failed', path)
+                # Retry only once the file changes again
+                spec_signature = signature
+            pending_signature = None
+
+
+# Starts the watcher once per process. Threads do not survive fork, so preloaded gunicorn
+# workers start their own from the post_fork hook.
+def start_spec_watcher(path=SPEC_FILE_PATH, interval=SPEC_RELOAD_INTERVAL):
+    global _spec_watcher_pid
+    if interval <= 0 or _spec_watcher_pid == os.getpid():
+        return
+    _spec_watcher_pid = os.getpid()
+    threading.Thread(target=_watch_spec_file, args=(path, interval), name='verkplot-spec-watcher', daemon=True).start()
 #--------------------------------------------------------
 
 
@@ -69,20 +924,240 @@ selected_tab_style = {
 #--------------------------------------------------------
 
 
+# Propagation model constants
+# ITU indoor (P.1238) distance power loss coefficient N and floor penetration factor Lf per technology
+# (WiFi uses the 2.4 GHz office values for both bands)
+#--------------------------------------------------------
+ITU_INDOOR_COEFFICIENTS = {
+                                'BLE': (30, 15),
+                                'Sub GHz': (33, 9),
+                                'wifi': (30, 15),
+                        }
+#--------------------------------------------------------
+
+# Installation heights assumed for the transmitter and receiver antennas
+DEFAULT_TX_ANTENNA_HEIGHT_M = 1
+DEFAULT_RX_ANTENNA_HEIGHT_M = 2.9
+
+
+# Propagation model registry
+# Every model is registered with the technologies it applies to, the parameters it uses,
+# its validity range and a vectorized kernel. Kernels reduce the model to log-distance form
+# PL(d) = A + B*log10(d) with d in meters and return (A, B) from the shared frequency and
+# antenna height terms, so the frequency/height maths runs once per configuration and never
+# per distance point. A distance limit that depends on frequency or antenna heights is
+# registered as distance_bounds(frequency_MHz, tx_ant_height, rx_ant_height) -> (lower,
+# upper), None for an open end. Registry order is the plotting order. Models registered with
+# enabled=False can be switched on with VERKPLOT_PROPAGATION_MODELS or
+# set_enabled_propagation_models().
+#--------------------------------------------------------
+class PropagationModel:
+    __slots__ = ('name', 'kernel', 'technologies', 'parameters', 'validity', 'distance_bounds', 'enabled', 'description', '_distance_ranges')
+
+    def __init__(self, name, kernel, technologies, parameters, validity, distance_bounds, enabled, description):
+        self.name = name
+        self.kernel = kernel
+        self.technologies = tuple(technologies)
+        self.parameters = tuple(parameters)
+        self.validity = dict(validity)
+        self.distance_bounds = distance_bounds
+        self.enabled = enabled
+        self.description = description
+        self._distance_ranges = {}
+
+    @property
+    def height_dependent(self):
+        return 'tx_ant_height' in self.parameters or 'rx_ant_height' in self.parameters
+
+    # Distance interval (m) in which the model is valid at a scalar frequency and antenna
+    # heights, empty (lower > upper) when one of those is out of range. Memoized per model,
+    # the validity of a registered model never changes.
+    def distance_range(self, frequency_MHz, tx_ant_height, rx_ant_height):
+        key = (frequency_MHz, tx_ant_height, rx_ant_height)
+        distance_range = self._distance_ranges.get(key)
+        if distance_range is None:
+            values = {'frequency_MHz': frequency_MHz, 'tx_ant_height': tx_ant_height, 'rx_ant_height': rx_ant_height}
+            lower, upper = self.validity.get('distance_m', (None, None))
+            distance_range = (-np.inf if lower is None else float(lower), np.inf if upper is None else float(upper))
+            if self.distance_bounds is not None:
+                lower, upper = self.distance_bounds(frequency_MHz, tx_ant_height, rx_ant_height)
+                distance_range = (distance_range[0] if lower is None else max(distance_range[0], float(lower)), distance_range[1] if upper is None else min(distance_range[1], float(upper)))
+            for parameter, (lower, upper) in self.validity.items():
+                if parameter != 'distance_m' and ((lower is not None and values[parameter] < lower) or (upper is not None and values[parameter] > upper)):
+                    distance_range = (np.inf, -np.inf)
+            if len(self._distance_ranges) >= 1024:
+                self._distance_ranges.clear()
+            self._distance_ranges[key] = distance_range
+        return distance_range
+
+
+PROPAGATION_MODEL_REGISTRY = {}
+
+def register_propagation_model(name, technologies, parameters=('frequency_MHz',), validity=None, distance_bounds=None, enabled=True, description=''):
+    def decorator(kernel):
+        PROPAGATION_MODEL_REGISTRY[name] = PropagationModel(name, kernel, technologies, parameters, validity or {}, distance_bounds, enabled, description)
+        if 'TECHNOLOGY_MODELS' in globals():
+            refresh_technology_models()
+        return kernel
+    return decorator
+
+
+@register_propagation_model('FSPL', ('BLE', 'Sub GHz', 'wifi'), description='Free Space Path Loss')
+def _fspl_kernel(terms, technology):
+    return 20*terms['log_f'] - 27.55, 20.0
+
+
+@register_propagation_model('ITU_Indoor_PL', ('BLE', 'Sub GHz', 'wifi'), description='ITU-R P.1238 indoor propagation')
+def _itu_indoor_kernel(terms, technology):
+    itu_N, itu_Lf = ITU_INDOOR_COEFFICIENTS[technology]
+    return 20*terms['log_f'] + itu_Lf - 28, float(itu_N)
+
+
+def _okumura_hata_urban(terms):
+    # Okumura Hata uses d in km -> log10(d/1000) = log10(d) - 3
+    log_f = terms['log_f']
+    a_hm = terms['rx_ant_height']*1.1*log_f - 0.7*terms['rx_ant_height'] - 1.56*log_f + 0.8
+    hata_slope = 44.9 - 6.55*terms['log_tx_height']
+    return 69.55 + 26.16*log_f - 13.82*terms['log_tx_height'] - a_hm - 3*hata_slope, hata_slope
+
+
+@register_propagation_model('Okumura_Hata_PL', ('Sub GHz',), ('frequency_MHz', 'tx_ant_height', 'rx_ant_height'),
+                            validity={'frequency_MHz': (150, 1500), 'distance_m': (1000, 20000), 'tx_ant_height': (30, 200), 'rx_ant_height': (1, 10)},
+                            description='Okumura Hata, urban')
+def _okumura_hata_kernel(terms, technology):
+    return _okumura_hata_urban(terms)
+
+
+@register_propagation_model('Okumura_Hata_Suburban_PL', ('Sub GHz',), ('frequency_MHz', 'tx_ant_height', 'rx_ant_height'),
+                            validity={'frequency_MHz': (150, 1500), 'distance_m': (1000, 20000), 'tx_ant_height': (30, 200), 'rx_ant_height': (1, 10)},
+                            enabled=False, description='Okumura Hata with the suburban correction')
+def _okumura_hata_suburban_kernel(terms, technology):
+    intercept, slope = _okumura_hata_urban(terms)
+    return intercept - 2*(terms['log_f'] - np.log10(28))**2 - 5.4, slope
+
+
+@register_propagation_model('COST231_Walfisch_Ikegami_PL', ('Sub GHz',),
+                            validity={'frequency_MHz': (800, 2000), 'distance_m': (20, 5000)},
+                            enabled=False, description='COST231-Walfisch-Ikegami, line of sight')
+def _cost231_walfisch_ikegami_kernel(terms, technology):
+    return 42.6 + 20*terms['log_f'] - 3*26, 26.0
+
+
+# Below the crossover distance d_c = 4*pi*ht*hr/lambda the direct and reflected rays still
+# interfere and path loss follows free space, not the 40 dB/decade two-ray slope
+def _two_ray_crossover_bounds(frequency_MHz, tx_ant_height, rx_ant_height):
+    wavelength_m = 299.792458/np.asarray(frequency_MHz, dtype=float)
+    return 4*np.pi*np.asarray(tx_ant_height, dtype=float)*np.asarray(rx_ant_height, dtype=float)/wavelength_m, None
+
+
+@register_propagation_model('Two_Ray_Ground_PL', ('Sub GHz',), ('tx_ant_height', 'rx_ant_height'),
+                            distance_bounds=_two_ray_crossover_bounds, enabled=False, description='Two-ray ground reflection (beyond the crossover distance)')
+def _two_ray_ground_kernel(terms, technology):
+    return -20*terms['log_tx_height'] - 20*terms['log_rx_height'], 40.0
+
+
+def set_enabled_propagation_models(names, invalidate=True):
+    unknown = set(names) - set(PROPAGATION_MODEL_REGISTRY)
+    if unknown:
+        raise ValueError('Unknown propagation models: {}'.format(', '.join(sorted(unknown))))
+    for name, model in PROPAGATION_MODEL_REGISTRY.items():
+        model.enabled = name in names
+    refresh_technology_models(invalidate)
+#--------------------------------------------------------
+
+
+# Log-distance coefficients of the requested (default: all registered) models
+# Frequency/heights may be arrays and broadcast together.
+#--------------------------------------------------------
+def propagation_coefficients(frequency_MHz, tx_ant_height=DEFAULT_TX_ANTENNA_HEIGHT_M, rx_ant_height=DEFAULT_RX_ANTENNA_HEIGHT_M, technology='Sub GHz', models=None):
+    models = PROPAGATION_MODEL_REGISTRY if models is None else models
+    frequency_MHz = np.asarray(frequency_MHz, dtype=float)
+    tx_ant_height = np.asarray(tx_ant_height, dtype=float)
+    rx_ant_height = np.asarray(rx_ant_height, dtype=float)
+    terms = {
+                'frequency_MHz': frequency_MHz,
+                'tx_ant_height': tx_ant_height,
+                'rx_ant_height': rx_ant_height,
+                'log_f': np.log10(frequency_MHz),
+                'log_tx_height': np.log10(tx_ant_height),
+                'log_rx_height': np.log10(rx_ant_height),
+            }
+
+    return {model: PROPAGATION_MODEL_REGISTRY[model].kernel(terms, technology) for model in models}
+
+
+def propagation_validity_mask(model, distance_m, frequency_MHz, tx_ant_height, rx_ant_height):
+    if np.ndim(frequency_MHz) == np.ndim(tx_ant_height) == np.ndim(rx_ant_height) == 0:
+        # Scalar frequency/heights (the link budget views) reduce to a distance interval
+        lower, upper = PROPAGATION_MODEL_REGISTRY[model].distance_range(frequency_MHz, tx_ant_height, rx_ant_height)
+        if lower == -np.inf and upper == np.inf:
+            return np.ones(np.shape(distance_m), dtype=bool)
+        distance_m = np.asarray(distance_m, dtype=float)
+        return (distance_m >= lower) & (distance_m <= upper)
+
+    values = {'distance_m': distance_m, 'frequency_MHz': frequency_MHz, 'tx_ant_height': tx_ant_height, 'rx_ant_height': rx_ant_height}
+    propagation_model = PROPAGATION_MODEL_REGISTRY[model]
+    shape = np.broadcast_shapes(np.shape(frequency_MHz), np.shape(tx_ant_height), np.shape(rx_ant_height)) + np.shape(distance_m)
+    expand = (Ellipsis,) + (None,)*np.ndim(distance_m)
+
+    mask = np.ones(shape, dtype=bool)
+    for parameter, (lower, upper) in propagation_model.validity.items():
+        value = np.asarray(values[parameter], dtype=float)
+        value = value if parameter == 'distance_m' else value[expand]
+        if lower is not None:
+            mask &= value >= lower
+        if upper is not None:
+            mask &= value <= upper
+    if propagation_model.distance_bounds is not None:
+        distance_m = np.asarray(distance_m, dtype=float)
+        lower, upper = propagation_model.distance_bounds(frequency_MHz, tx_ant_height, rx_ant_height)
+        if lower is not None:
+            mask &= distance_m >= np.asarray(lower)[expand]
+        if upper is not None:
+            mask &= distance_m <= np.asarray(upper)[expand]
+    return mask
+#--------------------------------------------------------
+
+
+# Array based propagation engine
+# Evaluates the requested models (default: the technology's enabled models) for a whole
+# distance vector in one fused broadcasted pass over log10(d). Output shape is
+# broadcast(frequency, heights).shape + distance.shape, so passing an array of frequencies
+# returns a frequency x distance grid. Path loss at d <= 0 is NaN, as is path loss outside
+# a model's declared validity range when enforce_validity is set.
+#--------------------------------------------------------
+def propagation_engine(distance_list, frequency_MHz, tx_ant_height=DEFAULT_TX_ANTENNA_HEIGHT_M, rx_ant_height=DEFAULT_RX_ANTENNA_HEIGHT_M, technology='Sub GHz', models=None, enforce_validity=False):
+    models = TECHNOLOGY_MODELS[technology] if models is None else models
+    distance_m = np.asarray(distance_list, dtype=float)
+    log_d = np.full(distance_m.shape, np.nan)
+    np.log10(distance_m, out=log_d, where=distance_m > 0)
+
+    coefficients = propagation_coefficients(frequency_MHz, tx_ant_height, rx_ant_height, technology, models)
+    terms = np.broadcast_arrays(*[term for model in models for term in coefficients[model]])
+    intercept = np.stack(terms[0::2])
+    slope = np.stack(terms[1::2])
+
+    expand = (Ellipsis,) + (None,)*log_d.ndim
+    path_loss = slope[expand]*log_d
+    path_loss += intercept[expand]
+
+    path_loss = dict(zip(models, path_loss))
+    if enforce_validity:
+        for model in models:
+            mask = propagation_validity_mask(model, distance_m, frequency_MHz, tx_ant_height, rx_ant_height)
+            path_loss[model] = np.where(mask, path_loss[model], np.nan)
+
+    return path_loss
+#--------------------------------------------------------
+
+
 # BLE propagation modeling function
 # Models used - Free Space Path Loss, ITU Indoor Propagation
 #--------------------------------------------------------
 def BLE_propagation_models(distance_list, frequency_MHz):
-    FSPL = [i for i in range(len(distance_list))]
-    ITU_Indoor_PL_BLE = [i for i in range(len(distance_list))]
+    path_loss = propagation_engine(distance_list, frequency_MHz, technology='BLE', models=('FSPL', 'ITU_Indoor_PL'))
 
-    i = 0
-    for distance_value in distance_list[1:]:    
-        i = i+1
-        FSPL[i] = 20*math.log10(distance_value) + 20*math.log10(frequency_MHz) - 27.55
-        ITU_Indoor_PL_BLE[i] = 20*math.log10(frequency_MHz) + 30*math.log10(distance_value) + 15 - 28
-
-    return FSPL, ITU_Indoor_PL_BLE
+    return path_loss['FSPL'], path_loss['ITU_Indoor_PL']
 #-------------------------------------------------------
 
 
@@ -90,758 +1165,2966 @@ def BLE_propagation_models(distance_list, frequency_MHz):
 # Models used - Free Space Path Loss, ITU Indoor Propagation, Okumura Hata
 #-----------------------------------------------------------------------------
 def subG_propagation_models(distance_list, frequency_MHz, tx_ant_height, rx_ant_height):
-    FSPL = [i for i in range(len(distance_list))]
-    ITU_Indoor_PL_subG = [i for i in range(len(distance_list))]
-    Okumura_Hata_PL = [i for i in range(len(distance_list))]
-    
-    
-    a_hm = rx_ant_height*1.1*math.log10(frequency_MHz) - 0.7*rx_ant_height - 1.56*math.log10(frequency_MHz) + 0.8
-
-    i = 0
-    for distance_value in distance_list[1:]:    
-        i = i+1
-        FSPL[i] = 20*math.log10(distance_value) + 20*math.log10(frequency_MHz) - 27.55
-        ITU_Indoor_PL_subG[i] = 20*math.log10(frequency_MHz) + 33*math.log10(distance_value) + 9 - 28
-        # 2-ray_GND_Reflection_PL[i] = 40*math.log10(distance_value) - (tx_ant_efficiency)indB - (rx_ant_efficiency)dB - 20*math.log10(tx_ant_height) - 20*math.log10(rx_ant_height)
-        Okumura_Hata_PL[i] = 69.55 + 26.16*math.log10(frequency_MHz) - 13.82*math.log10(tx_ant_height) - a_hm + 44.9*math.log10(distance_value/1000) - 6.55*math.log10(tx_ant_height)*math.log10(distance_value/1000)
-        # Okumura_Hata_PL[i] = 69.55 + 26.16*math.log10(frequency_MHz) - 13.82*math.log10(tx_ant_height) - a_hm + 44.9*math.log10(distance_value/1000) - 6.55*math.log10(tx_ant_height)*math.log10(distance_value/1000) - 40.94 -4.78*math.log10(frequency_MHz)*math.log10(frequency_MHz) + 18.33*math.log10(frequency_MHz)
-        # COST231_Walfish_Ikegami_PL[i] = 42.6 + 20*math.log10(frequency_MHz) + 26*math.log10(distance_value/1000) #COST231-Walfish-Ikegami LOS Model
+    path_loss = propagation_engine(distance_list, frequency_MHz, tx_ant_height, rx_ant_height, technology='Sub GHz', models=('FSPL', 'ITU_Indoor_PL', 'Okumura_Hata_PL'))
+    # 2-ray_GND_Reflection_PL[i] = 40*math.log10(distance_value) - (tx_ant_efficiency)indB - (rx_ant_efficiency)dB - 20*math.log10(tx_ant_height) - 20*math.log10(rx_ant_height)
 
-    return FSPL, ITU_Indoor_PL_subG, Okumura_Hata_PL
+    return path_loss['FSPL'], path_loss['ITU_Indoor_PL'], path_loss['Okumura_Hata_PL']
 #-----------------------------------------------------------------------------
 
 # RSSI calculation function
-# Common function used for both uplink and downlink
+# Common function used for both uplink and downlink, broadcasts over array inputs
 #-----------------------------------------------------------------------------
 def RSSI_calc(distance_list, tx_power_dBm, tx_ant_efficiency_dB, rx_ant_efficiency_dB, path_loss_contents_dB):
-    rssi_dBm = [i for i in range(len(distance_list))]
-
-    i = 0
-    for path_loss_value in path_loss_contents_dB[1:]:    
-        i = i+1
-        rssi_dBm[i] = tx_power_dBm + tx_ant_efficiency_dB + rx_ant_efficiency_dB - path_loss_value
+    rssi_dBm = (tx_power_dBm + tx_ant_efficiency_dB + rx_ant_efficiency_dB) - np.asarray(path_loss_contents_dB, dtype=float)
 
     return rssi_dBm
 #-----------------------------------------------------------------------------
 
 
-# Dash Layout Definition
+# Technology configuration
+# Center frequency and the propagation models plotted for each supported technology
 #-----------------------------------------------------------------------------
-app.layout = html.Div([
-    dbc.Card(
-        dbc.CardBody([
-            dbc.Row([
-                dbc.Col([
-                    html.Div([
-                                    html.Img(
-                                                    # src=app.get_asset_url('Verkada-Logo-Vert-Black.png'),
-                                                    src=app.get_asset_url('verkada-icon-black.png'),
-                                                    # className = 'two columns',
-                                                    style = {'height':'8%', 'width': '8%', 'paddingLeft': '15px'}
-                                            )
-                            ]),
-                        ], width=3),
-                        
-                dbc.Col([
-                    html.Div([]),
-                        ], width=6),
-                
-                dbc.Col([
-                    html.Div([
-                                    html.H1(
-                                                    ['VerkPlot'],
-                                                    style={'font-weight': 'bold', 'fontFamily': 'calibri', "textAlign":"right", 'padding-right':"15px", 'color':'#030E16'}
-                                            )
-                            ]),
-                        ], width=3),
-                    ], 
-                    # align='center',
-                    # className="h-25"
-                    ), 
+TECHNOLOGY_FREQUENCY_MHZ = {
+                                'BLE': 2440,
+                                'Sub GHz': 915,
+                                'wifi': 2437,
+                        }
 
+TECHNOLOGY_LABELS = {
+                        'BLE': 'BLE',
+                        'Sub GHz': 'subG',
+                        'wifi': 'WiFi',
+                }
 
-            dbc.Row([
-                dbc.Col([
-                    html.Div([
-                                    dcc.Tabs(
-                                                    id="tabs_inline",
-                                                    value = 'tab-1',
+TECHNOLOGY_OPTIONS = [{'label': 'Bluetooth LE (2440MHz)', 'value': 'BLE'}, {'label': 'Sub GHz (915MHz)', 'value': 'Sub GHz'}, {'label': 'WiFi (2437MHz)', 'value': 'wifi'}]
+
+# Enabled propagation models per technology, derived from the model registry
+TECHNOLOGY_MODELS = {}
+
+
+def refresh_technology_models(invalidate=True):
+    for technology in TECHNOLOGY_FREQUENCY_MHZ:
+        TECHNOLOGY_MODELS[technology] = tuple(name for name, model in PROPAGATION_MODEL_REGISTRY.items() if model.enabled and technology in model.technologies)
+    if invalidate:
+        invalidate_derived_caches()
+
+
+# Import only builds the tables: a fresh process (gunicorn worker, pool worker, job runner)
+# has nothing derived to drop and must not touch the result cache other workers share
+if os.environ.get('VERKPLOT_PROPAGATION_MODELS'):
+    set_enabled_propagation_models([name.strip() for name in os.environ['VERKPLOT_PROPAGATION_MODELS'].split(',') if name.strip()], invalidate=False)
+else:
+    refresh_technology_models(invalidate=False)
+
+# Selectable installation heights
+ANTENNA_HEIGHT_GRID_M = np.array([1, 1.5, 2, 2.9, 3, 4, 5, 7.5, 10, 15, 20, 30, 50, 75, 100, 150, 200], dtype=float)
+
+
+def technology_height_dependent(technology):
+    return any(PROPAGATION_MODEL_REGISTRY[model].height_dependent for model in TECHNOLOGY_MODELS[technology])
+
+
+def sanitize_antenna_heights(tx_ant_height, rx_ant_height):
+    heights = []
+    for height, default in ((tx_ant_height, DEFAULT_TX_ANTENNA_HEIGHT_M), (rx_ant_height, DEFAULT_RX_ANTENNA_HEIGHT_M)):
+        try:
+            height = float(height)
+        except (TypeError, ValueError):
+            height = default
+        heights.append(min(height, ANTENNA_HEIGHT_GRID_M[-1]) if height > 0 else default)
+    return tuple(heights)
+#-----------------------------------------------------------------------------
+
+
+# Channel plans
+# Center frequencies (MHz) of every channel in each band of a technology, for the channel sweep
+#   BLE       40 channels, 2402-2480 MHz
+#   Sub GHz   902-928 MHz ISM hopping channels on a 200 kHz grid
+#   wifi      2.4 GHz channels 1-13 and the 20 MHz 5 GHz channels 36-165 (U-NII 1 to 3)
+#-----------------------------------------------------------------------------
+WIFI_5GHZ_CHANNELS = np.r_[36:65:4, 100:145:4, 149:166:4]
+
+TECHNOLOGY_BANDS = {
+                        'BLE': {'2.4 GHz': 2402 + 2.0*np.arange(40)},
+                        'Sub GHz': {'902-928 MHz': np.round(902.2 + 0.2*np.arange(129), 1)},
+                        'wifi': {'2.4 GHz': 2407 + 5.0*np.arange(1, 14), '5 GHz': 5000 + 5.0*WIFI_5GHZ_CHANNELS},
+                }
+
+
+def band_options(technology_sel):
+    return [{'label': '{} ({} channels)'.format(band, len(channels_MHz)), 'value': band} for band, channels_MHz in TECHNOLOGY_BANDS[technology_sel].items()]
+#-----------------------------------------------------------------------------
+
+
+# Closed form maximum range solver
+# Every model is PL(d) = A + B*log10(d), so the distance where the path loss uses up the
+# whole link budget is d_max = 10^((budget - A)/B). All inputs broadcast, which makes the
+# solver O(1) per device pair and exact (no sampling of the RSSI curve).
+# link budget = tx power + tx antenna efficiency + rx antenna efficiency
+#               - rx receive sensitivity - fade margin
+#-----------------------------------------------------------------------------
+def range_for_path_loss(max_path_loss_dB, technology, frequency_MHz=None, tx_ant_height=DEFAULT_TX_ANTENNA_HEIGHT_M, rx_ant_height=DEFAULT_RX_ANTENNA_HEIGHT_M, models=None):
+    models = TECHNOLOGY_MODELS[technology] if models is None else models
+    frequency_MHz = TECHNOLOGY_FREQUENCY_MHZ[technology] if frequency_MHz is None else frequency_MHz
+    coefficients = propagation_coefficients(frequency_MHz, tx_ant_height, rx_ant_height, technology)
+    max_path_loss_dB = np.asarray(max_path_loss_dB, dtype=float)
+
+    return {model: 10**((max_path_loss_dB - coefficients[model][0])/coefficients[model][1]) for model in models}
+
+
+def max_range_solver(tx_power_dBm, tx_ant_efficiency_dB, rx_ant_efficiency_dB, rx_sensitivity_dBm, technology, fade_margin_dB=0, frequency_MHz=None, tx_ant_height=DEFAULT_TX_ANTENNA_HEIGHT_M, rx_ant_height=DEFAULT_RX_ANTENNA_HEIGHT_M):
+    link_budget_dB = np.asarray(tx_power_dBm, dtype=float) + tx_ant_efficiency_dB + rx_ant_efficiency_dB - rx_sensitivity_dBm - fade_margin_dB
+    return range_for_path_loss(link_budget_dB, technology, frequency_MHz, tx_ant_height, rx_ant_height)
+
+
+# Uplink (tx -> rx), downlink (rx -> tx, antenna heights swapped) and bidirectional range
+# for device parameter dicts or arrays of many pairs
+def link_range_summary(tx_device_parameters, rx_device_parameters, technology, fade_margin_dB=0, tx_ant_height=DEFAULT_TX_ANTENNA_HEIGHT_M, rx_ant_height=DEFAULT_RX_ANTENNA_HEIGHT_M):
+    uplink = max_range_solver(tx_device_parameters['tx_power'], tx_device_parameters['ant_efficiency'], rx_device_parameters['ant_efficiency'], rx_device_parameters['rx_sensitivity'], technology, fade_margin_dB, tx_ant_height=tx_ant_height, rx_ant_height=rx_ant_height)
+    downlink = max_range_solver(rx_device_parameters['tx_power'], rx_device_parameters['ant_efficiency'], tx_device_parameters['ant_efficiency'], tx_device_parameters['rx_sensitivity'], technology, fade_margin_dB, tx_ant_height=rx_ant_height, rx_ant_height=tx_ant_height)
+
+    return {model: {'uplink': uplink[model], 'downlink': downlink[model], 'bidirectional': np.minimum(uplink[model], downlink[model])} for model in uplink}
+#-----------------------------------------------------------------------------
+
+
+# Distance sweep generation
+# Linear sampling starts at 0 m like the original plots, log sampling starts at 1 m. The
+# adaptive sweep spends a quarter of the points on a coarse log grid and the rest densely
+# around every distance where a link crosses its receive sensitivity, so the range read
+# off the curves stays accurate for long sub-GHz sweeps with a bounded number of points.
+#-----------------------------------------------------------------------------
+DISTANCE_SAMPLING_MODES = ('linear', 'log', 'adaptive')
+DEFAULT_DISTANCE_TARGET_M = 100
+DEFAULT_DISTANCE_MAX_M = 200
+DEFAULT_DISTANCE_POINTS = 201
+DISTANCE_SWEEP_MIN_M = 1
+MAX_DISTANCE_M = 1e6
+MAX_DISTANCE_POINTS = 20000
+ADAPTIVE_REFINEMENT_WINDOW = 0.1
+
+
+def sanitize_distance_sweep(distance_max, num_points, sampling, distance_target=DEFAULT_DISTANCE_TARGET_M):
+    distance_max = float(distance_max) if distance_max else DEFAULT_DISTANCE_MAX_M
+    distance_max = min(max(distance_max, 2*DISTANCE_SWEEP_MIN_M), MAX_DISTANCE_M)
+    num_points = int(num_points) if num_points else DEFAULT_DISTANCE_POINTS
+    num_points = min(max(num_points, 2), MAX_DISTANCE_POINTS)
+    sampling = sampling if sampling in DISTANCE_SAMPLING_MODES else 'linear'
+    distance_target = float(distance_target) if distance_target is not None else DEFAULT_DISTANCE_TARGET_M
+    return distance_max, num_points, sampling, distance_target
+
+
+def distance_sweep(distance_max=DEFAULT_DISTANCE_MAX_M, num_points=DEFAULT_DISTANCE_POINTS, sampling='linear'):
+    if sampling == 'linear':
+        return np.linspace(0, distance_max, num_points)
+    return np.geomspace(DISTANCE_SWEEP_MIN_M, distance_max, num_points)
+
+
+def adaptive_distance_sweep(distance_max, num_points, technology, frequency_MHz, links):
+    # links - iterable of (tx_ant_height, rx_ant_height, link_budget_dB) to refine around
+    models = TECHNOLOGY_MODELS[technology]
+    coarse_points = max(num_points // 4, 8)
+    coarse = np.geomspace(DISTANCE_SWEEP_MIN_M, distance_max, coarse_points)
+
+    crossings = []
+    for tx_ant_height, rx_ant_height, link_budget_dB in links:
+        for crossing in range_for_path_loss(link_budget_dB, technology, frequency_MHz, tx_ant_height, rx_ant_height, models).values():
+            if DISTANCE_SWEEP_MIN_M <= crossing <= distance_max:
+                crossings.append(float(crossing))
+
+    if not crossings:
+        return distance_sweep(distance_max, num_points, 'log')
+
+    refine_points = max((num_points - coarse_points) // len(crossings), 2)
+    windows = [np.linspace(max(crossing/(1 + ADAPTIVE_REFINEMENT_WINDOW), DISTANCE_SWEEP_MIN_M), min(crossing*(1 + ADAPTIVE_REFINEMENT_WINDOW), distance_max), refine_points) for crossing in crossings]
+
+    return np.unique(np.concatenate([coarse] + windows))
+#-----------------------------------------------------------------------------
+
+
+# Precomputed path loss tables
+# Path loss only depends on technology, frequency, antenna heights and distance - never on
+# the chosen devices - so it is computed once per configuration and shared by every request.
+# Arrays are (models x distances) and read-only. The downlink swaps the antenna heights;
+# when no model depends on height (e.g. BLE) downlink reuses the uplink array. Every
+# height is evaluated in closed form, which is exact for all models and costs no more
+# than interpolating a height grid would. uplink_valid/downlink_valid flag the points
+# inside each model's declared validity range, the figures and API mark the rest.
+#-----------------------------------------------------------------------------
+def validity_masks(distance_list, technology, frequency_MHz, tx_ant_height, rx_ant_height, models):
+    distance_m = np.asarray(distance_list, dtype=float)
+    masks = np.ones((len(models),) + distance_m.shape, dtype=bool)
+    for k, model in enumerate(models):
+        lower, upper = PROPAGATION_MODEL_REGISTRY[model].distance_range(frequency_MHz, tx_ant_height, rx_ant_height)
+        if lower > upper:
+            masks[k] = False
+        elif lower > -np.inf or upper < np.inf:
+            np.logical_and(distance_m >= lower, distance_m <= upper, out=masks[k])
+    return masks
+
+
+def _directional_path_loss(distance_list, technology, frequency_MHz, tx_ant_height, rx_ant_height, models):
+    path_loss = propagation_engine(distance_list, frequency_MHz, tx_ant_height, rx_ant_height, technology, models)
+    return np.stack([path_loss[model] for model in models])
+
+
+def link_path_loss(distance_list, technology, frequency_MHz, tx_ant_height, rx_ant_height):
+    models = TECHNOLOGY_MODELS[technology]
+
+    uplink = _directional_path_loss(distance_list, technology, frequency_MHz, tx_ant_height, rx_ant_height, models)
+
+    if tx_ant_height == rx_ant_height or not any(PROPAGATION_MODEL_REGISTRY[model].height_dependent for model in models):
+        downlink = uplink
+    else:
+        downlink = _directional_path_loss(distance_list, technology, frequency_MHz, rx_ant_height, tx_ant_height, models)
+
+    uplink_valid = validity_masks(distance_list, technology, frequency_MHz, tx_ant_height, rx_ant_height, models)
+    if tx_ant_height == rx_ant_height or not any(PROPAGATION_MODEL_REGISTRY[model].distance_bounds is not None or parameter in PROPAGATION_MODEL_REGISTRY[model].validity for model in models for parameter in ('tx_ant_height', 'rx_ant_height')):
+        downlink_valid = uplink_valid
+    else:
+        downlink_valid = validity_masks(distance_list, technology, frequency_MHz, rx_ant_height, tx_ant_height, models)
+
+    return {'models': models, 'distance': distance_list, 'uplink': uplink, 'downlink': downlink, 'uplink_valid': uplink_valid, 'downlink_valid': downlink_valid}
+
+
+@functools.lru_cache(maxsize=128)
+def path_loss_table(technology, frequency_MHz, tx_ant_height, rx_ant_height, distance_max=DEFAULT_DISTANCE_MAX_M, num_points=DEFAULT_DISTANCE_POINTS, sampling='linear'):
+    path_loss = link_path_loss(distance_sweep(distance_max, num_points, sampling), technology, frequency_MHz, tx_ant_height, rx_ant_height)
+
+    for key in ('distance', 'uplink', 'downlink', 'uplink_valid', 'downlink_valid'):
+        path_loss[key].setflags(write=False)
+
+    return path_loss
+
+
+DERIVED_CACHE_INVALIDATORS.append(path_loss_table.cache_clear)
+
+
+def _path_loss_table_metrics():
+    info = path_loss_table.cache_info()
+    return [
+                ('verkplot_path_loss_table_hits_total', 'counter', 'Path loss table cache hits', {}, info.hits),
+                ('verkplot_path_loss_table_misses_total', 'counter', 'Path loss table cache misses', {}, info.misses),
+                ('verkplot_path_loss_table_entries', 'gauge', 'Path loss tables cached', {}, info.currsize),
+        ]
+
+
+METRICS_COLLECTORS.append(_path_loss_table_metrics)
+#-----------------------------------------------------------------------------
+
+
+# Channel sweep path loss
+# Every channel of a band and every distance is one broadcasted channels x distance grid per
+# model and direction (the engine takes a frequency array), reduced to the worst (highest)
+# and best (lowest) path loss over the channels. Like path_loss_table it is independent of
+# the devices, the RSSI envelopes are a single offset of these arrays. Only the envelopes and
+# the index of the worst / best channel per distance are cached, not the full grid.
+#-----------------------------------------------------------------------------
+@functools.lru_cache(maxsize=32)
+def channel_path_loss_table(technology, band, tx_ant_height, rx_ant_height, distance_max=DEFAULT_DISTANCE_MAX_M, num_points=DEFAULT_DISTANCE_POINTS, sampling='linear'):
+    channels_MHz = TECHNOLOGY_BANDS[technology][band]
+    path_loss = link_path_loss(distance_sweep(distance_max, num_points, sampling), technology, channels_MHz, tx_ant_height, rx_ant_height)
+
+    table = {'models': path_loss['models'], 'distance': path_loss['distance'], 'channels': channels_MHz}
+    for direction in ('uplink', 'downlink'):
+        # (models, channels, distances); NaN at d <= 0 stays NaN in both envelopes
+        grid = path_loss[direction]
+        table[direction + '_worst'] = grid.max(axis=1)
+        table[direction + '_best'] = grid.min(axis=1)
+        table[direction + '_worst_channel'] = np.argmax(np.nan_to_num(grid, nan=-np.inf), axis=1)
+        table[direction + '_best_channel'] = np.argmin(np.nan_to_num(grid, nan=np.inf), axis=1)
+
+    for array in table.values():
+        if isinstance(array, np.ndarray):
+            array.setflags(write=False)
+
+    return table
+
+
+DERIVED_CACHE_INVALIDATORS.append(channel_path_loss_table.cache_clear)
+#-----------------------------------------------------------------------------
+
+
+# Batch link budget calculation
+# Evaluates every transmitter x receiver pair of the device table (a DeviceRegistry or
+# spec DataFrame) in one call.
+# Returns the margin tensor margin[i, j, model, distance] = RSSI at device j when device i
+# transmits minus the receive sensitivity of device j, and the model names of axis 2.
+# tx_rows restricts axis 0 to a subset (index array or slice) of the transmitters.
+#-----------------------------------------------------------------------------
+def _as_device_registry(devices):
+    if isinstance(devices, DeviceRegistry):
+        return devices
+    return DeviceRegistry(devices)
+
+
+def batch_link_budget(devices, distance_list, technology, tx_ant_height=DEFAULT_TX_ANTENNA_HEIGHT_M, rx_ant_height=DEFAULT_RX_ANTENNA_HEIGHT_M, tx_rows=slice(None)):
+    models = TECHNOLOGY_MODELS[technology]
+    devices = _as_device_registry(devices)
+    tx_power_dBm = devices.tx_power_dBm[tx_rows]
+    ant_efficiency_dB = devices.ant_efficiency_dB
+    rx_sensitivity_dBm = devices.rx_sensitivity_dBm
+
+    path_loss = propagation_engine(distance_list, TECHNOLOGY_FREQUENCY_MHZ[technology], tx_ant_height, rx_ant_height, technology, models)
+    path_loss = np.stack([path_loss[model] for model in models])
+
+    rssi_dBm = RSSI_calc(distance_list, tx_power_dBm[:, None, None, None], ant_efficiency_dB[tx_rows][:, None, None, None], ant_efficiency_dB[None, :, None, None], path_loss[None, None])
+    margin_dB = rssi_dBm - rx_sensitivity_dBm[None, :, None, None]
+
+    return margin_dB, models
+#-----------------------------------------------------------------------------
+
+
+# Batch maximum range calculation
+# Closed form range for every transmitter x receiver pair, shape (N, N, models). For a pair
+# (i, j) uplink is i -> j with the (tx, rx) antenna heights and downlink is j -> i with the
+# heights swapped.
+#-----------------------------------------------------------------------------
+def batch_max_range(devices, technology, tx_ant_height=DEFAULT_TX_ANTENNA_HEIGHT_M, rx_ant_height=DEFAULT_RX_ANTENNA_HEIGHT_M, fade_margin_dB=0):
+    devices = _as_device_registry(devices)
+    models = TECHNOLOGY_MODELS[technology]
+    tx_device_parameters = {'tx_power': devices.tx_power_dBm[:, None], 'ant_efficiency': devices.ant_efficiency_dB[:, None], 'rx_sensitivity': devices.rx_sensitivity_dBm[:, None]}
+    rx_device_parameters = {'tx_power': devices.tx_power_dBm[None, :], 'ant_efficiency': devices.ant_efficiency_dB[None, :], 'rx_sensitivity': devices.rx_sensitivity_dBm[None, :]}
+
+    summary = link_range_summary(tx_device_parameters, rx_device_parameters, technology, fade_margin_dB, tx_ant_height, rx_ant_height)
+
+    return {
+                'models': models,
+                'uplink': np.stack([summary[model]['uplink'] for model in models], axis=-1),
+                'downlink': np.stack([summary[model]['downlink'] for model in models], axis=-1),
+                'bidirectional': np.stack([summary[model]['bidirectional'] for model in models], axis=-1),
+            }
+#-----------------------------------------------------------------------------
+
+
+# Monte Carlo fading / shadowing simulation
+# RSSI = deterministic RSSI + X (log-normal shadowing, N(0, sigma) in dB)
+#                           + 10*log10(|h|^2) (Rayleigh or Rician small scale fading power)
+# The channel variation does not depend on the device pair or distance, so every chunk of
+# samples is sorted once and P(RSSI < sensitivity) = P(variation < -margin) is counted for
+# all pair/distance bins with a binary search - each bin sees every sample. Chunks get
+# their own SeedSequence children and run on a process pool, so results are deterministic
+# for a given seed and chunk size regardless of the number of processes.
+#-----------------------------------------------------------------------------
+FADING_MODELS = ('none', 'rayleigh', 'rician')
+DEFAULT_RICIAN_K_FACTOR_DB = 6
+MONTE_CARLO_SAMPLES = int(os.environ.get('VERKPLOT_MONTE_CARLO_SAMPLES', str(10**6)))
+MONTE_CARLO_CHUNK_SAMPLES = int(os.environ.get('VERKPLOT_MONTE_CARLO_CHUNK_SAMPLES', str(250000)))
+MONTE_CARLO_PROCESSES = int(os.environ.get('VERKPLOT_MONTE_CARLO_PROCESSES', str(os.cpu_count() or 1)))
+
+_simulation_executor = None
+_simulation_executor_lock = threading.Lock()
+
+
+# A forked child (e.g. a gunicorn worker of a preloaded master) must never reuse the
+# parent's pool, it creates its own on first use
+def _reset_simulation_executor():
+    global _simulation_executor, _simulation_executor_lock
+    _simulation_executor = None
+    _simulation_executor_lock = threading.Lock()
+
+
+# Only POSIX has fork
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_simulation_executor)
+
+
+# Workers are spawned, forking from a threaded server could copy locks held by other threads
+def simulation_executor():
+    global _simulation_executor
+    with _simulation_executor_lock:
+        if _simulation_executor is None:
+            _simulation_executor = ProcessPoolExecutor(max_workers=MONTE_CARLO_PROCESSES, mp_context=multiprocessing.get_context('spawn'))
+        return _simulation_executor
+
+
+def channel_variation_samples(rng, num_samples, shadowing_sigma_dB=0, fading='none', rician_k_factor_dB=DEFAULT_RICIAN_K_FACTOR_DB):
+    if shadowing_sigma_dB:
+        variation_dB = rng.normal(0.0, shadowing_sigma_dB, num_samples)
+    else:
+        variation_dB = np.zeros(num_samples)
+
+    if fading == 'rayleigh':
+        fading_power = rng.exponential(1.0, num_samples)
+    elif fading == 'rician':
+        k_factor = 10**(rician_k_factor_dB/10)
+        line_of_sight = np.sqrt(k_factor/(k_factor + 1))
+        scatter = np.sqrt(1/(2*(k_factor + 1)))
+        fading_power = (line_of_sight + scatter*rng.standard_normal(num_samples))**2 + (scatter*rng.standard_normal(num_samples))**2
+    else:
+        return variation_dB
+
+    variation_dB += 10*np.log10(fading_power)
+    return variation_dB
+
+
+def _outage_counts(task):
+    seed_sequence, num_samples, thresholds_dB, shadowing_sigma_dB, fading, rician_k_factor_dB = task
+    rng = np.random.default_rng(seed_sequence)
+    variation_dB = np.sort(channel_variation_samples(rng, num_samples, shadowing_sigma_dB, fading, rician_k_factor_dB))
+    return np.searchsorted(variation_dB, thresholds_dB, side='left')
+
+
+def monte_carlo_outage(margin_dB, shadowing_sigma_dB=8.0, fading='rayleigh', rician_k_factor_dB=DEFAULT_RICIAN_K_FACTOR_DB, num_samples=MONTE_CARLO_SAMPLES, seed=0, processes=MONTE_CARLO_PROCESSES, chunk_samples=MONTE_CARLO_CHUNK_SAMPLES):
+    if fading not in FADING_MODELS:
+        raise ValueError('Unknown fading model: {}'.format(fading))
+    margin_dB = np.asarray(margin_dB, dtype=float)
+    thresholds_dB = -margin_dB.ravel()
+    undefined = np.isnan(thresholds_dB)
+    thresholds_dB = np.where(undefined, 0.0, thresholds_dB)
+
+    chunk_sizes = [chunk_samples]*(num_samples // chunk_samples)
+    if num_samples % chunk_samples:
+        chunk_sizes.append(num_samples % chunk_samples)
+    seed_sequences = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    tasks = [(seed_sequence, chunk_size, thresholds_dB, shadowing_sigma_dB, fading, rician_k_factor_dB) for seed_sequence, chunk_size in zip(seed_sequences, chunk_sizes)]
+
+    if processes > 1 and len(tasks) > 1:
+        outage_counts = sum(simulation_executor().map(_outage_counts, tasks))
+    else:
+        outage_counts = sum(map(_outage_counts, tasks))
+
+    outage_probability = outage_counts/num_samples
+    outage_probability[undefined] = np.nan
+    return outage_probability.reshape(margin_dB.shape)
+
+
+# Outage probability for every transmitter x receiver pair, model and distance bin
+# (N x N x models x distances), built on the batch margin tensor
+def pair_outage_sweep(devices, distance_list, technology, tx_ant_height=DEFAULT_TX_ANTENNA_HEIGHT_M, rx_ant_height=DEFAULT_RX_ANTENNA_HEIGHT_M, **simulation):
+    margin_dB, models = batch_link_budget(devices, distance_list, technology, tx_ant_height, rx_ant_height)
+    return monte_carlo_outage(margin_dB, **simulation), models
+#-----------------------------------------------------------------------------
+
+
+# 2-D floor plan coverage engine
+# A floor plan is a grid of square cells with wall segments, each wall adding its
+# attenuation to every path that crosses it. For every cell the strongest transmitter wins:
+#   RSSI(cell) = max over tx of (EIRP_tx - PL(|cell - tx|) - sum of crossed wall losses)
+# PL uses the same log-distance (A, B) coefficients as the link budget plots. The grid is
+# evaluated in row tiles of at most tile_cells cells x walls elements, so memory stays
+# bounded for 1000 x 1000 grids with many transmitters and walls. Receive antenna
+# efficiency and sensitivity are constant offsets, so one receiver independent grid serves
+# every candidate receiver device.
+#-----------------------------------------------------------------------------
+COVERAGE_TILE_CELLS = int(os.environ.get('VERKPLOT_COVERAGE_TILE_CELLS', str(2**18)))
+COVERAGE_MAX_CELLS = int(os.environ.get('VERKPLOT_COVERAGE_MAX_CELLS', str(10**6)))
+DEFAULT_FLOOR_WIDTH_M = 50
+DEFAULT_FLOOR_LENGTH_M = 30
+DEFAULT_CELL_SIZE_M = 0.25
+DEFAULT_FLOOR_TRANSMITTERS = '25, 15'
+DEFAULT_FLOOR_WALLS = '15, 0, 15, 20, 6; 35, 10, 35, 30, 6; 0, 20, 10, 20, 3'
+# Receivers listed in the coverage summary table, best covered first
+COVERAGE_SUMMARY_ROWS = int(os.environ.get('VERKPLOT_COVERAGE_SUMMARY_ROWS', '100'))
+
+
+class FloorPlan:
+    __slots__ = ('width_m', 'length_m', 'cell_size_m', 'walls')
+
+    def __init__(self, width_m, length_m, cell_size_m=DEFAULT_CELL_SIZE_M, walls=()):
+        if width_m <= 0 or length_m <= 0 or cell_size_m <= 0:
+            raise ValueError('Floor plan dimensions and cell size must be positive')
+        self.width_m = float(width_m)
+        self.length_m = float(length_m)
+        self.cell_size_m = float(cell_size_m)
+        # (x0, y0, x1, y1, attenuation_dB) per wall
+        self.walls = np.asarray(walls, dtype=float).reshape(-1, 5)
+
+    @property
+    def shape(self):
+        return int(np.ceil(self.length_m/self.cell_size_m)), int(np.ceil(self.width_m/self.cell_size_m))
+
+    # Cell center coordinates along x (columns) and y (rows)
+    def axes(self):
+        rows, columns = self.shape
+        return (np.arange(columns) + 0.5)*self.cell_size_m, (np.arange(rows) + 0.5)*self.cell_size_m
+
+
+# "x, y; x, y" and "x0, y0, x1, y1, dB; ..." style text lists used by the coverage tab
+def parse_number_list(text, columns):
+    entries = [entry for entry in (text or '').split(';') if entry.strip()]
+    values = [[float(value) for value in entry.split(',')] for entry in entries]
+    if any(len(entry) != columns for entry in values):
+        raise ValueError('Expected {} comma separated numbers per entry'.format(columns))
+    return np.asarray(values, dtype=float).reshape(-1, columns)
+
+
+# Sum of the attenuation of the walls crossed by the segments tx -> (x, y), wall endpoints
+# touching the segment are not counted
+def wall_attenuation(tx_x, tx_y, x, y, walls):
+    if not len(walls):
+        return np.zeros(np.broadcast_shapes(np.shape(x), np.shape(y)))
+    wall_x0, wall_y0, wall_x1, wall_y1, attenuation_dB = (column.reshape((1,)*np.ndim(x) + (-1,)) for column in walls.T)
+    x = np.asarray(x)[..., None]
+    y = np.asarray(y)[..., None]
+
+    # Both ends of each segment must lie strictly on opposite sides of the other's line
+    side_tx = (wall_x1 - wall_x0)*(tx_y - wall_y0) - (wall_y1 - wall_y0)*(tx_x - wall_x0)
+    side_cell = (wall_x1 - wall_x0)*(y - wall_y0) - (wall_y1 - wall_y0)*(x - wall_x0)
+    side_start = (x - tx_x)*(wall_y0 - tx_y) - (y - tx_y)*(wall_x0 - tx_x)
+    side_end = (x - tx_x)*(wall_y1 - tx_y) - (y - tx_y)*(wall_x1 - tx_x)
+    crossed = (side_tx*side_cell < 0) & (side_start*side_end < 0)
+
+    return (crossed*attenuation_dB).sum(axis=-1)
+
+
+# transmitters: (x_m, y_m, EIRP_dBm) rows with EIRP = tx power + tx antenna efficiency.
+# Returns the best RSSI grid before receive antenna efficiency (float32, rows = y) and the
+# index of the serving transmitter per cell.
+def coverage_map(floor_plan, transmitters, technology, model, frequency_MHz=None, tx_ant_height=DEFAULT_TX_ANTENNA_HEIGHT_M, rx_ant_height=DEFAULT_RX_ANTENNA_HEIGHT_M, tile_cells=COVERAGE_TILE_CELLS):
+    rows, columns = floor_plan.shape
+    if rows*columns > COVERAGE_MAX_CELLS:
+        raise ValueError('Floor plan grid has {} cells, the limit is {}'.format(rows*columns, COVERAGE_MAX_CELLS))
+    transmitters = np.asarray(transmitters, dtype=float).reshape(-1, 3)
+    frequency_MHz = TECHNOLOGY_FREQUENCY_MHZ[technology] if frequency_MHz is None else frequency_MHz
+    intercept, slope = (float(term) for term in propagation_coefficients(frequency_MHz, tx_ant_height, rx_ant_height, technology, (model,))[model])
+
+    x_axis, y_axis = floor_plan.axes()
+    rssi_dBm = np.full((rows, columns), -np.inf, dtype=np.float32)
+    serving = np.zeros((rows, columns), dtype=np.int16)
+    tile_rows = max(1, tile_cells // (columns*max(1, len(floor_plan.walls))))
+
+    for start in range(0, rows, tile_rows):
+        y = y_axis[start:start + tile_rows, None]
+        tile_rssi = rssi_dBm[start:start + tile_rows]
+        tile_serving = serving[start:start + tile_rows]
+        for index, (tx_x, tx_y, eirp_dBm) in enumerate(transmitters):
+            # Cells closer than the 1 m reference distance use the 1 m path loss
+            distance_m = np.maximum(np.hypot(x_axis - tx_x, y - tx_y), DISTANCE_SWEEP_MIN_M)
+            candidate = eirp_dBm - (intercept + slope*np.log10(distance_m))
+            candidate -= wall_attenuation(tx_x, tx_y, x_axis, y, floor_plan.walls)
+            better = candidate > tile_rssi
+            tile_rssi[better] = candidate[better]
+            tile_serving[better] = index
+
+    return rssi_dBm, serving
+
+
+# Margin grid of one receiver device over a coverage map
+def coverage_margin(rssi_dBm, rx_device_parameters, fade_margin_dB=0):
+    return rssi_dBm + np.float32(rx_device_parameters['ant_efficiency'] - rx_device_parameters['rx_sensitivity'] - fade_margin_dB)
+
+
+# Fraction of the floor covered (margin >= 0) for every receiver device of a DeviceRegistry,
+# one sort of the grid plus a binary search per device
+def receiver_coverage(rssi_dBm, devices, fade_margin_dB=0):
+    devices = _as_device_registry(devices)
+    sorted_rssi = np.sort(rssi_dBm, axis=None)
+    thresholds_dBm = devices.rx_sensitivity_dBm + fade_margin_dB - devices.ant_efficiency_dB
+    return 1 - np.searchsorted(sorted_rssi, thresholds_dBm.astype(np.float32), side='left')/sorted_rssi.size
+#-----------------------------------------------------------------------------
+
+
+# Co-channel interference / SINR engine
+# Nodes are devices of the catalog at (x, y[, z]) positions with a duty cycle and a channel
+# of one of the technology's bands. Received power of every transmitter at every receiver is
+# an N x N pairwise matrix (rows = receivers) built from the log-distance (A, B) coefficients
+# of one propagation model, per pair frequency and antenna heights broadcasting like the
+# engine. Each receiver is served by the given node (or the strongest co-channel node) and
+#   interference = sum over the other co-channel transmitters of duty cycle * received power
+#   SINR = signal / (interference + thermal noise)
+# The matrix is never materialized: rows are evaluated in chunks of at most chunk_elements
+# pairs, on the simulation process pool for sites of SINR_PARALLEL_NODES nodes or more.
+#-----------------------------------------------------------------------------
+TECHNOLOGY_BANDWIDTH_HZ = {
+                                'BLE': 1e6,
+                                'Sub GHz': 200e3,
+                                'wifi': 20e6,
+                        }
+DEFAULT_NOISE_FIGURE_DB = 6
+SINR_DEFAULT_MODEL = 'ITU_Indoor_PL'
+SINR_CHUNK_ELEMENTS = int(os.environ.get('VERKPLOT_SINR_CHUNK_ELEMENTS', str(2**21)))
+SINR_PARALLEL_NODES = int(os.environ.get('VERKPLOT_SINR_PARALLEL_NODES', '4000'))
+
+
+def thermal_noise_dBm(bandwidth_Hz, noise_figure_dB=DEFAULT_NOISE_FIGURE_DB):
+    return -174 + 10*np.log10(bandwidth_Hz) + noise_figure_dB
+
+
+# Per node arrays shared by every chunk of one SINR evaluation
+def sinr_nodes(devices, node_devices, positions_m, technology, band=None, channels=0, duty_cycles=1.0, serving=None, tx_ant_height=DEFAULT_TX_ANTENNA_HEIGHT_M, rx_ant_height=DEFAULT_RX_ANTENNA_HEIGHT_M):
+    devices = _as_device_registry(devices)
+    unknown = sorted({name for name in node_devices if name not in devices}, key=str)
+    if unknown:
+        raise ValueError('Unknown devices: {}'.format(', '.join(map(str, unknown[:20]))))
+    rows = np.array([devices.index[name] for name in node_devices], dtype=np.intp)
+    num_nodes = len(rows)
+
+    positions_m = np.asarray(positions_m, dtype=float)
+    if positions_m.ndim != 2 or positions_m.shape[0] != num_nodes or positions_m.shape[1] not in (2, 3):
+        raise ValueError('positions_m must be an (N, 2) or (N, 3) array for {} nodes'.format(num_nodes))
+    if not np.isfinite(positions_m).all():
+        raise ValueError('positions_m must be finite numbers')
+
+    band = next(iter(TECHNOLOGY_BANDS[technology])) if band is None else band
+    channels_MHz = TECHNOLOGY_BANDS[technology][band]
+    channels = np.broadcast_to(np.asarray(channels, dtype=np.intp), (num_nodes,))
+    if num_nodes and (channels.min() < 0 or channels.max() >= len(channels_MHz)):
+        raise ValueError('channels must be indices into the {} channels of the {} band'.format(len(channels_MHz), band))
+    duty_cycles = np.broadcast_to(np.asarray(duty_cycles, dtype=float), (num_nodes,))
+    if num_nodes and not (np.isfinite(duty_cycles).all() and duty_cycles.min() >= 0 and duty_cycles.max() <= 1):
+        raise ValueError('duty_cycles must be finite numbers within [0, 1]')
+    serving = np.full(num_nodes, -1, dtype=np.intp) if serving is None else np.broadcast_to(np.asarray(serving, dtype=np.intp), (num_nodes,))
+    if num_nodes and (serving.min() < -1 or serving.max() >= num_nodes):
+        raise ValueError('serving must be node indices, or -1 for the strongest co-channel node')
+
+    return {
+                'position': positions_m,
+                'eirp_dBm': devices.tx_power_dBm[rows] + devices.ant_efficiency_dB[rows],
+                'rx_ant_efficiency_dB': devices.ant_efficiency_dB[rows],
+                'channel': channels,
+                'frequency_MHz': channels_MHz[channels],
+                'duty_cycle': duty_cycles,
+                'serving': serving,
+                'tx_ant_height': np.broadcast_to(np.asarray(tx_ant_height, dtype=float), (num_nodes,)),
+                'rx_ant_height': np.broadcast_to(np.asarray(rx_ant_height, dtype=float), (num_nodes,)),
+            }
+
+
+# Path loss rows [start, stop) of the N x N matrix, receivers x transmitters, as float32.
+# Node pairs closer than the 1 m reference distance (and each node to itself) use the 1 m
+# path loss. Coordinate differences are taken in float64 before narrowing.
+def pairwise_path_loss(nodes, technology, model, start=0, stop=None):
+    receivers = slice(start, stop)
+    position = nodes['position']
+    squared_distance = np.zeros((len(position[receivers]), len(position)), dtype=np.float32)
+    delta = np.empty_like(squared_distance)
+    for axis in range(position.shape[1]):
+        np.subtract(position[receivers, axis, None], position[None, :, axis], out=delta, casting='same_kind')
+        np.square(delta, out=delta)
+        squared_distance += delta
+    path_loss = np.maximum(squared_distance, DISTANCE_SWEEP_MIN_M**2, out=squared_distance)
+    np.log10(path_loss, out=path_loss)
+
+    intercept, slope = propagation_coefficients(nodes['frequency_MHz'][receivers, None], nodes['tx_ant_height'][None, :], nodes['rx_ant_height'][receivers, None], technology, (model,))[model]
+    path_loss *= np.asarray(0.5*slope, dtype=np.float32)
+    path_loss += np.asarray(intercept, dtype=np.float32)
+    return path_loss
+
+
+def _sinr_chunk(task):
+    nodes, technology, model, start, stop = task
+    rx_power_dBm = pairwise_path_loss(nodes, technology, model, start, stop)
+    np.subtract(nodes['eirp_dBm'].astype(np.float32)[None, :], rx_power_dBm, out=rx_power_dBm)
+    rx_power_dBm += nodes['rx_ant_efficiency_dB'][start:stop, None].astype(np.float32)
+
+    rows = np.arange(stop - start)
+    co_channel = nodes['channel'][None, :] == nodes['channel'][start:stop, None]
+    co_channel[rows, rows + start] = False
+
+    serving = nodes['serving'][start:stop]
+    best_server = np.where(co_channel, rx_power_dBm, -np.inf).argmax(axis=1)
+    serving = np.where(serving < 0, np.where(co_channel.any(axis=1), best_server, -1), serving)
+    has_server = serving >= 0
+    signal_dBm = np.where(has_server, rx_power_dBm[rows, np.maximum(serving, 0)], -np.inf)
+
+    co_channel[rows[has_server], serving[has_server]] = False
+    rx_power_dBm *= np.float32(np.log(10)/10)
+    rx_power_mW = np.exp(rx_power_dBm, out=rx_power_dBm)
+    rx_power_mW *= co_channel
+    interference_mW = rx_power_mW @ nodes['duty_cycle'].astype(np.float32)
+
+    return serving, signal_dBm, interference_mW.astype(float)
+
+
+def interference_sinr(nodes, technology, model=None, bandwidth_Hz=None, noise_figure_dB=DEFAULT_NOISE_FIGURE_DB, chunk_elements=SINR_CHUNK_ELEMENTS, processes=MONTE_CARLO_PROCESSES):
+    models = TECHNOLOGY_MODELS[technology]
+    model = (SINR_DEFAULT_MODEL if SINR_DEFAULT_MODEL in models else models[0]) if model is None else model
+    if model not in PROPAGATION_MODEL_REGISTRY:
+        raise ValueError('Unknown propagation model: {}'.format(model))
+    num_nodes = len(nodes['position'])
+    noise_dBm = thermal_noise_dBm(TECHNOLOGY_BANDWIDTH_HZ[technology] if bandwidth_Hz is None else bandwidth_Hz, noise_figure_dB)
+
+    chunk_rows = max(1, chunk_elements // max(num_nodes, 1))
+    tasks = [(nodes, technology, model, start, min(start + chunk_rows, num_nodes)) for start in range(0, num_nodes, chunk_rows)]
+    if processes > 1 and num_nodes >= SINR_PARALLEL_NODES and len(tasks) > 1:
+        chunks = list(simulation_executor().map(_sinr_chunk, tasks))
+    else:
+        chunks = list(map(_sinr_chunk, tasks))
+
+    serving = np.concatenate([chunk[0] for chunk in chunks]) if chunks else np.zeros(0, dtype=np.intp)
+    signal_dBm = np.concatenate([chunk[1] for chunk in chunks]) if chunks else np.zeros(0)
+    interference_mW = np.concatenate([chunk[2] for chunk in chunks]) if chunks else np.zeros(0)
+
+    with np.errstate(divide='ignore'):
+        interference_dBm = 10*np.log10(interference_mW)
+    sinr_dB = signal_dBm - 10*np.log10(interference_mW + 10**(noise_dBm/10))
+    sinr_dB[serving < 0] = np.nan
+
+    return {
+                'model': model,
+                'serving': serving,
+                'signal_dBm': signal_dBm,
+                'interference_dBm': interference_dBm,
+                'noise_dBm': float(noise_dBm),
+                'sinr_dB': sinr_dB,
+            }
+#-----------------------------------------------------------------------------
+
+
+# Lightweight figure builder
+# Emits scattergl traces straight from the computed arrays as plain figure dicts, reusing a
+# prebuilt layout, instead of melting a DataFrame through plotly express on every request.
+# Curves longer than max_points are decimated to evenly spaced samples (endpoints kept),
+# coverage heatmaps are strided the same way along both axes.
+#-----------------------------------------------------------------------------
+FIGURE_MAX_POINTS = int(os.environ.get('VERKPLOT_FIGURE_MAX_POINTS', '2000'))
+COVERAGE_FIGURE_MAX_CELLS = int(os.environ.get('VERKPLOT_COVERAGE_FIGURE_MAX_CELLS', '250'))
+
+# plotly.js default colors, pinned so a trace drawn in two parts keeps one color
+LINE_FIGURE_COLORWAY = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf']
+LINE_FIGURE_LAYOUT = {
+                            'colorway': LINE_FIGURE_COLORWAY,
+                            'xaxis': {'title': {'text': 'Distance (m)'}},
+                            'legend': {'title': {'text': 'variable'}, 'tracegroupgap': 0},
+                            'margin': {'t': 60},
+                            'hovermode': 'closest',
+                    }
+
+
+def decimate_indices(num_points, max_points=FIGURE_MAX_POINTS):
+    if not max_points or num_points <= max_points:
+        return slice(None)
+    return np.unique(np.linspace(0, num_points - 1, max_points).round().astype(int))
+
+
+# traces - (name, values) or (name, values, valid), valid None when every point is valid
+# and False when none is. Points where valid is False are drawn as a dotted
+# '(outside validity range)' continuation in the trace's color, added after all traces so
+# the automatic colors of the traces stay the same. A trace with no valid point keeps an
+# empty solid trace for its legend entry and color.
+def build_line_figure(distance_list, traces, title, yaxis_title, distance_target=None, max_points=FIGURE_MAX_POINTS, log_x=False):
+    distance_list = np.asarray(distance_list)
+    keep = decimate_indices(len(distance_list), max_points)
+    x = distance_list[keep]
+
+    data = []
+    outside = []
+    for index, trace in enumerate(traces):
+        name = trace[0]
+        y = np.asarray(trace[1])[keep]
+        line_x = x
+        valid = trace[2] if len(trace) > 2 else None
+        if valid is not None:
+            if valid is False:
+                outside_y = y
+                line_x = y = x[:0]
+            else:
+                valid = np.asarray(valid)[keep]
+                # Neighbouring valid points join the dotted part to the solid one
+                invalid = ~valid
+                shown = invalid.copy()
+                shown[1:] |= invalid[:-1]
+                shown[:-1] |= invalid[1:]
+                outside_y = y.copy()
+                outside_y[~shown] = np.nan
+                y = y.copy()
+                y[invalid] = np.nan
+            color = LINE_FIGURE_COLORWAY[index % len(LINE_FIGURE_COLORWAY)]
+            outside.append({'type': 'scattergl', 'mode': 'lines', 'name': name + ' (outside validity range)', 'legendgroup': name, 'x': x, 'y': outside_y, 'line': {'color': color, 'dash': 'dot'}})
+        data.append({'type': 'scattergl', 'mode': 'lines', 'name': name, 'legendgroup': name, 'x': line_x, 'y': y})
+
+    layout = dict(LINE_FIGURE_LAYOUT)
+    layout['title'] = {'text': title}
+    layout['yaxis'] = {'title': {'text': yaxis_title}}
+    if log_x:
+        layout['xaxis'] = {'title': {'text': 'Distance (m)'}, 'type': 'log'}
+
+    if distance_target is not None:
+        layout['shapes'] = [{'type': 'line', 'xref': 'x', 'yref': 'y domain', 'x0': distance_target, 'x1': distance_target, 'y0': 0, 'y1': 1, 'line': {'dash': 'dash'}}]
+        layout['annotations'] = [{'x': distance_target, 'xref': 'x', 'xanchor': 'left', 'y': 0, 'yref': 'y domain', 'yanchor': 'bottom', 'showarrow': False, 'text': "Target Distance = {:g} m".format(distance_target), 'font': {'size': 15}}]
+
+    return {
+                'data': data + outside,
+                'layout': layout,
+            }
+
+
+def build_matrix_figure(values, names, title, colorbar_title):
+    return {
+                'data': [{
+                            'type': 'heatmap',
+                            'z': values,
+                            'x': names,
+                            'y': names,
+                            'colorscale': 'RdYlGn',
+                            'texttemplate': '%{z:.0f}',
+                            'colorbar': {'title': {'text': colorbar_title}},
+                        }],
+                'layout': {
+                            'title': {'text': title},
+                            'xaxis': {'title': {'text': 'Receive Device'}, 'constrain': 'domain'},
+                            'yaxis': {'title': {'text': 'Transmit Device'}, 'autorange': 'reversed', 'scaleanchor': 'x', 'constrain': 'domain'},
+                            'margin': {'t': 60},
+                        },
+            }
+
+
+# Empty figure that only shows a message, for views that cannot be drawn
+def build_message_figure(title, message):
+    return {
+                'data': [],
+                'layout': {
+                            'title': {'text': title},
+                            'xaxis': {'visible': False},
+                            'yaxis': {'visible': False},
+                            'annotations': [{'x': 0.5, 'xref': 'paper', 'y': 0.5, 'yref': 'paper', 'showarrow': False, 'text': message, 'font': {'size': 15}}],
+                        },
+            }
+
+
+# Heatmap of a floor plan grid, strided down to at most max_cells per axis, with the walls
+# and transmitters drawn on top
+def coverage_figure_indices(floor_plan, max_cells=COVERAGE_FIGURE_MAX_CELLS):
+    rows, columns = floor_plan.shape
+    return decimate_indices(rows, max_cells), decimate_indices(columns, max_cells)
+
+
+# values is the full grid, or the grid already strided with coverage_figure_indices()
+def build_coverage_figure(values, floor_plan, transmitters, title, colorbar_title, max_cells=COVERAGE_FIGURE_MAX_CELLS):
+    x_axis, y_axis = floor_plan.axes()
+    keep_rows, keep_columns = coverage_figure_indices(floor_plan, max_cells)
+    values = np.asarray(values)
+    if values.shape == floor_plan.shape:
+        values = values[keep_rows][:, keep_columns]
+    transmitters = np.asarray(transmitters, dtype=float).reshape(-1, 3)
+
+    return {
+                'data': [
+                            {
+                                'type': 'heatmap',
+                                'z': values,
+                                'x': x_axis[keep_columns],
+                                'y': y_axis[keep_rows],
+                                'colorscale': 'RdYlGn',
+                                'colorbar': {'title': {'text': colorbar_title}},
+                            },
+                            {
+                                'type': 'scatter',
+                                'mode': 'markers',
+                                'name': 'Transmitters',
+                                'x': transmitters[:, 0],
+                                'y': transmitters[:, 1],
+                                'marker': {'symbol': 'star', 'size': 14, 'color': 'black'},
+                            },
+                        ],
+                'layout': {
+                            'title': {'text': title},
+                            'xaxis': {'title': {'text': 'x (m)'}, 'range': [0, floor_plan.width_m], 'constrain': 'domain'},
+                            'yaxis': {'title': {'text': 'y (m)'}, 'range': [0, floor_plan.length_m], 'scaleanchor': 'x', 'constrain': 'domain'},
+                            'shapes': [{'type': 'line', 'x0': x0, 'y0': y0, 'x1': x1, 'y1': y1, 'line': {'color': 'black', 'width': 3}} for x0, y0, x1, y1, _ in floor_plan.walls],
+                            'showlegend': False,
+                            'margin': {'t': 60},
+                        },
+            }
+#-----------------------------------------------------------------------------
+
+
+# Clientside (browser side) link budget mode
+# With VERKPLOT_CLIENTSIDE=1 the server ships the device table and the base path loss
+# curves once per technology selection (dcc.Store) and assets/verkplot_clientside.js
+# recomputes RSSI traces, figures and the specification table in the browser whenever the
+# devices, antenna heights or target distance (link_settings_store) change.
+#-----------------------------------------------------------------------------
+CLIENTSIDE_CALLBACKS = os.environ.get('VERKPLOT_CLIENTSIDE', '').lower() in ('1', 'true', 'yes')
+
+
+def device_store_data(devices):
+    return {
+                'columns': devices.columns,
+                'records': {name: record for name, record in zip(devices.sorted_names, devices.records(devices.sorted_names))},
+            }
+
+
+def path_loss_store_data(technology_sel, distance_max=DEFAULT_DISTANCE_MAX_M, num_points=DEFAULT_DISTANCE_POINTS, sampling='linear', tx_ant_height=DEFAULT_TX_ANTENNA_HEIGHT_M, rx_ant_height=DEFAULT_RX_ANTENNA_HEIGHT_M):
+    distance_max, num_points, sampling, _ = sanitize_distance_sweep(distance_max, num_points, sampling)
+    frequency_MHz = TECHNOLOGY_FREQUENCY_MHZ[technology_sel]
+    # The adaptive sweep depends on the chosen devices, base curves use log sampling instead
+    table_sampling = 'log' if sampling == 'adaptive' else sampling
+    path_loss = path_loss_table(technology_sel, frequency_MHz, tx_ant_height, rx_ant_height, distance_max, num_points, table_sampling)
+    keep = decimate_indices(len(path_loss['distance']))
+    itu_N, itu_Lf = ITU_INDOOR_COEFFICIENTS[technology_sel]
+
+    return {
+                'technology': technology_sel,
+                'label': TECHNOLOGY_LABELS[technology_sel],
+                'models': list(path_loss['models']),
+                'frequency_MHz': frequency_MHz,
+                'itu_coefficients': [itu_N, itu_Lf],
+                'validity': {model: PROPAGATION_MODEL_REGISTRY[model].validity for model in path_loss['models']},
+                'tx_ant_height': tx_ant_height,
+                'rx_ant_height': rx_ant_height,
+                'distance_target': DEFAULT_DISTANCE_TARGET_M,
+                'log_x': table_sampling != 'linear',
+                'distance': path_loss['distance'][keep].tolist(),
+                'uplink': path_loss['uplink'][:, keep].tolist(),
+                'downlink': path_loss['downlink'][:, keep].tolist(),
+            }
+
+
+def update_path_loss_store(technology_sel, distance_max, num_points, sampling):
+    if technology_sel not in TECHNOLOGY_MODELS:
+        raise PreventUpdate
+    return path_loss_store_data(technology_sel, distance_max, num_points, sampling)
+
+
+def clientside_stores(technology_sel, devices):
+    if not CLIENTSIDE_CALLBACKS:
+        return []
+    return [
+                dcc.Store(id='device_store', data=device_store_data(devices)),
+                dcc.Store(id='path_loss_store', data=path_loss_store_data(technology_sel)),
+                dcc.Store(id='link_settings_store', data={'tx_ant_height': DEFAULT_TX_ANTENNA_HEIGHT_M, 'rx_ant_height': DEFAULT_RX_ANTENNA_HEIGHT_M, 'distance_target': DEFAULT_DISTANCE_TARGET_M}),
+        ]
+#-----------------------------------------------------------------------------
+
+
+# Fade margin, fading and distance sweep controls shared by the BLE and Sub GHz layouts
+#-----------------------------------------------------------------------------
+def link_budget_controls():
+    label_style = {'color': 'black', 'font-weight': 'bold', "text-align": "left", 'padding-left':"15px"}
+    input_style = {'width': '100%'}
+
+    return [
+                html.Br(),
+                html.Div([
+                                html.Label(['Fade Margin (in dB)'], style=label_style),
+                                dcc.Input(id='fade_margin_input', type='number', value=0, min=0, max=100, debounce=True, style=input_style),
+                        ]),
+
+                html.Br(),
+                html.Div([
+                                html.Label(['Fading Model'], style=label_style),
+                                dcc.Dropdown(
+                                                    id='fading_model',
+                                                    options=[{'label': 'None (deterministic)', 'value': 'none'}, {'label': 'Rayleigh', 'value': 'rayleigh'}, {'label': 'Rician', 'value': 'rician'}],
+                                                    value='none',
+                                                    clearable=False,
+                                                    searchable=False,
+                                            ),
+                        ]),
+
+                html.Br(),
+                html.Div([
+                                html.Label(['Shadowing Std. Deviation (in dB)'], style=label_style),
+                                dcc.Input(id='shadowing_sigma_input', type='number', value=0, min=0, max=30, debounce=True, style=input_style),
+                        ]),
+
+                html.Br(),
+                html.Div([
+                                html.Label(['Rician K-factor (in dB)'], style=label_style),
+                                dcc.Input(id='rician_k_factor_input', type='number', value=DEFAULT_RICIAN_K_FACTOR_DB, min=-20, max=40, debounce=True, style=input_style),
+                        ]),
+
+                html.Br(),
+                html.Div([
+                                html.Label(['Target Distance (in m)'], style=label_style),
+                                dcc.Input(id='distance_target_input', type='number', value=DEFAULT_DISTANCE_TARGET_M, min=0, max=MAX_DISTANCE_M, debounce=True, style=input_style),
+                        ]),
+
+                html.Br(),
+                html.Div([
+                                html.Label(['Maximum Distance (in m)'], style=label_style),
+                                dcc.Input(id='distance_max_input', type='number', value=DEFAULT_DISTANCE_MAX_M, min=2*DISTANCE_SWEEP_MIN_M, max=MAX_DISTANCE_M, debounce=True, style=input_style),
+                        ]),
+
+                html.Br(),
+                html.Div([
+                                html.Label(['Distance Points'], style=label_style),
+                                dcc.Input(id='distance_points_input', type='number', value=DEFAULT_DISTANCE_POINTS, min=2, max=MAX_DISTANCE_POINTS, step=1, debounce=True, style=input_style),
+                        ]),
+
+                html.Br(),
+                html.Div([
+                                html.Label(['Distance Sampling'], style=label_style),
+                                dcc.Dropdown(
+                                                    id='distance_sampling',
+                                                    options=[{'label': 'Linear', 'value': 'linear'}, {'label': 'Logarithmic', 'value': 'log'}, {'label': 'Adaptive (refined at sensitivity)', 'value': 'adaptive'}],
+                                                    value='linear',
+                                                    clearable=False,
+                                                    searchable=False,
+                                            ),
+                        ]),
+        ]
+#-----------------------------------------------------------------------------
+
+
+# Dash Layout Definition
+#-----------------------------------------------------------------------------
+app.layout = html.Div([
+    dbc.Card(
+        dbc.CardBody([
+            dbc.Row([
+                dbc.Col([
+                    html.Div([
+                                    html.Img(
+                                                    # src=app.get_asset_url('Verkada-Logo-Vert-Black.png'),
+                                                    src=app.get_asset_url('verkada-icon-black.png'),
+                                                    # className = 'two columns',
+                                                    style = {'height':'8%', 'width': '8%', 'paddingLeft': '15px'}
+                                            )
+                            ]),
+                        ], width=3),
+                        
+                dbc.Col([
+                    html.Div([]),
+                        ], width=6),
+                
+                dbc.Col([
+                    html.Div([
+                                    html.H1(
+                                                    ['VerkPlot'],
+                                                    style={'font-weight': 'bold', 'fontFamily': 'calibri', "textAlign":"right", 'padding-right':"15px", 'color':'#030E16'}
+                                            )
+                            ]),
+                        ], width=3),
+                    ], 
+                    # align='center',
+                    # className="h-25"
+                    ), 
+
+
+            dbc.Row([
+                dbc.Col([
+                    html.Div([
+                                    dcc.Tabs(
+                                                    id="tabs_inline",
+                                                    value = 'tab-1',
                                                     children = [
                                                                 dcc.Tab(label = 'LINK BUDGET', value = 'tab-1', style = tab_style, selected_style = selected_tab_style),
+                                                                dcc.Tab(label = 'COVERAGE', value = 'tab-4', style = tab_style, selected_style = selected_tab_style),
+                                                                dcc.Tab(label = 'COMPATIBILITY MATRIX', value = 'tab-3', style = tab_style, selected_style = selected_tab_style),
                                                                 dcc.Tab(label = 'REQUESTS / FEEDBACK', value = 'tab-2', style = tab_style, selected_style = selected_tab_style)
                                                                 ],
                                                     style = tab_alignment
                                             ),
-                            ]),    
-                        ])
+                            ]),    
+                        ])
+                    ]),
+
+
+            html.Div(id='tabs_content'),
+
+
+            html.Div([    
+                            html.Label(
+                                                ['Dashboard created by Verkada Access Control Hardware Team'],
+                                                className = 'six columns', style={'color': 'black', 'fontSize': '15px', 'fontWeight': 'bold', 'fontFamily': 'helvetica', "textAlign":"left", 'opacity': '0.5'}
+                                        ),
+
+                            html.Label(
+                                                ['Dash-Plotly code version v1.0'],
+                                                className = 'six columns', style={'color': 'black', 'fontSize': '15px', 'fontStyle': 'italic', 'fontFamily': 'helvetica', "textAlign":"right", 'opacity': '0.5'}
+                                        )
+                    ],
+                    style={'position': 'fixed', 'bottom': 0, 'width': '99%'}
+                    ),
+                    ], 
+                    # style={'backgroundColor':'#FFFFF0'}
+                    )       
+            )],
+            style={'backgroundColor':'#FFFFF0'}
+            )
+
+
+
+
+# Tab and link budget layouts
+# Component trees are built once per tab / technology and device registry (i.e. spec
+# version) and the same tree is returned on every tab switch or technology change. A spec
+# reload swaps the registry, which misses the cache, and the derived cache invalidation
+# drops the trees built for the old one.
+#--------------------------------------------------------------------------------------------------------------------------
+@functools.lru_cache(maxsize=32)
+def tab_layout(tab, devices):
+    if tab == 'tab-1':
+        return html.Div([
+                    dbc.Row([
+                        dbc.Col(
+                                    [],
+                                    width = 1
+                                ),
+
+                        dbc.Col(
+                            html.Div([
+                                            html.Br(),
+                                            html.Label(
+                                                            ['Wireless Technology'],
+                                                            style={'color': 'black', 'font-weight': 'bold', "text-align": "center"}
+                                                        ),
+                                
+                                            dcc.Dropdown(
+                                                                id='tech_filter',
+                                                                options=TECHNOLOGY_OPTIONS,
+                                                                value='NA',
+                                                                multi=False,
+                                                                disabled=False,
+                                                                clearable=False,
+                                                                searchable=True,
+                                                                placeholder='Choose Technology...',
+                                                                style={'width':"100%"},
+                                                                persistence='string',
+                                                                persistence_type='session'
+                                                        ),
+                                    ],
+                                    # className = "six columns",
+                                    style={'marginLeft':'90px', 'marginRight':'90px', 'text-align':'center'}
+                                    ),
+                                    width = 10
+                                ),
+
+                        dbc.Col(
+                                    [],
+                                    width = 1
+                                ),
+                                    
+                        # html.Hr(),
+                        html.Div(id='output_div'),
+                        ])
+
+                    ])
+    
+
+    elif tab == 'tab-2':
+        return html.Div([
+                        html.Br(),
+                        html.Br(),
+                        html.Br(),
+                        html.Br(),
+                        html.Br(),
+                        html.Br(),
+
+                        dcc.Markdown(['''
+                                    ###### **_VerkPlot_** is built to visualize communication link margins for various wireless technologies and devices in a simple and straightforward way. Therefore, any feedback to make this tool better is always welcome.
+
+                                    ###### If you come across any bugs with the tool or have any feature requests, please email - [vinay.hegde@verkada.com](https://outlook.office365.com/mail/) or send a message on [Slack](https://app.slack.com/client/T28NQT9F1/D04KKCF3KJ7?cdn_fallback=1).
+                                    '''], 
+                                    style={'color': 'black', 'font-weight': 'normal', "text-align": "center"}),
+
+                        html.Br(),
+                        html.Br(),
+                        html.Br(),
+                        html.Br(),
+
+                        dcc.Markdown(['''
+                                    ###### **Notes from the developer**
+
+                                    ###### **_VerkPlot_** is only a data visualization tool and requires that the input file be in a certain format.
+
+                                    ###### You can find all the device specification files in the below link. I will ensure that the latest version of the files are available for your use.
+                                      
+                                    ###### The following path loss models are used in the tool.
+                                    '''], style={'color': 'black', 'font-weight': 'normal', "text-align": "center"}),
+
+                        html.Br(),          
+                        ], 
+                        # className = "twelve columns",
+                        style={'marginLeft':'90px', 'marginRight':'90px', 'text-align':'center'}
+                        )
+
+
+    elif tab == 'tab-3':
+        return html.Div([
+                    dbc.Row([
+                        dbc.Col(
+                                    [],
+                                    width = 1
+                                ),
+
+                        dbc.Col(
+                            html.Div([
+                                            html.Br(),
+                                            html.Label(
+                                                            ['Wireless Technology'],
+                                                            style={'color': 'black', 'font-weight': 'bold', "text-align": "center"}
+                                                        ),
+
+                                            dcc.Dropdown(
+                                                                id='matrix_tech_filter',
+                                                                options=TECHNOLOGY_OPTIONS,
+                                                                value='BLE',
+                                                                multi=False,
+                                                                clearable=False,
+                                                                placeholder='Choose Technology...',
+                                                                style={'width':"100%"},
+                                                        ),
+
+                                            html.Br(),
+                                            html.Label(
+                                                            ['Propagation Model'],
+                                                            style={'color': 'black', 'font-weight': 'bold', "text-align": "center"}
+                                                        ),
+
+                                            dcc.Dropdown(
+                                                                id='matrix_model_filter',
+                                                                value='FSPL',
+                                                                multi=False,
+                                                                clearable=False,
+                                                                placeholder='Choose Propagation Model...',
+                                                                style={'width':"100%"},
+                                                        ),
+                                    ],
+                                    style={'marginLeft':'90px', 'marginRight':'90px', 'text-align':'center'}
+                                    ),
+                                    width = 10
+                                ),
+
+                        dbc.Col(
+                                    [],
+                                    width = 1
+                                ),
+                        ]),
+
+                    html.Br(),
+                    dcc.Graph(id='compatibility_matrix_graph', style={'height': '75vh'}),
+
+                    html.Hr(),
+                    dbc.Row([
+                        dbc.Col(
+                                    [],
+                                    width = 1
+                                ),
+
+                        dbc.Col([
+                                    html.Label(['Background Job (all device pairs, technology above)'], style={'color': 'black', 'font-weight': 'bold'}),
+                                    dbc.Row([
+                                        dbc.Col(dcc.Dropdown(
+                                                                id='job_kind',
+                                                                options=[{'label': label, 'value': kind} for kind, label in JOB_KINDS.items()],
+                                                                value='pair_sweep',
+                                                                clearable=False,
+                                                                searchable=False,
+                                                        ), width=4),
+                                        dbc.Col(dcc.Input(id='job_distance_max_input', type='number', value=10000, min=2, max=MAX_DISTANCE_M, debounce=True, placeholder='Maximum Distance (m)', style={'width': '100%'}), width=2),
+                                        dbc.Col(dcc.Input(id='job_distance_points_input', type='number', value=MAX_DISTANCE_POINTS, min=2, max=MAX_DISTANCE_POINTS, step=1, debounce=True, placeholder='Distance Points', style={'width': '100%'}), width=2),
+                                        dbc.Col(dbc.Button('Start', id='job_start_button', n_clicks=0, color='dark'), width=2),
+                                        dbc.Col(dbc.Button('Cancel', id='job_cancel_button', n_clicks=0, color='secondary', outline=True), width=2),
+                                    ], align='center'),
+
+                                    html.Br(),
+                                    dbc.Progress(id='job_progress', value=0, label='', striped=True),
+                                    html.Div(id='job_status', style={'text-align': 'left', 'padding-top': '10px'}),
+                                    dcc.Store(id='job_store', storage_type='session'),
+                                    dcc.Interval(id='job_interval', interval=JOB_POLL_INTERVAL_MS, disabled=True),
+                                ],
+                                width = 10
+                                ),
+
+                        dbc.Col(
+                                    [],
+                                    width = 1
+                                ),
+                        ]),
+                    html.Br(),
+                    ])
+
+    elif tab == 'tab-4':
+        label_style = {'color': 'black', 'font-weight': 'bold', "text-align": "left", 'padding-left':"15px"}
+        input_style = {'width': '100%'}
+
+        return html.Div([
+                    html.Br(),
+                    dbc.Row([
+                        dbc.Col([
+                                html.Div([
+                                                html.Label(['Wireless Technology'], style=label_style),
+                                                dcc.Dropdown(
+                                                                    id='coverage_tech_filter',
+                                                                    options=TECHNOLOGY_OPTIONS,
+                                                                    value='BLE',
+                                                                    clearable=False,
+                                                            ),
+
+                                                html.Br(),
+                                                html.Label(['Propagation Model'], style=label_style),
+                                                dcc.Dropdown(id='coverage_model_filter', value='ITU_Indoor_PL', clearable=False),
+
+                                                html.Br(),
+                                                html.Label(['Transmitter'], style=label_style),
+                                                dcc.Dropdown(id='coverage_tx_dropdown', options=device_search_options(devices), value=devices.sorted_names[0] if len(devices) else None, clearable=False),
+
+                                                html.Br(),
+                                                html.Label(['Receiver'], style=label_style),
+                                                dcc.Dropdown(id='coverage_rx_dropdown', options=device_search_options(devices), value=devices.sorted_names[0] if len(devices) else None, clearable=False),
+
+                                                html.Br(),
+                                                html.Label(['Heatmap'], style=label_style),
+                                                dcc.Dropdown(
+                                                                    id='coverage_metric',
+                                                                    options=[{'label': 'Link Margin (dB)', 'value': 'margin'}, {'label': 'RSSI (dBm)', 'value': 'rssi'}],
+                                                                    value='margin',
+                                                                    clearable=False,
+                                                                    searchable=False,
+                                                            ),
+
+                                                html.Br(),
+                                                html.Label(['Floor Width x Length (in m)'], style=label_style),
+                                                dbc.Row([
+                                                    dbc.Col(dcc.Input(id='floor_width_input', type='number', value=DEFAULT_FLOOR_WIDTH_M, min=1, debounce=True, style=input_style)),
+                                                    dbc.Col(dcc.Input(id='floor_length_input', type='number', value=DEFAULT_FLOOR_LENGTH_M, min=1, debounce=True, style=input_style)),
+                                                ]),
+
+                                                html.Br(),
+                                                html.Label(['Cell Size (in m)'], style=label_style),
+                                                dcc.Input(id='cell_size_input', type='number', value=DEFAULT_CELL_SIZE_M, min=0.01, debounce=True, style=input_style),
+
+                                                html.Br(),
+                                                html.Br(),
+                                                html.Label(['Transmitter Positions (x, y; ...)'], style=label_style),
+                                                dcc.Input(id='coverage_transmitters_input', type='text', value=DEFAULT_FLOOR_TRANSMITTERS, debounce=True, style=input_style),
+
+                                                html.Br(),
+                                                html.Br(),
+                                                html.Label(['Walls (x0, y0, x1, y1, loss dB; ...)'], style=label_style),
+                                                dcc.Textarea(id='coverage_walls_input', value=DEFAULT_FLOOR_WALLS, style=input_style),
+                                        ]),
+                                ],
+                                width=3),
+
+                        dbc.Col([
+                                        dcc.Graph(id='coverage_graph', style={'height': '70vh'}),
+                                        html.Div(id='coverage_summary_table'),
+                        ], width=8),
+
+                        dbc.Col([
+                        ], width=1),
+                    ]),
+                    ])
+#--------------------------------------------------------------------------------------------------------------------------
+
+
+
+# Antenna height selection
+# Rendered for every technology so the link budget callbacks always find their inputs, but
+# only shown when an enabled model of the technology depends on the installation heights
+# (Okumura-Hata for Sub GHz by default).
+#--------------------------------------------------------------------------------------------------------------------------
+def antenna_height_controls(technology_sel):
+    height_options = [{'label': '{:g}'.format(height), 'value': float(height)} for height in ANTENNA_HEIGHT_GRID_M]
+
+    return [
+                html.Div([
+                                html.Br(),
+                                html.Div([
+                                                html.Label(
+                                                                ['Transmit Antenna Height (in m)'], 
+                                                                style={'color': 'black', 'font-weight': 'bold', "text-align": "left", 'padding-left':"15px"}
+                                                            ),
+
+                                                dcc.Dropdown(
+                                                                    id = 'transmitter_antenna_height',
+                                                                    options = height_options,
+                                                                    value = float(DEFAULT_TX_ANTENNA_HEIGHT_M),
+                                                                    optionHeight = 25,
+                                                                    disabled = False,
+                                                                    multi = False,
+                                                                    searchable = True,
+                                                                    placeholder = 'Please select the transmit antenna height',
+                                                                    clearable = False,
+                                                            )
+                                        ],
+                                        ),
+
+                                html.Br(),
+                                html.Div([
+                                                html.Label(
+                                                                ['Receive Antenna Height (in m)'], 
+                                                                style={'color': 'black', 'font-weight': 'bold', "text-align": "left", 'padding-left':"15px"}
+                                                            ),
+
+                                                dcc.Dropdown(
+                                                                    id = 'receiver_antenna_height',
+                                                                    options = height_options,
+                                                                    value = float(DEFAULT_RX_ANTENNA_HEIGHT_M),
+                                                                    optionHeight = 25,
+                                                                    disabled = False,
+                                                                    multi = False,
+                                                                    searchable = True,
+                                                                    placeholder = 'Please select the receive antenna height',
+                                                                    clearable = False,
+                                                            )
+                                        ],
+                                        ),
+                        ],
+                        style={} if technology_height_dependent(technology_sel) else {'display': 'none'}
+                        ),
+        ]
+#--------------------------------------------------------------------------------------------------------------------------
+
+
+# Band of the channel sweep graph
+#--------------------------------------------------------------------------------------------------------------------------
+def channel_band_controls(technology_sel):
+    options = band_options(technology_sel)
+
+    return [
+                html.Br(),
+                html.Div([
+                                html.Label(['Channel Sweep Band'], style={'color': 'black', 'font-weight': 'bold', "text-align": "left", 'padding-left':"15px"}),
+                                dcc.Dropdown(
+                                                    id='channel_band',
+                                                    options=options,
+                                                    value=options[0]['value'],
+                                                    clearable=False,
+                                                    searchable=False,
+                                            ),
+                        ]),
+        ]
+#--------------------------------------------------------------------------------------------------------------------------
+
+
+#--------------------------------------------------------------------------------------------------------------------------
+@functools.lru_cache(maxsize=32)
+def link_budget_layout(technology_sel, devices):
+    return html.Div(clientside_stores(technology_sel, devices) + [
+                    dbc.Row([
+                        dbc.Col([
+                            html.Div([
+                                            html.Br(),
+                                            html.Br(),
+                                            # html.Br(),
+                                            html.Div([
+                                                            html.Label(
+                                                                            ['Transmit Device'], 
+                                                                            style={'color': 'black', 'font-weight': 'bold', "text-align": "left", 'padding-left':"15px"}
+                                                                        ),
+
+                                                            dcc.Dropdown(
+                                                                                # df.Device.unique(),
+                                                                                id = 'transmitter_dropdown',
+                                                                                options=device_search_options(devices),
+                                                                                value='NA',
+                                                                                optionHeight = 25,
+                                                                                #maxHeight = 300,
+                                                                                disabled = False,
+                                                                                multi = False,
+                                                                                searchable = True,
+                                                                                # search_value = '',
+                                                                                placeholder = 'Please select your transmitter',
+                                                                                clearable = True,
+                                                                                # style={'width':"55%", 'padding-left':"15px"},
+                                                                                #className = 'select_box',
+                                                                                #persistence = 'True',
+                                                                                #persistence_type = 'memory'
+                                                                        )
+                                                    ],
+                                                    # className = "six columns"
+                                                    ),
+
+                                            html.Br(),
+                                            html.Div([
+                                                            html.Label(
+                                                                            ['Receive Device'], 
+                                                                            style={'color': 'black', 'font-weight': 'bold', "text-align": "left", 'padding-left':"15px"}
+                                                                        ),
+                            
+                                                            dcc.Dropdown(
+                                                                                # df.Device.unique(),
+                                                                                id = 'receiver_dropdown',
+                                                                                options=device_search_options(devices),
+                                                                                value='NA',
+                                                                                optionHeight = 25,
+                                                                                #maxHeight = 300,
+                                                                                disabled = False,
+                                                                                multi = False,
+                                                                                searchable = True,
+                                                                                # search_value = '',
+                                                                                placeholder = 'Please select your receiver',
+                                                                                clearable = True,
+                                                                                # style={'width':"55%", 'padding-left':"15px"},
+                                                                                # className = 'select_box',
+                                                                                #persistence = 'True',
+                                                                                #persistence_type = 'memory'
+                                                                        )
+                                                    ],
+                                                    # className = "six columns"
+                                                    ),
+                                    ] + antenna_height_controls(technology_sel) + channel_band_controls(technology_sel) + link_budget_controls(), 
+                                    style={'marginLeft':'50px', 'marginRight':'100px', 'padding-left':"100px"}
+                                    )
+                                ], 
+                                width={'size': 3,  "offset": 0}
+                                ),
+
+                        dbc.Col([
+                                            html.Br(),
+                                            html.Br(),
+                                            html.Br(),
+                                            html.Br(),
+                                            html.Br(),
+                                            html.Label(
+                                                            ['Device Specifications'], 
+                                                            style={'color': 'black', 'font-weight': 'bold', "text-align": "center"}
+                                                        ),
+                                            html.Hr(),
+                                            html.Div(id='specification_table'),
+                                            html.Br(),
+                                            html.Label(
+                                                            ['Maximum Range'], 
+                                                            style={'color': 'black', 'font-weight': 'bold', "text-align": "center"}
+                                                        ),
+                                            html.Hr(),
+                                            html.Div(id='range_summary_table'),
+                                            
+                                ], 
+                                width=4),
+
+                        dbc.Col([
+                                        html.Br(),
+                                        dcc.Graph(id='path_loss_graph'),
+                                ], 
+                                width=4),
+
+                        dbc.Col([
+                                        html.Br(),
+                                ], 
+                                width=1),
                     ]),
 
 
-            html.Div(id='tabs_content'),
+                    html.Br(),
+
+
+                    dbc.Row([
+                        dbc.Col([
+                                        # drawFigure()
+                                ], 
+                                width=3),
+
+                        dbc.Col([
+                                        dcc.Graph(id='uplink_graph'),
+                        ], width=4,
+                        # style = {
+                        #         'border-right': '2px solid black',
+                        #         'border-left': '2px solid black',
+                        #         'border-top': '2px solid black',
+                        #         'border-bottom': '2px solid grey',
+                        #         # 'border-radius': '20px',
+                        #         # 'border rounded': '5px solid black',
+                        #         # 'margin': 'auto'
+                        #         }
+                                ),
+
+                        dbc.Col([
+                                        dcc.Graph(id='downlink_graph'), 
+                        ], width=4,
+                        # style = {
+                        #         'border-right': '2px solid black',
+                        #         'border-left': '2px solid black',
+                        #         'border-top': '2px solid black',
+                        #         'border-bottom': '2px solid grey',
+                        #         # 'border-radius': '20px',
+                        #         # 'border rounded': '5px solid black',
+                        #         # 'margin': 'auto'
+                        #         }
+                                ),
+
+                        dbc.Col([
+                                        # drawFigure() 
+                        ], width=1),
+                    ], 
+                    align='center'), 
+                    html.Br(),
+
+                    dbc.Row([
+                        dbc.Col([
+                                ], 
+                                width=3),
+
+                        dbc.Col([
+                                        dcc.Graph(id='outage_graph'),
+                        ], width=8),
+
+                        dbc.Col([
+                        ], width=1),
+                    ], 
+                    align='center'), 
+                    html.Br(),
+
+                    dbc.Row([
+                        dbc.Col([
+                                ], 
+                                width=3),
+
+                        dbc.Col([
+                                        dcc.Graph(id='channel_sweep_graph'),
+                        ], width=8),
+
+                        dbc.Col([
+                        ], width=1),
+                    ], 
+                    align='center'), 
+                    html.Br(),
+                    ])
+
+
+DERIVED_CACHE_INVALIDATORS.append(tab_layout.cache_clear)
+DERIVED_CACHE_INVALIDATORS.append(link_budget_layout.cache_clear)
+#--------------------------------------------------------------------------------------------------------------------------
+
+
+
+#--------------------------------------------------------------------------------------------------------------------------
+@app.callback(Output('tabs_content', 'children'),
+              Input('tabs_inline', 'value'))
+
+
+@timed_stage('render_content')
+def render_content(tab):
+    return tab_layout(tab, device_registry)
+#--------------------------------------------------------------------------------------------------------------------------
+
+
+
+#--------------------------------------------------------------------------------------------------------------------------
+@app.callback(Output('output_div', 'children'),
+            Input('tech_filter', 'value'))
+
+
+@timed_stage('render_layout')
+def render_layout(filtering):
+    if filtering in TECHNOLOGY_MODELS:
+        return link_budget_layout(filtering, device_registry)
+#--------------------------------------------------------------------------------------------------------------------------
+
+
+
+# Server-side device search for every device picker
+#--------------------------------------------------------------------------------------------------------------------------
+def device_search_callback(dropdown_id):
+    @app.callback(Output(dropdown_id, 'options'),
+                  Input(dropdown_id, 'search_value'),
+                  State(dropdown_id, 'value'),
+                  prevent_initial_call=True)
+
+
+    @timed_stage('device_search')
+    def update_device_options(search_value, value):
+            if search_value is None:
+                raise PreventUpdate
+            return device_search_options(device_registry, search_value, value)
+
+    return update_device_options
+
+
+for dropdown_id in ('transmitter_dropdown', 'receiver_dropdown', 'coverage_tx_dropdown', 'coverage_rx_dropdown'):
+    device_search_callback(dropdown_id)
+#--------------------------------------------------------------------------------------------------------------------------
+
+
+
+# Link budget figure generation
+# Computes path loss, uplink and downlink RSSI for one device pair and returns the three
+# figures as plain dicts so they can be cached and shipped to Dash without re-serializing
+#--------------------------------------------------------------------------------------------------------------------------
+def link_budget_figures(tx_device_parameters, rx_device_parameters, technology_sel, distance_target=DEFAULT_DISTANCE_TARGET_M, distance_max=DEFAULT_DISTANCE_MAX_M, num_points=DEFAULT_DISTANCE_POINTS, sampling='linear', tx_ant_height=DEFAULT_TX_ANTENNA_HEIGHT_M, rx_ant_height=DEFAULT_RX_ANTENNA_HEIGHT_M):
+    models = TECHNOLOGY_MODELS[technology_sel]
+    frequency_MHz = TECHNOLOGY_FREQUENCY_MHZ[technology_sel]
+
+    with timed_stage('path_loss'):
+        if sampling == 'adaptive':
+            # Device specific sweep - refined around the uplink and downlink sensitivity crossings
+            uplink_budget_dB = tx_device_parameters['tx_power'] + tx_device_parameters['ant_efficiency'] + rx_device_parameters['ant_efficiency'] - rx_device_parameters['rx_sensitivity']
+            downlink_budget_dB = rx_device_parameters['tx_power'] + rx_device_parameters['ant_efficiency'] + tx_device_parameters['ant_efficiency'] - tx_device_parameters['rx_sensitivity']
+            distance_list = adaptive_distance_sweep(distance_max, num_points, technology_sel, frequency_MHz, [(tx_ant_height, rx_ant_height, uplink_budget_dB), (rx_ant_height, tx_ant_height, downlink_budget_dB)])
+            path_loss = link_path_loss(distance_list, technology_sel, frequency_MHz, tx_ant_height, rx_ant_height)
+        else:
+            path_loss = path_loss_table(technology_sel, frequency_MHz, tx_ant_height, rx_ant_height, distance_max, num_points, sampling)
+    distance_list = path_loss['distance']
+
+# Uplink and downlink RSSI - a single offset applied to the shared path loss table
+#--------------------------------------------------------------------------------------------------------------------------
+    with timed_stage('rssi'):
+        rssi_uplink = RSSI_calc(distance_list, tx_device_parameters['tx_power'], tx_device_parameters['ant_efficiency'], rx_device_parameters['ant_efficiency'], path_loss['uplink'])
+        rssi_downlink = RSSI_calc(distance_list, rx_device_parameters['tx_power'], rx_device_parameters['ant_efficiency'], tx_device_parameters['ant_efficiency'], path_loss['downlink'])
+#--------------------------------------------------------------------------------------------------------------------------
+
+# Path loss, uplink and downlink RSSI plots
+#--------------------------------------------------------------------------------------------------------------------------
+    technology_label = TECHNOLOGY_LABELS[technology_sel]
+    log_x = sampling != 'linear'
+    # Validity of each trace from the model's distance interval over the (sorted) sweep, the
+    # masks are only used for a partially valid sweep
+    distance_first, distance_last = distance_list[0], distance_list[-1]
+
+    def trace_validity(masks, ant_heights):
+        validity = []
+        for k, model in enumerate(models):
+            lower, upper = PROPAGATION_MODEL_REGISTRY[model].distance_range(frequency_MHz, *ant_heights)
+            if lower <= distance_first and distance_last <= upper:
+                validity.append(None)
+            elif lower > distance_last or upper < distance_first or lower > upper:
+                validity.append(False)
+            else:
+                validity.append(masks[k])
+        return validity
+
+    uplink_valid = trace_validity(path_loss['uplink_valid'], (tx_ant_height, rx_ant_height))
+    downlink_valid = uplink_valid if path_loss['downlink_valid'] is path_loss['uplink_valid'] else trace_validity(path_loss['downlink_valid'], (rx_ant_height, tx_ant_height))
+    with timed_stage('figure_build'):
+        fig1 = build_line_figure(
+                                    distance_list,
+                                    [(model + '_uplink', path_loss['uplink'][k], uplink_valid[k]) for k, model in enumerate(models)] + [(model + '_downlink', path_loss['downlink'][k], downlink_valid[k]) for k, model in enumerate(models)],
+                                    "Path Loss - {}".format(technology_label),
+                                    'Path Loss (dB)',
+                                    distance_target=distance_target,
+                                    log_x=log_x
+                            )
+        fig2 = build_line_figure(distance_list, [('rssi_' + model + '_uplink', rssi_uplink[k], uplink_valid[k]) for k, model in enumerate(models)], "RSSI uplink - {}".format(technology_label), 'RSSI (dBm)', log_x=log_x)
+        fig3 = build_line_figure(distance_list, [('rssi_' + model + '_downlink', rssi_downlink[k], downlink_valid[k]) for k, model in enumerate(models)], "RSSI downlink - {}".format(technology_label), 'RSSI (dBm)', log_x=log_x)
+
+    return fig1, fig2, fig3
+#--------------------------------------------------------------------------------------------------------------------------
+
+
+
+#--------------------------------------------------------------------------------------------------------------------------
+@timed_stage('update_datatable')
+def update_datatable(tx_dropdown, rx_dropdown, technology_sel, distance_max=DEFAULT_DISTANCE_MAX_M, num_points=DEFAULT_DISTANCE_POINTS, sampling='linear', distance_target=DEFAULT_DISTANCE_TARGET_M, tx_ant_height=DEFAULT_TX_ANTENNA_HEIGHT_M, rx_ant_height=DEFAULT_RX_ANTENNA_HEIGHT_M):
+            devices = device_registry
+            if tx_dropdown in devices and rx_dropdown in devices and technology_sel in TECHNOLOGY_MODELS:
+                distance_max, num_points, sampling, distance_target = sanitize_distance_sweep(distance_max, num_points, sampling, distance_target)
+                tx_ant_height, rx_ant_height = sanitize_antenna_heights(tx_ant_height, rx_ant_height)
+
+                # Figures are memoized per (spec version, devices, technology, distance sweep, antenna heights)
+                cache_key = ('link_budget', devices.version, tx_dropdown, rx_dropdown, technology_sel, distance_max, num_points, sampling, distance_target, tx_ant_height, rx_ant_height)
+                with timed_stage('cache_lookup'):
+                    figures = result_cache.get(cache_key)
+                if figures is None:
+                    tx_device_parameters = devices.parameters(tx_dropdown)
+                    rx_device_parameters = devices.parameters(rx_dropdown)
+                    figures = link_budget_figures(tx_device_parameters, rx_device_parameters, technology_sel, distance_target, distance_max, num_points, sampling, tx_ant_height, rx_ant_height)
+                    result_cache.set(cache_key, figures)
+
+                fig1, fig2, fig3 = figures
+
+
+                return (fig1), (fig2), (fig3), [
+                    dash_table.DataTable(
+                                                        id='datatable-interactivity',
+                                                        columns=[
+                                                                    # {"name": i, "id": i, "deletable": True, "selectable": True, "hideable": True}
+                                                                    {"name": i, "id": i} for i in devices.columns
+                                                                ],
+                                                        data=devices.records([tx_dropdown, rx_dropdown]),  # the contents of the table
+                                                    #     # editable=True,              # allow editing of data inside all cells
+                                                    #     filter_action="native",     # allow filtering of data by user ('native') or not ('none')
+                                                    #     sort_action="native",       # enables data to be sorted per-column by user or not ('none')
+                                                    #     sort_mode="single",         # sort across 'multi' or 'single' columns
+                                                    #     # column_selectable="multi",  # allow users to select 'multi' or 'single' columns
+                                                    #     # row_selectable="multi",     # allow users to select 'multi' or 'single' rows
+                                                    #     # row_deletable=True,         # choose if user can delete a row (True) or not (False)
+                                                    #     selected_columns=[],        # ids of columns that user selects
+                                                    #     selected_rows=[],           # indices of rows that user selects
+                                                    #     # page_action="native",       # all data is passed to the table up-front or not ('none')
+                                                    #     # page_current=0,             # page number that user is on
+                                                    #     # page_size=6,                # number of rows visible per page
+                                                        # style_cell={                # ensure adequate header width when text is shorter than cell's text
+                                                        #     'minWidth': 100, 'maxWidth': 100, 'width': 100,
+                                                        #     'textAlign': 'center'
+                                                        # },
+                                                        style_cell={'textAlign': 'center'},
+                                                        style_header = {'fontWeight': 'bold', 'backgroundColor': 'rgb(230, 230, 230)', 'border': '1px solid black'},
+                                                        style_data={'border': '1px solid black'},
+                                                    #     style_data={                # overflow cells' content into multiple lines
+                                                    #         'whiteSpace': 'normal',
+                                                    #         'height': 'auto'
+                                                    #     }
+                                                    ),
+        ]  
+                
+                       
+            else:
+                return {}, {}, {}, {}
+#--------------------------------------------------------------------------------------------------------------------------  
+
+
+
+#--------------------------------------------------------------------------------------------------------------------------
+@app.callback(
+    Output('range_summary_table', 'children'),
+    [Input('transmitter_dropdown', 'value'),
+     Input('receiver_dropdown', 'value'),
+     Input('tech_filter', 'value'),
+     Input('fade_margin_input', 'value'),
+     Input('transmitter_antenna_height', 'value'),
+     Input('receiver_antenna_height', 'value')
+    ]
+)
 
 
-            html.Div([    
-                            html.Label(
-                                                ['Dashboard created by Verkada Access Control Hardware Team'],
-                                                className = 'six columns', style={'color': 'black', 'fontSize': '15px', 'fontWeight': 'bold', 'fontFamily': 'helvetica', "textAlign":"left", 'opacity': '0.5'}
-                                        ),
+@timed_stage('update_range_summary')
+def update_range_summary(tx_dropdown, rx_dropdown, technology_sel, fade_margin_dB, tx_ant_height, rx_ant_height):
+            devices = device_registry
+            if tx_dropdown in devices and rx_dropdown in devices and technology_sel in TECHNOLOGY_MODELS:
+                tx_ant_height, rx_ant_height = sanitize_antenna_heights(tx_ant_height, rx_ant_height)
+                summary = link_range_summary(devices.parameters(tx_dropdown), devices.parameters(rx_dropdown), technology_sel, fade_margin_dB or 0, tx_ant_height, rx_ant_height)
+                columns = ['Model', 'Uplink (m)', 'Downlink (m)', 'Bidirectional (m)', 'Valid']
+                # Same flag as the range API: the bidirectional range is inside the model's
+                # range for both directions
+                frequency_MHz = TECHNOLOGY_FREQUENCY_MHZ[technology_sel]
+                valid = {model: bool(propagation_validity_mask(model, ranges['bidirectional'], frequency_MHz, tx_ant_height, rx_ant_height) & propagation_validity_mask(model, ranges['bidirectional'], frequency_MHz, rx_ant_height, tx_ant_height)) for model, ranges in summary.items()}
+                rows = [dict(zip(columns, [model, round(float(ranges['uplink']), 1), round(float(ranges['downlink']), 1), round(float(ranges['bidirectional']), 1), 'yes' if valid[model] else 'no'])) for model, ranges in summary.items()]
 
-                            html.Label(
-                                                ['Dash-Plotly code version v1.0'],
-                                                className = 'six columns', style={'color': 'black', 'fontSize': '15px', 'fontStyle': 'italic', 'fontFamily': 'helvetica', "textAlign":"right", 'opacity': '0.5'}
+                return [
+                    dash_table.DataTable(
+                                                        id='range_summary_datatable',
+                                                        columns=[{"name": i, "id": i} for i in columns],
+                                                        data=rows,
+                                                        style_cell={'textAlign': 'center'},
+                                                        style_header = {'fontWeight': 'bold', 'backgroundColor': 'rgb(230, 230, 230)', 'border': '1px solid black'},
+                                                        style_data={'border': '1px solid black'},
+                                                        # Ranges outside the model's validity range are greyed like the dotted curves
+                                                        style_data_conditional=[{'if': {'filter_query': '{Valid} = "no"'}, 'color': 'gray', 'fontStyle': 'italic'}],
+                                                    ),
+        ]
+
+            else:
+                return []
+#--------------------------------------------------------------------------------------------------------------------------
+
+
+
+#--------------------------------------------------------------------------------------------------------------------------
+@app.callback(
+    Output('outage_graph', 'figure'),
+    [Input('transmitter_dropdown', 'value'),
+     Input('receiver_dropdown', 'value'),
+     Input('tech_filter', 'value'),
+     Input('distance_max_input', 'value'),
+     Input('distance_points_input', 'value'),
+     Input('distance_sampling', 'value'),
+     Input('fading_model', 'value'),
+     Input('shadowing_sigma_input', 'value'),
+     Input('rician_k_factor_input', 'value'),
+     Input('transmitter_antenna_height', 'value'),
+     Input('receiver_antenna_height', 'value')
+    ]
+)
+
+
+@timed_stage('update_outage_graph')
+def update_outage_graph(tx_dropdown, rx_dropdown, technology_sel, distance_max, num_points, sampling, fading, shadowing_sigma_dB, rician_k_factor_dB, tx_ant_height, rx_ant_height):
+            devices = device_registry
+            if tx_dropdown not in devices or rx_dropdown not in devices or technology_sel not in TECHNOLOGY_MODELS:
+                return {}
+            if fading not in FADING_MODELS or (fading == 'none' and not shadowing_sigma_dB):
+                return {}
+
+            distance_max, num_points, sampling, _ = sanitize_distance_sweep(distance_max, num_points, sampling)
+            shadowing_sigma_dB = float(shadowing_sigma_dB or 0)
+            rician_k_factor_dB = float(rician_k_factor_dB if rician_k_factor_dB is not None else DEFAULT_RICIAN_K_FACTOR_DB)
+            tx_ant_height, rx_ant_height = sanitize_antenna_heights(tx_ant_height, rx_ant_height)
+            cache_key = ('outage', devices.version, tx_dropdown, rx_dropdown, technology_sel, distance_max, num_points, sampling, fading, shadowing_sigma_dB, rician_k_factor_dB, tx_ant_height, rx_ant_height)
+            fig = result_cache.get(cache_key)
+
+            if fig is None:
+                models = TECHNOLOGY_MODELS[technology_sel]
+                # The adaptive sweep depends on the devices, outage curves use log sampling instead
+                path_loss = path_loss_table(technology_sel, TECHNOLOGY_FREQUENCY_MHZ[technology_sel], tx_ant_height, rx_ant_height, distance_max, num_points, 'log' if sampling == 'adaptive' else sampling)
+                tx_device_parameters = devices.parameters(tx_dropdown)
+                rx_device_parameters = devices.parameters(rx_dropdown)
+
+                margin_dB = np.stack([
+                                        RSSI_calc(path_loss['distance'], tx_device_parameters['tx_power'], tx_device_parameters['ant_efficiency'], rx_device_parameters['ant_efficiency'], path_loss['uplink']) - rx_device_parameters['rx_sensitivity'],
+                                        RSSI_calc(path_loss['distance'], rx_device_parameters['tx_power'], rx_device_parameters['ant_efficiency'], tx_device_parameters['ant_efficiency'], path_loss['downlink']) - tx_device_parameters['rx_sensitivity'],
+                                    ])
+                outage_probability = monte_carlo_outage(margin_dB, shadowing_sigma_dB, fading, rician_k_factor_dB)
+
+                fig = build_line_figure(
+                                            path_loss['distance'],
+                                            [('outage_' + model + '_uplink', outage_probability[0, k]) for k, model in enumerate(models)] + [('outage_' + model + '_downlink', outage_probability[1, k]) for k, model in enumerate(models)],
+                                            "Outage Probability P(RSSI < Sensitivity) - {}".format(TECHNOLOGY_LABELS[technology_sel]),
+                                            'Outage Probability',
+                                            log_x=sampling != 'linear'
+                                    )
+                result_cache.set(cache_key, fig)
+
+            return fig
+#--------------------------------------------------------------------------------------------------------------------------
+
+
+
+# Channel sweep graph
+# Worst / best channel RSSI envelope of every model over all channels of the selected band,
+# the band between the two curves is filled. The legend names the channel frequency at the
+# target distance.
+#--------------------------------------------------------------------------------------------------------------------------
+@app.callback(
+    Output('channel_sweep_graph', 'figure'),
+    [Input('transmitter_dropdown', 'value'),
+     Input('receiver_dropdown', 'value'),
+     Input('tech_filter', 'value'),
+     Input('channel_band', 'value'),
+     Input('distance_max_input', 'value'),
+     Input('distance_points_input', 'value'),
+     Input('distance_sampling', 'value'),
+     Input('distance_target_input', 'value'),
+     Input('transmitter_antenna_height', 'value'),
+     Input('receiver_antenna_height', 'value')
+    ]
+)
+
+
+@timed_stage('update_channel_sweep_graph')
+def update_channel_sweep_graph(tx_dropdown, rx_dropdown, technology_sel, band, distance_max, num_points, sampling, distance_target, tx_ant_height, rx_ant_height):
+            devices = device_registry
+            if tx_dropdown not in devices or rx_dropdown not in devices or technology_sel not in TECHNOLOGY_MODELS:
+                return {}
+            if band not in TECHNOLOGY_BANDS[technology_sel]:
+                return {}
+
+            distance_max, num_points, sampling, distance_target = sanitize_distance_sweep(distance_max, num_points, sampling, distance_target)
+            tx_ant_height, rx_ant_height = sanitize_antenna_heights(tx_ant_height, rx_ant_height)
+            cache_key = ('channel_sweep', devices.version, tx_dropdown, rx_dropdown, technology_sel, band, distance_max, num_points, sampling, distance_target, tx_ant_height, rx_ant_height)
+            fig = result_cache.get(cache_key)
+
+            if fig is None:
+                models = TECHNOLOGY_MODELS[technology_sel]
+                # The adaptive sweep depends on the devices, channel envelopes use log sampling instead
+                with timed_stage('path_loss'):
+                    path_loss = channel_path_loss_table(technology_sel, band, tx_ant_height, rx_ant_height, distance_max, num_points, 'log' if sampling == 'adaptive' else sampling)
+                tx_device_parameters = devices.parameters(tx_dropdown)
+                rx_device_parameters = devices.parameters(rx_dropdown)
+                channels_MHz = path_loss['channels']
+                target = min(int(np.searchsorted(path_loss['distance'], distance_target)), len(path_loss['distance']) - 1)
+
+                traces = []
+                for direction, tx, rx in (('uplink', tx_device_parameters, rx_device_parameters), ('downlink', rx_device_parameters, tx_device_parameters)):
+                    for k, model in enumerate(models):
+                        for envelope in ('worst', 'best'):
+                            rssi = RSSI_calc(path_loss['distance'], tx['tx_power'], tx['ant_efficiency'], rx['ant_efficiency'], path_loss[direction + '_' + envelope][k])
+                            channel_MHz = channels_MHz[path_loss[direction + '_' + envelope + '_channel'][k, target]]
+                            traces.append(('rssi_{}_{}_{} ({:g} MHz)'.format(model, direction, envelope, channel_MHz), rssi))
+
+                fig = build_line_figure(
+                                            path_loss['distance'],
+                                            traces,
+                                            "RSSI channel envelope - {} {} ({} channels)".format(TECHNOLOGY_LABELS[technology_sel], band, len(channels_MHz)),
+                                            'RSSI (dBm)',
+                                            distance_target=distance_target,
+                                            log_x=sampling != 'linear'
+                                    )
+                for worst, best in zip(fig['data'][0::2], fig['data'][1::2]):
+                    best['fill'] = 'tonexty'
+                    worst['legendgroup'] = best['legendgroup'] = worst['name'].rsplit('_', 1)[0]
+                result_cache.set(cache_key, fig)
+
+            return fig
+#--------------------------------------------------------------------------------------------------------------------------
+
+
+
+# Link budget callback registration - server side (default) or clientside mode
+#--------------------------------------------------------------------------------------------------------------------------
+link_budget_outputs = [
+                            Output('path_loss_graph', 'figure'),
+                            Output('uplink_graph', 'figure'),
+                            Output('downlink_graph', 'figure'),
+                            Output('specification_table', 'children'),
+                    ]
+
+if CLIENTSIDE_CALLBACKS:
+    app.clientside_callback(
+                                ClientsideFunction(namespace='verkplot', function_name='update_link_budget'),
+                                *link_budget_outputs,
+                                Input('transmitter_dropdown', 'value'),
+                                Input('receiver_dropdown', 'value'),
+                                Input('path_loss_store', 'data'),
+                                Input('link_settings_store', 'data'),
+                                Input('device_store', 'data'),
+                        )
+    app.callback(
+                    Output('path_loss_store', 'data'),
+                    [Input('tech_filter', 'value'),
+                     Input('distance_max_input', 'value'),
+                     Input('distance_points_input', 'value'),
+                     Input('distance_sampling', 'value')
+                    ]
+                )(update_path_loss_store)
+    app.clientside_callback(
+                                ClientsideFunction(namespace='verkplot', function_name='update_link_settings'),
+                                Output('link_settings_store', 'data'),
+                                Input('distance_target_input', 'value'),
+                                Input('transmitter_antenna_height', 'value'),
+                                Input('receiver_antenna_height', 'value'),
+                                State('link_settings_store', 'data'),
+                        )
+else:
+    app.callback(
+                    *link_budget_outputs,
+                    [Input('transmitter_dropdown', 'value'),
+                     Input('receiver_dropdown', 'value'),
+                     Input('tech_filter', 'value'),
+                     Input('distance_max_input', 'value'),
+                     Input('distance_points_input', 'value'),
+                     Input('distance_sampling', 'value'),
+                     Input('distance_target_input', 'value'),
+                     Input('transmitter_antenna_height', 'value'),
+                     Input('receiver_antenna_height', 'value')
+                    ]
+                )(update_datatable)
+#--------------------------------------------------------------------------------------------------------------------------
+
+#--------------------------------------------------------------------------------------------------------------------------
+@app.callback(
+    Output('matrix_model_filter', 'options'),
+    Output('matrix_model_filter', 'value'),
+    Input('matrix_tech_filter', 'value')
+)
+
+
+def update_matrix_models(technology_sel):
+    models = TECHNOLOGY_MODELS[technology_sel]
+    return [{'label': model, 'value': model} for model in models], models[0]
+#--------------------------------------------------------------------------------------------------------------------------
+
+
+
+#--------------------------------------------------------------------------------------------------------------------------
+@app.callback(
+    Output('compatibility_matrix_graph', 'figure'),
+    [Input('matrix_tech_filter', 'value'),
+     Input('matrix_model_filter', 'value')
+    ]
+)
+
+
+@timed_stage('update_compatibility_matrix')
+def update_compatibility_matrix(technology_sel, model_sel):
+            devices = device_registry
+            if technology_sel not in TECHNOLOGY_MODELS or model_sel not in TECHNOLOGY_MODELS[technology_sel]:
+                raise PreventUpdate
+
+            title = "Bidirectional Maximum Range (m) - {} - {}".format(technology_sel, model_sel)
+            # Same N x N limit as the max-range API, larger catalogs go through the API or a job
+            if len(devices)**2 > API_MAX_PAIRS:
+                return build_message_figure(title, 'The catalog has {} devices ({} pairs), the matrix is limited to {} pairs.<br>Use /api/v1/max-range with explicit pairs or a background job below.'.format(len(devices), len(devices)**2, API_MAX_PAIRS))
+
+            cache_key = ('compatibility_matrix', devices.version, technology_sel, model_sel)
+            fig = result_cache.get(cache_key)
+            if fig is None:
+                max_range = batch_max_range(devices, technology_sel)
+                model_index = max_range['models'].index(model_sel)
+
+                fig = build_matrix_figure(
+                                                max_range['bidirectional'][:, :, model_index],
+                                                devices.names,
+                                                title,
+                                                'Max Range (m)'
                                         )
-                    ],
-                    style={'position': 'fixed', 'bottom': 0, 'width': '99%'}
-                    ),
-                    ], 
-                    # style={'backgroundColor':'#FFFFF0'}
-                    )       
-            )],
-            style={'backgroundColor':'#FFFFF0'}
-            )
+                result_cache.set(cache_key, fig)
+
+            return fig
+#--------------------------------------------------------------------------------------------------------------------------
 
 
+#--------------------------------------------------------------------------------------------------------------------------
+@app.callback(
+    Output('coverage_model_filter', 'options'),
+    Output('coverage_model_filter', 'value'),
+    Input('coverage_tech_filter', 'value'),
+    State('coverage_model_filter', 'value')
+)
 
 
+def update_coverage_models(technology_sel, model_sel):
+    models = TECHNOLOGY_MODELS[technology_sel]
+    return [{'label': model, 'value': model} for model in models], model_sel if model_sel in models else models[0]
 #--------------------------------------------------------------------------------------------------------------------------
-@app.callback(Output('tabs_content', 'children'),
-              Input('tabs_inline', 'value'))
 
 
-def render_content(tab):
-    if tab == 'tab-1':
-        return html.Div([
-                    dbc.Row([
-                        dbc.Col(
-                                    [],
-                                    width = 1
-                                ),
 
-                        dbc.Col(
-                            html.Div([
-                                            html.Br(),
-                                            html.Label(
-                                                            ['Wireless Technology'],
-                                                            style={'color': 'black', 'font-weight': 'bold', "text-align": "center"}
-                                                        ),
-                                
-                                            dcc.Dropdown(
-                                                                id='tech_filter',
-                                                                options=[{'label': 'Bluetooth LE (2440MHz)', 'value': 'BLE'}, {'label': 'Sub GHz (915MHz)', 'value': 'Sub GHz'}, {'label': 'WiFi (not supported)', 'value': 'wifi'}],
-                                                                value='NA',
-                                                                multi=False,
-                                                                disabled=False,
-                                                                clearable=False,
-                                                                searchable=True,
-                                                                placeholder='Choose Technology...',
-                                                                style={'width':"100%"},
-                                                                persistence='string',
-                                                                persistence_type='session'
-                                                        ),
-                                    ],
-                                    # className = "six columns",
-                                    style={'marginLeft':'90px', 'marginRight':'90px', 'text-align':'center'}
-                                    ),
-                                    width = 10
-                                ),
+#--------------------------------------------------------------------------------------------------------------------------
+@app.callback(
+    Output('coverage_graph', 'figure'),
+    Output('coverage_summary_table', 'children'),
+    [Input('coverage_tech_filter', 'value'),
+     Input('coverage_model_filter', 'value'),
+     Input('coverage_tx_dropdown', 'value'),
+     Input('coverage_rx_dropdown', 'value'),
+     Input('coverage_metric', 'value'),
+     Input('floor_width_input', 'value'),
+     Input('floor_length_input', 'value'),
+     Input('cell_size_input', 'value'),
+     Input('coverage_transmitters_input', 'value'),
+     Input('coverage_walls_input', 'value')
+    ]
+)
+
+
+@timed_stage('update_coverage')
+def update_coverage(technology_sel, model_sel, tx_dropdown, rx_dropdown, metric, floor_width, floor_length, cell_size, transmitters_text, walls_text):
+            devices = device_registry
+            if technology_sel not in TECHNOLOGY_MODELS or model_sel not in TECHNOLOGY_MODELS[technology_sel]:
+                raise PreventUpdate
+            if tx_dropdown not in devices or rx_dropdown not in devices:
+                raise PreventUpdate
+
+            try:
+                floor_plan = FloorPlan(floor_width or 0, floor_length or 0, cell_size or 0, parse_number_list(walls_text, 5))
+                positions = parse_number_list(transmitters_text, 2)
+            except ValueError:
+                raise PreventUpdate
+            num_cells = floor_plan.shape[0]*floor_plan.shape[1]
+            if num_cells > COVERAGE_MAX_CELLS:
+                message = 'Cell size too fine: the floor plan would have {:,} cells, the limit is {:,}. Increase the cell size.'.format(num_cells, COVERAGE_MAX_CELLS)
+                return build_message_figure('Coverage', message), []
+
+            tx_device_parameters = devices.parameters(tx_dropdown)
+            rx_device_parameters = devices.parameters(rx_dropdown)
+            transmitters = np.column_stack([positions, np.full(len(positions), tx_device_parameters['tx_power'] + tx_device_parameters['ant_efficiency'])])
+
+            cache_key = ('coverage', devices.version, technology_sel, model_sel, tx_dropdown, floor_plan.width_m, floor_plan.length_m, floor_plan.cell_size_m, floor_plan.walls.tobytes(), positions.tobytes())
+            coverage = result_cache.get(cache_key)
+            if coverage is None:
+                # Only the strided figure grid and the summary rows are cached, never the full grid
+                rssi_dBm, _ = coverage_map(floor_plan, transmitters, technology_sel, model_sel)
+                keep_rows, keep_columns = coverage_figure_indices(floor_plan)
+                coverage_fraction = receiver_coverage(rssi_dBm, devices)[[devices.index[name] for name in devices.sorted_names]]
+                best = np.argsort(-coverage_fraction, kind='stable')[:COVERAGE_SUMMARY_ROWS]
+                coverage = {
+                                'rssi': np.ascontiguousarray(rssi_dBm[keep_rows][:, keep_columns]),
+                                'summary': [(devices.sorted_names[row], round(100*float(coverage_fraction[row]), 1)) for row in best.tolist()],
+                            }
+                result_cache.set(cache_key, coverage)
+
+            if metric == 'rssi':
+                values = coverage['rssi'] + np.float32(rx_device_parameters['ant_efficiency'])
+                title, colorbar_title = "RSSI at {} (dBm)".format(rx_dropdown), 'RSSI (dBm)'
+            else:
+                values = coverage_margin(coverage['rssi'], rx_device_parameters)
+                title, colorbar_title = "Link Margin at {} (dB)".format(rx_dropdown), 'Margin (dB)'
+
+            fig = build_coverage_figure(values, floor_plan, transmitters, "{} - {} - {} - {}".format(title, tx_dropdown, technology_sel, model_sel), colorbar_title)
+
+            columns = ['Receiver', 'Floor Coverage (%)']
+            rows = [dict(zip(columns, row)) for row in coverage['summary']]
+            table = [
+                    html.Div('Best covered {} of {} receivers'.format(len(rows), len(devices)), style={'text-align': 'left', 'padding-bottom': '5px'}),
+                    dash_table.DataTable(
+                                                        id='coverage_summary_datatable',
+                                                        columns=[{"name": i, "id": i} for i in columns],
+                                                        data=rows,
+                                                        style_cell={'textAlign': 'center'},
+                                                        style_header = {'fontWeight': 'bold', 'backgroundColor': 'rgb(230, 230, 230)', 'border': '1px solid black'},
+                                                        style_data={'border': '1px solid black'},
+                                                        page_size=15,
+                                                    ),
+        ]
+
+            return fig, table
+#--------------------------------------------------------------------------------------------------------------------------
+
+# REST / JSON link budget API
+# Plain Flask routes on the Dash server for planning tools, no figures are rendered.
+#   GET|POST /api/v1/devices                 device table, or with 'q' the top 'limit' search matches
+#   GET|POST /api/v1/link-budget             one tx/rx pair: RSSI and margin per model/distance
+#   POST     /api/v1/link-budget/batch       many pairs in one array evaluation, streamed
+#   GET|POST /api/v1/max-range               closed form range for one pair, a list of pairs
+#                                            or (without pairs) every pair of the catalog
+#   POST     /api/v1/sinr                    co-channel interference and SINR of every node of
+#                                            a site ('nodes': device, x, y[, z], channel,
+#                                            duty_cycle[, serving]), streamed
+# Parameters come from the JSON body or the query string. Distances are either an explicit
+# 'distances' list or a sweep (distance_max, num_points, sampling). Batch and max-range
+# responses stream JSON lines (one object per pair) by default, format=arrow returns an
+# Arrow IPC stream built from the result arrays when pyarrow is installed. Records are
+# converted to JSON API_STREAM_CHUNK_VALUES values at a time while the response is sent.
+# Undefined values (e.g. path loss at 0 m) are null. uplink_valid/downlink_valid (per
+# distance) and valid (per range) flag the values inside the model's declared validity range.
+# Errors are {"error": message} with status 400 (or 404 for unknown devices).
+#--------------------------------------------------------------------------------------------------------------------------
+API_MAX_PAIRS = int(os.environ.get('VERKPLOT_API_MAX_PAIRS', '100000'))
+API_MAX_VALUES = int(os.environ.get('VERKPLOT_API_MAX_VALUES', str(5*10**7)))
+API_MAX_SINR_NODES = int(os.environ.get('VERKPLOT_API_MAX_SINR_NODES', '20000'))
+API_STREAM_CHUNK_VALUES = 2**16
+
+
+class APIError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+@server.errorhandler(APIError)
+def _api_error(error):
+    return jsonify({'error': str(error)}), error.status
+
+
+def _api_parameters():
+    parameters = dict(request.args)
+    body = request.get_json(silent=True) if request.method == 'POST' else None
+    if body is not None:
+        if not isinstance(body, dict):
+            raise APIError('Request body must be a JSON object')
+        parameters.update(body)
+    return parameters
+
+
+def finite_number(value, name):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        raise ValueError('{} must be a number'.format(name))
+    if not np.isfinite(value):
+        raise ValueError('{} must be a finite number'.format(name))
+    return value
+
+
+def _api_number(parameters, name, default):
+    try:
+        return finite_number(parameters.get(name, default), name)
+    except ValueError as error:
+        raise APIError(str(error))
+
+
+def _api_technology(parameters):
+    technology = parameters.get('technology')
+    if technology not in TECHNOLOGY_MODELS:
+        raise APIError('technology must be one of: {}'.format(', '.join(TECHNOLOGY_MODELS)))
+    return technology
+
+
+def _api_distances(parameters):
+    if parameters.get('distances') is not None:
+        try:
+            distance_list = np.asarray(parameters['distances'], dtype=float).ravel()
+        except (TypeError, ValueError):
+            raise APIError('distances must be a list of numbers')
+        if distance_list.size > MAX_DISTANCE_POINTS:
+            raise APIError('At most {} distances are allowed'.format(MAX_DISTANCE_POINTS))
+        return distance_list
+
+    sampling = parameters.get('sampling', 'linear')
+    if sampling not in ('linear', 'log'):
+        raise APIError('sampling must be linear or log')
+    distance_max, num_points, sampling, _ = sanitize_distance_sweep(_api_number(parameters, 'distance_max', DEFAULT_DISTANCE_MAX_M), _api_number(parameters, 'num_points', DEFAULT_DISTANCE_POINTS), sampling)
+    return distance_sweep(distance_max, num_points, sampling)
+
+
+# Names are checked before any registry lookup, an unhashable name must be a 400 not a 500
+def _api_device_names(names):
+    invalid = [name for name in names if not isinstance(name, str)]
+    if invalid:
+        raise APIError('Device names must be strings, got: {}'.format(', '.join(json.dumps(name, default=str) for name in invalid[:20])))
+
+
+def _api_pair_indices(devices, pairs):
+    if not isinstance(pairs, list) or not all(isinstance(pair, (list, tuple)) and len(pair) == 2 for pair in pairs):
+        raise APIError('pairs must be a list of [tx, rx] device names')
+    _api_device_names([name for pair in pairs for name in pair])
+    if len(pairs) > API_MAX_PAIRS:
+        raise APIError('At most {} pairs are allowed per request'.format(API_MAX_PAIRS))
+    unknown = sorted({name for pair in pairs for name in pair if name not in devices}, key=str)
+    if unknown:
+        raise APIError('Unknown devices: {}'.format(', '.join(map(str, unknown[:20]))), 404)
+    return np.array([devices.index[tx] for tx, _ in pairs], dtype=np.intp), np.array([devices.index[rx] for _, rx in pairs], dtype=np.intp)
+
+
+def _json_values(values):
+    values = np.round(np.asarray(values, dtype=float), 3)
+    return np.where(np.isfinite(values), values, None).tolist()
+
+
+# Uplink/downlink RSSI and margin of every pair, shapes (pairs, models, distances). One
+# path loss table per direction is shared by all pairs, so this is a single broadcast.
+def pair_link_budget(devices, tx_rows, rx_rows, distance_list, technology, tx_ant_height=DEFAULT_TX_ANTENNA_HEIGHT_M, rx_ant_height=DEFAULT_RX_ANTENNA_HEIGHT_M):
+    path_loss = link_path_loss(distance_list, technology, TECHNOLOGY_FREQUENCY_MHZ[technology], tx_ant_height, rx_ant_height)
+    expand = (slice(None), None, None)
+    uplink = RSSI_calc(distance_list, devices.tx_power_dBm[tx_rows][expand], devices.ant_efficiency_dB[tx_rows][expand], devices.ant_efficiency_dB[rx_rows][expand], path_loss['uplink'])
+    downlink = RSSI_calc(distance_list, devices.tx_power_dBm[rx_rows][expand], devices.ant_efficiency_dB[rx_rows][expand], devices.ant_efficiency_dB[tx_rows][expand], path_loss['downlink'])
+
+    return {
+                'models': path_loss['models'],
+                'distance': distance_list,
+                'uplink_rssi': uplink,
+                'downlink_rssi': downlink,
+                'uplink_margin': uplink - devices.rx_sensitivity_dBm[rx_rows][expand],
+                'downlink_margin': downlink - devices.rx_sensitivity_dBm[tx_rows][expand],
+                'uplink_valid': path_loss['uplink_valid'],
+                'downlink_valid': path_loss['downlink_valid'],
+            }
+
+
+# Number of leading records per chunk when every record holds values_per_record values
+def _stream_chunks(num_records, values_per_record):
+    chunk = max(1, API_STREAM_CHUNK_VALUES // max(values_per_record, 1))
+    return [(start, min(start + chunk, num_records)) for start in range(0, num_records, chunk)]
+
+
+# One Arrow column per record field: 1-d arrays are scalar columns, 2-d arrays fixed size
+# list columns. Floats are rounded to float64 like the JSON values, non-finite floats and masked
+# entries of a masked array become null.
+def _arrow_column(pyarrow, values):
+    mask = np.ma.getmaskarray(values).reshape(-1)
+    values = np.ma.getdata(values)
+    flat = values.reshape(-1)
+    if values.dtype.kind == 'f':
+        flat = np.round(flat.astype(float), 3)
+        array = pyarrow.array(flat, mask=mask | ~np.isfinite(flat))
+    elif values.dtype.kind == 'O':
+        array = pyarrow.array(flat.tolist(), mask=mask)
+    else:
+        array = pyarrow.array(flat, mask=mask)
+    if values.ndim == 2:
+        return pyarrow.FixedSizeListArray.from_arrays(array, values.shape[1])
+    return array
+
+
+# records - generator of JSON records, streamed for jsonl/json
+# column_arrays - callable returning {column: array over records}, only called for arrow
+def _stream_records(records, columns, response_format, column_arrays):
+    if response_format == 'arrow':
+        try:
+            import pyarrow
+        except ImportError:
+            raise APIError('format=arrow requires pyarrow to be installed', 406)
+        arrays = column_arrays()
+        table = pyarrow.Table.from_arrays([_arrow_column(pyarrow, arrays[column]) for column in columns], names=columns)
+        sink = pyarrow.BufferOutputStream()
+        with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return Response(sink.getvalue().to_pybytes(), mimetype='application/vnd.apache.arrow.stream')
+    if response_format not in ('jsonl', 'json'):
+        raise APIError('format must be jsonl, json or arrow')
+    if response_format == 'json':
+        def json_document():
+            yield '{{"columns": {}, "records": ['.format(json.dumps(columns))
+            for n, record in enumerate(records):
+                yield (', ' if n else '') + json.dumps(record)
+            yield ']}\n'
+
+        return Response(json_document(), mimetype='application/json')
+    return Response((json.dumps(record) + '\n' for record in records), mimetype='application/x-ndjson')
+
+
+@server.route('/api/v1/devices', methods=['GET', 'POST'])
+def api_devices():
+    devices = device_registry
+    parameters = _api_parameters()
+    if 'q' in parameters:
+        limit = int(min(max(_api_number(parameters, 'limit', DEVICE_SEARCH_LIMIT), 1), API_MAX_PAIRS))
+        names = device_search_index(devices).search(str(parameters['q']), limit)
+    else:
+        names = devices.sorted_names
+    return jsonify({'version': devices.version, 'columns': devices.columns, 'devices': devices.records(names)})
+
+
+@server.route('/api/v1/link-budget', methods=['GET', 'POST'])
+def api_link_budget():
+    devices = device_registry
+    parameters = _api_parameters()
+    technology = _api_technology(parameters)
+    distance_list = _api_distances(parameters)
+    tx_rows, rx_rows = _api_pair_indices(devices, [[parameters.get('tx'), parameters.get('rx')]])
+    budget = pair_link_budget(devices, tx_rows, rx_rows, distance_list, technology)
+
+    return jsonify({
+                        'version': devices.version,
+                        'tx': parameters['tx'],
+                        'rx': parameters['rx'],
+                        'technology': technology,
+                        'distance': _json_values(distance_list),
+                        'models': {
+                                        model: dict({key: _json_values(budget[key][0, k]) for key in ('uplink_rssi', 'downlink_rssi', 'uplink_margin', 'downlink_margin')}, uplink_valid=budget['uplink_valid'][k].tolist(), downlink_valid=budget['downlink_valid'][k].tolist())
+                                        for k, model in enumerate(budget['models'])
+                                    },
+                    })
+
+
+@server.route('/api/v1/link-budget/batch', methods=['POST'])
+def api_link_budget_batch():
+    devices = device_registry
+    parameters = _api_parameters()
+    technology = _api_technology(parameters)
+    distance_list = _api_distances(parameters)
+    pairs = parameters.get('pairs')
+    tx_rows, rx_rows = _api_pair_indices(devices, pairs)
+    if 4*len(pairs)*len(TECHNOLOGY_MODELS[technology])*len(distance_list) > API_MAX_VALUES:
+        raise APIError('Request too large, reduce the number of pairs or distances')
+    budget = pair_link_budget(devices, tx_rows, rx_rows, distance_list, technology)
+    models = budget['models']
+    distance = _json_values(distance_list)
+    columns = ['tx', 'rx', 'model', 'distance', 'uplink_rssi', 'downlink_rssi', 'uplink_margin', 'downlink_margin', 'uplink_valid', 'downlink_valid']
+    valid = {key: budget[key].tolist() for key in columns[8:]}
+
+    def records():
+        for start, stop in _stream_chunks(len(pairs), len(models)*len(distance_list)):
+            values = {key: _json_values(budget[key][start:stop]) for key in columns[4:8]}
+            for p, (tx, rx) in enumerate(pairs[start:stop]):
+                for k, model in enumerate(models):
+                    record = {'tx': tx, 'rx': rx, 'model': model, 'distance': distance}
+                    for key in columns[4:8]:
+                        record[key] = values[key][p][k]
+                    for key in columns[8:]:
+                        record[key] = valid[key][k]
+                    yield record
+
+    def column_arrays():
+        num_records = len(pairs)*len(models)
+        arrays = {
+                        'tx': np.repeat(np.array([tx for tx, _ in pairs], dtype=object), len(models)),
+                        'rx': np.repeat(np.array([rx for _, rx in pairs], dtype=object), len(models)),
+                        'model': np.tile(np.array(models, dtype=object), len(pairs)),
+                        'distance': np.broadcast_to(distance_list, (num_records, len(distance_list))),
+                    }
+        arrays.update({key: budget[key].reshape(num_records, len(distance_list)) for key in columns[4:8]})
+        arrays.update({key: np.tile(budget[key], (len(pairs), 1)) for key in columns[8:]})
+        return arrays
+
+    return _stream_records(records(), columns, parameters.get('format', 'jsonl'), column_arrays)
+
+
+@server.route('/api/v1/max-range', methods=['GET', 'POST'])
+def api_max_range():
+    devices = device_registry
+    parameters = _api_parameters()
+    technology = _api_technology(parameters)
+    fade_margin_dB = _api_number(parameters, 'fade_margin', 0)
+
+    if parameters.get('tx') is not None or parameters.get('rx') is not None:
+        pairs = [[parameters.get('tx'), parameters.get('rx')]]
+    elif parameters.get('pairs') is not None:
+        pairs = parameters['pairs']
+    else:
+        if len(devices)**2 > API_MAX_PAIRS:
+            raise APIError('The catalog has too many pairs, pass pairs explicitly')
+        pairs = [[tx, rx] for tx in devices.names for rx in devices.names]
+    tx_rows, rx_rows = _api_pair_indices(devices, pairs)
+
+    tx_device_parameters = {'tx_power': devices.tx_power_dBm[tx_rows], 'ant_efficiency': devices.ant_efficiency_dB[tx_rows], 'rx_sensitivity': devices.rx_sensitivity_dBm[tx_rows]}
+    rx_device_parameters = {'tx_power': devices.tx_power_dBm[rx_rows], 'ant_efficiency': devices.ant_efficiency_dB[rx_rows], 'rx_sensitivity': devices.rx_sensitivity_dBm[rx_rows]}
+    summary = link_range_summary(tx_device_parameters, rx_device_parameters, technology, fade_margin_dB)
+    models = list(summary)
+    columns = ['tx', 'rx', 'model', 'uplink', 'downlink', 'bidirectional', 'valid']
+    # The bidirectional range is valid when it is inside the model's range for both directions
+    frequency_MHz = TECHNOLOGY_FREQUENCY_MHZ[technology]
+    valid = {model: np.broadcast_to(propagation_validity_mask(model, summary[model]['bidirectional'], frequency_MHz, DEFAULT_TX_ANTENNA_HEIGHT_M, DEFAULT_RX_ANTENNA_HEIGHT_M) & propagation_validity_mask(model, summary[model]['bidirectional'], frequency_MHz, DEFAULT_RX_ANTENNA_HEIGHT_M, DEFAULT_TX_ANTENNA_HEIGHT_M), (len(pairs),)) for model in models}
+
+    def records():
+        for start, stop in _stream_chunks(len(pairs), 4*len(models)):
+            ranges = {model: {direction: _json_values(values[start:stop]) for direction, values in directions.items()} for model, directions in summary.items()}
+            for p, (tx, rx) in enumerate(pairs[start:stop]):
+                for model, directions in ranges.items():
+                    yield {'tx': tx, 'rx': rx, 'model': model, 'uplink': directions['uplink'][p], 'downlink': directions['downlink'][p], 'bidirectional': directions['bidirectional'][p], 'valid': bool(valid[model][start + p])}
+
+    def column_arrays():
+        arrays = {
+                        'tx': np.repeat(np.array([tx for tx, _ in pairs], dtype=object), len(models)),
+                        'rx': np.repeat(np.array([rx for _, rx in pairs], dtype=object), len(models)),
+                        'model': np.tile(np.array(models, dtype=object), len(pairs)),
+                    }
+        arrays.update({direction: np.stack([np.broadcast_to(summary[model][direction], (len(pairs),)) for model in models], axis=1).reshape(-1) for direction in columns[3:6]})
+        arrays['valid'] = np.stack([valid[model] for model in models], axis=1).reshape(-1)
+        return arrays
+
+    return _stream_records(records(), columns, parameters.get('format', 'jsonl'), column_arrays)
+
+
+@server.route('/api/v1/sinr', methods=['POST'])
+def api_sinr():
+    devices = device_registry
+    parameters = _api_parameters()
+    technology = _api_technology(parameters)
+    band = parameters.get('band')
+    if band is not None and band not in TECHNOLOGY_BANDS[technology]:
+        raise APIError('band must be one of: {}'.format(', '.join(TECHNOLOGY_BANDS[technology])))
+    model = parameters.get('model')
+    if model is not None and model not in TECHNOLOGY_MODELS[technology]:
+        raise APIError('model must be one of: {}'.format(', '.join(TECHNOLOGY_MODELS[technology])))
+
+    nodes = parameters.get('nodes')
+    if not isinstance(nodes, list) or not all(isinstance(node, dict) for node in nodes):
+        raise APIError('nodes must be a list of {device, x, y[, z], channel, duty_cycle[, serving]} objects')
+    if len(nodes) > API_MAX_SINR_NODES:
+        raise APIError('At most {} nodes are allowed per request'.format(API_MAX_SINR_NODES))
+    node_devices = [node.get('device') for node in nodes]
+    _api_device_names(node_devices)
+    unknown = sorted({name for name in node_devices if name not in devices}, key=str)
+    if unknown:
+        raise APIError('Unknown devices: {}'.format(', '.join(map(str, unknown[:20]))), 404)
+    axes = ('x', 'y', 'z') if any('z' in node for node in nodes) else ('x', 'y')
+    try:
+        positions_m = np.array([[node.get(axis, 0) for axis in axes] for node in nodes], dtype=float).reshape(len(nodes), len(axes))
+        channels = np.array([node.get('channel', 0) for node in nodes], dtype=np.intp)
+        duty_cycles = np.array([node.get('duty_cycle', 1) for node in nodes], dtype=float)
+        serving = np.array([-1 if node.get('serving') is None else node['serving'] for node in nodes], dtype=np.intp)
+    except (TypeError, ValueError):
+        raise APIError('Node positions, channel, duty_cycle and serving must be numbers')
+    if not (np.isfinite(positions_m).all() and np.isfinite(duty_cycles).all()):
+        raise APIError('Node positions and duty_cycle must be finite numbers')
+
+    try:
+        site = sinr_nodes(devices, node_devices, positions_m, technology, band, channels, duty_cycles, serving)
+        result = interference_sinr(site, technology, model, noise_figure_dB=_api_number(parameters, 'noise_figure', DEFAULT_NOISE_FIGURE_DB))
+    except ValueError as error:
+        raise APIError(str(error))
+    columns = ['node', 'device', 'model', 'serving', 'signal_dBm', 'interference_dBm', 'noise_dBm', 'sinr_dB']
+    noise_dBm = _json_values(result['noise_dBm'])
+
+    def records():
+        for start, stop in _stream_chunks(len(node_devices), 3):
+            values = {key: _json_values(result[key][start:stop]) for key in ('signal_dBm', 'interference_dBm', 'sinr_dB')}
+            for n, device in enumerate(node_devices[start:stop]):
+                serving_node = int(result['serving'][start + n])
+                yield {
+                            'node': start + n,
+                            'device': device,
+                            'model': result['model'],
+                            'serving': serving_node if serving_node >= 0 else None,
+                            'signal_dBm': values['signal_dBm'][n],
+                            'interference_dBm': values['interference_dBm'][n],
+                            'noise_dBm': noise_dBm,
+                            'sinr_dB': values['sinr_dB'][n],
+                        }
+
+    def column_arrays():
+        num_nodes = len(node_devices)
+        return {
+                    'node': np.arange(num_nodes),
+                    'device': np.array(node_devices, dtype=object),
+                    'model': np.full(num_nodes, result['model'], dtype=object),
+                    'serving': np.ma.masked_less(result['serving'], 0),
+                    'signal_dBm': result['signal_dBm'],
+                    'interference_dBm': result['interference_dBm'],
+                    'noise_dBm': np.full(num_nodes, result['noise_dBm']),
+                    'sinr_dB': result['sinr_dB'],
+                }
+
+    return _stream_records(records(), columns, parameters.get('format', 'jsonl'), column_arrays)
+#--------------------------------------------------------------------------------------------------------------------------
+
+# Background job queue
+# Long sweeps over every device pair (margin tensors over long sub-GHz ranges or Monte Carlo
+# outage) run as jobs, never inside a request, so interactive callbacks never queue behind
+# them. Every job owns a directory entry in VERKPLOT_JOB_DIR: <id>.json holds its state and
+# progress and is rewritten atomically by the job process after every chunk of transmitters,
+# <id>.npy the float32 result tensor (written chunk by chunk through a memmap) and
+# <id>.cancel requests cancellation, checked between chunks. State lives on disk, so any
+# gunicorn worker can submit, report on or cancel a job.
+# Workers only write queued job states. One job runner process per host (whoever holds the
+# runner.lock flock, started on demand and exiting after VERKPLOT_JOB_RUNNER_IDLE seconds
+# without work) dispatches them to its pool of VERKPLOT_JOB_PROCESSES spawned, niced
+# processes. Admission is limited to VERKPLOT_JOB_MAX_ACTIVE queued or running jobs per host
+# and finished jobs (state and result) are deleted VERKPLOT_JOB_TTL seconds after they end.
+# Cancelled and failed jobs delete their partial result right away.
+#   POST /api/v1/jobs {kind, technology, ...}, GET|DELETE /api/v1/jobs/<id>,
+#   GET /api/v1/jobs/<id>/result (.npy, axes: tx, rx, model, distance)
+#--------------------------------------------------------------------------------------------------------------------------
+JOB_KINDS = {
+                'pair_sweep': 'Link margin sweep (dB)',
+                'pair_outage': 'Monte Carlo outage probability',
+            }
+JOB_DIRECTORY = os.environ.get('VERKPLOT_JOB_DIR', os.path.join(SPEC_CACHE_DIRECTORY, 'jobs'))
+JOB_PROCESSES = int(os.environ.get('VERKPLOT_JOB_PROCESSES', str(max(1, (os.cpu_count() or 2)//2))))
+JOB_CHUNK_VALUES = int(os.environ.get('VERKPLOT_JOB_CHUNK_VALUES', str(2**22)))
+JOB_MAX_VALUES = int(os.environ.get('VERKPLOT_JOB_MAX_VALUES', str(5*10**8)))
+JOB_MAX_SAMPLES = int(os.environ.get('VERKPLOT_JOB_MAX_SAMPLES', str(10**7)))
+JOB_MAX_ACTIVE = int(os.environ.get('VERKPLOT_JOB_MAX_ACTIVE', str(2*JOB_PROCESSES)))
+JOB_TTL_S = float(os.environ.get('VERKPLOT_JOB_TTL', str(24*3600)))
+JOB_RUNNER_IDLE_S = float(os.environ.get('VERKPLOT_JOB_RUNNER_IDLE', '60'))
+JOB_RUNNER_POLL_S = 0.5
+JOB_POLL_INTERVAL_MS = 1000
+JOB_FINAL_STATES = ('done', 'failed', 'cancelled')
+
+
+class JobQueueFull(ValueError):
+    pass
+
+
+def _job_path(job_id, extension):
+    return os.path.join(JOB_DIRECTORY, '{}.{}'.format(job_id, extension))
+
+
+def _write_job_state(state):
+    temp_path = '{}.{}.tmp'.format(_job_path(state['id'], 'json'), os.getpid())
+    with open(temp_path, 'w') as state_file:
+        json.dump(state, state_file)
+    os.replace(temp_path, _job_path(state['id'], 'json'))
+
+
+def read_job_state(job_id):
+    if not isinstance(job_id, str) or not job_id.isalnum():
+        return None
+    try:
+        with open(_job_path(job_id, 'json')) as state_file:
+            return json.load(state_file)
+    except (OSError, ValueError):
+        return None
+
+
+def job_states():
+    try:
+        names = os.listdir(JOB_DIRECTORY)
+    except OSError:
+        return []
+    states = (read_job_state(name[:-len('.json')]) for name in names if name.endswith('.json'))
+    return sorted((state for state in states if state is not None), key=lambda state: state['created'])
+
 
-                        dbc.Col(
-                                    [],
-                                    width = 1
-                                ),
-                                    
-                        # html.Hr(),
-                        html.Div(id='output_div'),
-                        ])
+def _remove_job_files(job_id, extensions=('npy', 'cancel')):
+    for extension in extensions:
+        try:
+            os.remove(_job_path(job_id, extension))
+        except OSError:
+            pass
 
-                    ])
-    
 
-    elif tab == 'tab-2':
-        return html.Div([
-                        html.Br(),
-                        html.Br(),
-                        html.Br(),
-                        html.Br(),
-                        html.Br(),
-                        html.Br(),
+# Open file holding an exclusive lock on JOB_DIRECTORY/<name>.lock (released by closing it),
+# None when blocking is off and another process holds the lock. Without fcntl (Windows)
+# there is only the single dev server process and the lock always succeeds.
+def _lock_job_directory(name, blocking=True):
+    os.makedirs(JOB_DIRECTORY, exist_ok=True)
+    lock_file = open(os.path.join(JOB_DIRECTORY, '{}.lock'.format(name)), 'a')
+    if fcntl is not None:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return None
+    return lock_file
 
-                        dcc.Markdown(['''
-                                    ###### **_VerkPlot_** is built to visualize communication link margins for various wireless technologies and devices in a simple and straightforward way. Therefore, any feedback to make this tool better is always welcome.
 
-                                    ###### If you come across any bugs with the tool or have any feature requests, please email - [vinay.hegde@verkada.com](https://outlook.office365.com/mail/) or send a message on [Slack](https://app.slack.com/client/T28NQT9F1/D04KKCF3KJ7?cdn_fallback=1).
-                                    '''], 
-                                    style={'color': 'black', 'font-weight': 'normal', "text-align": "center"}),
+# Deletes jobs that ended more than ttl seconds ago. Call with the queue lock held.
+def prune_jobs(ttl=JOB_TTL_S):
+    expired = time.time() - ttl
+    for state in job_states():
+        if state['status'] in JOB_FINAL_STATES and state.get('finished', state['created']) < expired:
+            _remove_job_files(state['id'], ('npy', 'cancel', 'json'))
 
-                        html.Br(),
-                        html.Br(),
-                        html.Br(),
-                        html.Br(),
 
-                        dcc.Markdown(['''
-                                    ###### **Notes from the developer**
+def _lower_job_priority():
+    try:
+        os.nice(10)
+    except (AttributeError, OSError):
+        pass
 
-                                    ###### **_VerkPlot_** is only a data visualization tool and requires that the input file be in a certain format.
 
-                                    ###### You can find all the device specification files in the below link. I will ensure that the latest version of the files are available for your use.
-                                      
-                                    ###### The following path loss models are used in the tool.
-                                    '''], style={'color': 'black', 'font-weight': 'normal', "text-align": "center"}),
+# Runs in a job process
+def _run_job(state, devices):
+    state.update(status='running', started=time.time())
+    _write_job_state(state)
+    parameters = state['parameters']
 
-                        html.Br(),          
-                        ], 
-                        # className = "twelve columns",
-                        style={'marginLeft':'90px', 'marginRight':'90px', 'text-align':'center'}
-                        )
-#--------------------------------------------------------------------------------------------------------------------------
+    try:
+        technology = parameters['technology']
+        distance_list = distance_sweep(parameters['distance_max'], parameters['num_points'], parameters['sampling'])
+        models = TECHNOLOGY_MODELS[technology]
+        shape = (len(devices), len(devices), len(models), len(distance_list))
+        result = np.lib.format.open_memmap(_job_path(state['id'], 'npy'), mode='w+', dtype=np.float32, shape=shape)
+        block = max(1, JOB_CHUNK_VALUES // int(np.prod(shape[1:])))
 
+        for start in range(0, len(devices), block):
+            if os.path.exists(_job_path(state['id'], 'cancel')):
+                state.update(status='cancelled', finished=time.time())
+                break
+            tx_rows = slice(start, start + block)
+            margin_dB, _ = batch_link_budget(devices, distance_list, technology, tx_rows=tx_rows)
+            if state['kind'] == 'pair_outage':
+                margin_dB = monte_carlo_outage(margin_dB, parameters['shadowing_sigma_dB'], parameters['fading'], parameters['rician_k_factor_dB'], parameters['num_samples'], seed=parameters['seed'] + start, processes=1)
+            result[tx_rows] = margin_dB
+            state['progress'] = min(1.0, (start + block)/len(devices))
+            _write_job_state(state)
+        else:
+            result.flush()
+            state.update(status='done', progress=1.0, finished=time.time(), shape=shape, models=list(models), devices=devices.names, distance=[float(distance_list[0]), float(distance_list[-1]), len(distance_list)])
+        del result
+    except Exception as error:
+        state.update(status='failed', error='{}: {}'.format(type(error).__name__, error), finished=time.time())
 
+    if state['status'] != 'done':
+        _remove_job_files(state['id'])
+    _write_job_state(state)
+    return state['status']
 
-#--------------------------------------------------------------------------------------------------------------------------
-@app.callback(Output('output_div', 'children'),
-            Input('tech_filter', 'value'))
 
+def _job_runner_command():
+    module = __name__ if __name__ != '__main__' else os.path.splitext(os.path.basename(__file__))[0]
+    return [sys.executable, '-c', 'import sys; sys.path.insert(0, {!r}); import {}; {}.run_job_runner()'.format(APP_DIRECTORY, module, module)]
 
-def render_layout(filtering):
-    if filtering == 'BLE':
-        return html.Div([
-                        dbc.Row([
-                            dbc.Col([
-                                html.Div([
-                                                html.Br(),
-                                                html.Br(),
-                                                # html.Br(),
-                                                html.Div([
-                                                                html.Label(
-                                                                                ['Transmit Device'], 
-                                                                                style={'color': 'black', 'font-weight': 'bold', "text-align": "left", 'padding-left':"15px"}
-                                                                            ),
-
-                                                                dcc.Dropdown(
-                                                                                    # df.Device.unique(),
-                                                                                    id = 'transmitter_dropdown',
-                                                                                    options=[{'label': str(x), 'value': x} for x in sorted(df['Device'])],
-                                                                                    value='NA',
-                                                                                    optionHeight = 25,
-                                                                                    #maxHeight = 300,
-                                                                                    disabled = False,
-                                                                                    multi = False,
-                                                                                    searchable = True,
-                                                                                    # search_value = '',
-                                                                                    placeholder = 'Please select your transmitter',
-                                                                                    clearable = True,
-                                                                                    # style={'width':"55%", 'padding-left':"15px"},
-                                                                                    #className = 'select_box',
-                                                                                    #persistence = 'True',
-                                                                                    #persistence_type = 'memory'
-                                                                            )
-                                                        ],
-                                                        # className = "six columns"
-                                                        ),
 
-                                                html.Br(),
-                                                html.Div([
-                                                                html.Label(
-                                                                                ['Receive Device'], 
-                                                                                style={'color': 'black', 'font-weight': 'bold', "text-align": "left", 'padding-left':"15px"}
-                                                                            ),
-                                
-                                                                dcc.Dropdown(
-                                                                                    # df.Device.unique(),
-                                                                                    id = 'receiver_dropdown',
-                                                                                    options=[{'label': str(x), 'value': x} for x in sorted(df['Device'].unique())],
-                                                                                    value='NA',
-                                                                                    optionHeight = 25,
-                                                                                    #maxHeight = 300,
-                                                                                    disabled = False,
-                                                                                    multi = False,
-                                                                                    searchable = True,
-                                                                                    # search_value = '',
-                                                                                    placeholder = 'Please select your receiver',
-                                                                                    clearable = True,
-                                                                                    # style={'width':"55%", 'padding-left':"15px"},
-                                                                                    # className = 'select_box',
-                                                                                    #persistence = 'True',
-                                                                                    #persistence_type = 'memory'
-                                                                            )
-                                                        ],
-                                                        # className = "six columns"
-                                                        ),
-                                        ], 
-                                        style={'marginLeft':'50px', 'marginRight':'100px', 'padding-left':"100px"}
-                                        )
-                                    ], 
-                                    width={'size': 3,  "offset": 0}
-                                    ),
+# Main loop of the host's job runner process (started by JobQueue.ensure_runner)
+def run_job_runner(processes=JOB_PROCESSES, idle_timeout=JOB_RUNNER_IDLE_S):
+    runner_lock = _lock_job_directory('runner', blocking=False)
+    if runner_lock is None:
+        return
+    executor = None
+    running = {}
+    idle_since = time.monotonic()
 
-                            dbc.Col([
-                                                html.Br(),
-                                                html.Br(),
-                                                html.Br(),
-                                                html.Br(),
-                                                html.Br(),
-                                                html.Label(
-                                                                ['Device Specifications'], 
-                                                                style={'color': 'black', 'font-weight': 'bold', "text-align": "center"}
-                                                            ),
-                                                html.Hr(),
-                                                html.Div(id='specification_table'),
-                                                
-                                    ], 
-                                    width=4),
+    # Jobs left running by a runner that died cannot be resumed
+    for state in job_states():
+        if state['status'] == 'running':
+            state.update(status='failed', error='The job runner stopped while the job was running', finished=time.time())
+            _remove_job_files(state['id'])
+            _write_job_state(state)
 
-                            dbc.Col([
-                                            html.Br(),
-                                            dcc.Graph(id='path_loss_graph'),
-                                    ], 
-                                    width=4),
+    while True:
+        for job_id, future in list(running.items()):
+            if not future.done():
+                continue
+            del running[job_id]
+            if future.exception() is not None:
+                # The job process died, later jobs need a new pool
+                state = read_job_state(job_id)
+                if state is not None and state['status'] not in JOB_FINAL_STATES:
+                    state.update(status='failed', error=repr(future.exception()), finished=time.time())
+                    _remove_job_files(job_id)
+                    _write_job_state(state)
+                if isinstance(future.exception(), BrokenProcessPool):
+                    executor = None
 
-                            dbc.Col([
-                                            html.Br(),
-                                    ], 
-                                    width=1),
-                        ]),
+        queue_lock = _lock_job_directory('queue')
+        try:
+            prune_jobs()
+            queued = [state for state in job_states() if state['status'] == 'queued' and state['id'] not in running]
+            if not queued and not running and time.monotonic() - idle_since > idle_timeout:
+                # Released under the queue lock, so a job queued from now on starts a new runner
+                runner_lock.close()
+                break
+        finally:
+            queue_lock.close()
 
+        if spec_file_signature() != spec_signature:
+            try:
+                reload_device_specifications()
+            except Exception:
+                server.logger.exception('Reloading device specifications for the job runner failed')
+        for state in queued[:max(processes - len(running), 0)]:
+            if executor is None:
+                executor = ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context('spawn'), initializer=_lower_job_priority)
+            state['spec_version'] = device_registry.version
+            running[state['id']] = executor.submit(_run_job, state, device_registry)
 
-                        html.Br(),
+        if queued or running:
+            idle_since = time.monotonic()
+        time.sleep(JOB_RUNNER_POLL_S)
 
+    if executor is not None:
+        executor.shutdown()
 
-                        dbc.Row([
-                            dbc.Col([
-                                            # drawFigure()
-                                    ], 
-                                    width=3),
-
-                            dbc.Col([
-                                            dcc.Graph(id='uplink_graph'),
-                            ], width=4,
-                            # style = {
-                            #         'border-right': '2px solid black',
-                            #         'border-left': '2px solid black',
-                            #         'border-top': '2px solid black',
-                            #         'border-bottom': '2px solid grey',
-                            #         # 'border-radius': '20px',
-                            #         # 'border rounded': '5px solid black',
-                            #         # 'margin': 'auto'
-                            #         }
-                                    ),
 
-                            dbc.Col([
-                                            dcc.Graph(id='downlink_graph'), 
-                            ], width=4,
-                            # style = {
-                            #         'border-right': '2px solid black',
-                            #         'border-left': '2px solid black',
-                            #         'border-top': '2px solid black',
-                            #         'border-bottom': '2px solid grey',
-                            #         # 'border-radius': '20px',
-                            #         # 'border rounded': '5px solid black',
-                            #         # 'margin': 'auto'
-                            #         }
-                                    ),
+class JobQueue:
+    def __init__(self, max_active=JOB_MAX_ACTIVE):
+        self.max_active = max_active
+        self._runner = None
+        self._lock = threading.Lock()
 
-                            dbc.Col([
-                                            # drawFigure() 
-                            ], width=1),
-                        ], 
-                        align='center'), 
-                        html.Br(),
-                        ])
+    # Starts the host's job runner unless one is running already
+    def ensure_runner(self):
+        with self._lock:
+            if self._runner is not None and self._runner.poll() is None:
+                return
+            runner_lock = _lock_job_directory('runner', blocking=False)
+            if runner_lock is None:
+                return
+            runner_lock.close()
+            self._runner = subprocess.Popen(_job_runner_command(), stdin=subprocess.DEVNULL)
 
+    def submit(self, kind, parameters, devices=None):
+        devices = device_registry if devices is None else devices
+        if kind not in JOB_KINDS:
+            raise ValueError('Unknown job kind: {}'.format(kind))
+        if parameters.get('technology') not in TECHNOLOGY_MODELS:
+            raise ValueError('Unknown technology: {}'.format(parameters.get('technology')))
 
-    elif filtering == 'Sub GHz':
-        return html.Div([
-                    dbc.Row([
-                        dbc.Col([
-                            html.Div([
-                                            html.Br(),
-                                            html.Br(),
-                                            html.Div([
-                                                            html.Label(
-                                                                            ['Transmit Device'], 
-                                                                            style={'color': 'black', 'font-weight': 'bold', "text-align": "left", 'padding-left':"15px"}
-                                                                        ),
+        # Empty inputs of the jobs panel arrive as None and fall back to the defaults
+        distance_max, num_points, sampling, _ = sanitize_distance_sweep(finite_number(parameters.get('distance_max') or DEFAULT_DISTANCE_MAX_M, 'distance_max'), finite_number(parameters.get('num_points') or DEFAULT_DISTANCE_POINTS, 'num_points'), parameters.get('sampling', 'linear'))
+        parameters = {
+                            'technology': parameters['technology'],
+                            'distance_max': distance_max,
+                            'num_points': num_points,
+                            'sampling': 'log' if sampling == 'adaptive' else sampling,
+                            'fading': parameters.get('fading', 'rayleigh'),
+                            'shadowing_sigma_dB': finite_number(parameters.get('shadowing_sigma_dB', 8.0), 'shadowing_sigma_dB'),
+                            'rician_k_factor_dB': finite_number(parameters.get('rician_k_factor_dB', DEFAULT_RICIAN_K_FACTOR_DB), 'rician_k_factor_dB'),
+                            'num_samples': int(finite_number(parameters.get('num_samples', MONTE_CARLO_SAMPLES), 'num_samples')),
+                            'seed': int(finite_number(parameters.get('seed', 0), 'seed')),
+                    }
+        if parameters['fading'] not in FADING_MODELS:
+            raise ValueError('Unknown fading model: {}'.format(parameters['fading']))
+        if not 1 <= parameters['num_samples'] <= JOB_MAX_SAMPLES:
+            raise ValueError('num_samples must be between 1 and {}'.format(JOB_MAX_SAMPLES))
+        if parameters['seed'] < 0:
+            raise ValueError('seed must not be negative')
+        num_values = len(devices)**2*len(TECHNOLOGY_MODELS[parameters['technology']])*num_points
+        if num_values > JOB_MAX_VALUES:
+            raise ValueError('Job too large: {} values, the limit is {}'.format(num_values, JOB_MAX_VALUES))
 
-                                                            dcc.Dropdown(
-                                                                                # df.Device.unique(),
-                                                                                id = 'transmitter_dropdown',
-                                                                                options=[{'label': str(x), 'value': x} for x in sorted(df['Device'])],
-                                                                                value='NA',
-                                                                                optionHeight = 25,
-                                                                                #maxHeight = 300,
-                                                                                disabled = False,
-                                                                                multi = False,
-                                                                                searchable = True,
-                                                                                # search_value = '',
-                                                                                placeholder = 'Please select your transmitter',
-                                                                                clearable = True,
-                                                                                # style={'width':"55%", 'padding-left':"15px"},
-                                                                                #className = 'select_box',
-                                                                                #persistence = 'True',
-                                                                                #persistence_type = 'memory'
-                                                                        )
-                                                    ],
-                                                    # className = "six columns"
-                                                    ),
+        state = {'id': uuid.uuid4().hex[:16], 'kind': kind, 'parameters': parameters, 'spec_version': devices.version, 'status': 'queued', 'progress': 0.0, 'created': time.time()}
+        with self._lock:
+            queue_lock = _lock_job_directory('queue')
+            try:
+                prune_jobs()
+                active = sum(job['status'] not in JOB_FINAL_STATES for job in job_states())
+                if active >= self.max_active:
+                    raise JobQueueFull('{} jobs are queued or running, the limit is {}. Retry once one of them finished.'.format(active, self.max_active))
+                _write_job_state(state)
+            finally:
+                queue_lock.close()
 
-                                            html.Br(),
-                                            html.Div([
-                                                            html.Label(
-                                                                            ['Receive Device'], 
-                                                                            style={'color': 'black', 'font-weight': 'bold', "text-align": "left", 'padding-left':"15px"}
-                                                                        ),
-                            
-                                                            dcc.Dropdown(
-                                                                                # df.Device.unique(),
-                                                                                id = 'receiver_dropdown',
-                                                                                options=[{'label': str(x), 'value': x} for x in sorted(df['Device'].unique())],
-                                                                                value='NA',
-                                                                                optionHeight = 25,
-                                                                                #maxHeight = 300,
-                                                                                disabled = False,
-                                                                                multi = False,
-                                                                                searchable = True,
-                                                                                # search_value = '',
-                                                                                placeholder = 'Please select your receiver',
-                                                                                clearable = True,
-                                                                                # style={'width':"55%", 'padding-left':"15px"},
-                                                                                # className = 'select_box',
-                                                                                #persistence = 'True',
-                                                                                #persistence_type = 'memory'
-                                                                        )
-                                                    ],
-                                                    # className = "six columns"
-                                                    ),
+        self.ensure_runner()
+        return state['id']
 
-                                            html.Br(),
-                                            html.Div([
-                                                            html.Label(
-                                                                            ['Transmit Antenna Height (in m)'], 
-                                                                            style={'color': 'black', 'font-weight': 'bold', "text-align": "left", 'padding-left':"15px"}
-                                                                        ),
+    # Current state, restarting the runner if it went away while the job is queued
+    def state(self, job_id):
+        state = read_job_state(job_id)
+        if state is not None and state['status'] == 'queued':
+            self.ensure_runner()
+        return state
 
-                                                            dcc.Dropdown(
-                                                                                # df.Device.unique(),
-                                                                                id = 'transmitter_antenna_height',
-                                                                                optionHeight = 25,
-                                                                                #maxHeight = 300,
-                                                                                disabled = True,
-                                                                                multi = False,
-                                                                                searchable = True,
-                                                                                search_value = '',
-                                                                                placeholder = 'Please select your receiver',
-                                                                                clearable = True,
-                                                                                # style={'width':"55%", 'padding-left':"15px"},
-                                                                                # className = 'select_box',
-                                                                                #persistence = 'True',
-                                                                                #persistence_type = 'memory'
-                                                                        )
-                                                    ],
-                                                    # className = "six columns"
-                                                    ),
+    def cancel(self, job_id):
+        state = read_job_state(job_id)
+        if state is None or state['status'] in JOB_FINAL_STATES:
+            return state
+        with open(_job_path(job_id, 'cancel'), 'w'):
+            pass
+        queue_lock = _lock_job_directory('queue')
+        try:
+            # A queued job is cancelled here, a running one by its job process
+            state = read_job_state(job_id)
+            if state is not None and state['status'] == 'queued':
+                state.update(status='cancelled', finished=time.time())
+                _remove_job_files(job_id)
+                _write_job_state(state)
+        finally:
+            queue_lock.close()
+        return read_job_state(job_id)
 
-                                            html.Br(),
-                                            html.Div([
-                                                            html.Label(
-                                                                            ['Receive Antenna Height (in m)'], 
-                                                                            style={'color': 'black', 'font-weight': 'bold', "text-align": "left", 'padding-left':"15px"}
-                                                                        ),
 
-                                                            dcc.Dropdown(
-                                                                                # df.Device.unique(),
-                                                                                id = 'receiver_antenna_height',
-                                                                                optionHeight = 25,
-                                                                                #maxHeight = 300,
-                                                                                disabled = True,
-                                                                                multi = False,
-                                                                                searchable = True,
-                                                                                search_value = '',
-                                                                                placeholder = 'Please select your receiver',
-                                                                                clearable = True,
-                                                                                # style={'width':"55%", 'padding-left':"15px"},
-                                                                                # className = 'select_box',
-                                                                                #persistence = 'True',
-                                                                                #persistence_type = 'memory'
-                                                                        )
-                                                    ],
-                                                    # className = "six columns"
-                                                    ),
-                                    ], 
-                                    style={'marginLeft':'50px', 'marginRight':'100px', 'padding-left':"100px"}
-                                    )
-                                ], 
-                                width={'size': 3,  "offset": 0}
-                                ),
+job_queue = JobQueue()
 
-                            dbc.Col([
-                                            html.Br(),
-                                            html.Br(),
-                                            html.Br(),
-                                            html.Br(),
-                                            html.Br(),
-                                            html.Label(
-                                                            ['Device Specifications'], 
-                                                            style={'color': 'black', 'font-weight': 'bold', "text-align": "center"}
-                                                        ),
-                                            html.Hr(),
-                                            html.Div(id='specification_table'),
-                                            
-                                ], 
-                                width=4),
 
-                            dbc.Col([
-                                            html.Br(),
-                                            dcc.Graph(id='path_loss_graph'),
-                                    ], 
-                                    width=4),
+# A forked child (gunicorn worker) does not own the parent's runner process handle
+def _reset_job_queue():
+    job_queue._runner = None
+    job_queue._lock = threading.Lock()
 
-                            dbc.Col([
-                                            html.Br(),
-                                    ], 
-                                    width=1),
-                        ]),
 
+# Only POSIX has fork
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_job_queue)
 
-                        html.Br(),
 
+@server.route('/api/v1/jobs', methods=['POST'])
+def api_submit_job():
+    parameters = _api_parameters()
+    try:
+        job_id = job_queue.submit(parameters.get('kind'), parameters)
+    except JobQueueFull as error:
+        raise APIError(str(error), 429)
+    except (ValueError, TypeError) as error:
+        raise APIError(str(error))
+    return jsonify(read_job_state(job_id)), 202
 
-                        dbc.Row([
-                            dbc.Col([
-                                            # drawFigure()
-                                    ], 
-                                    width=3),
 
-                            dbc.Col([
-                                            dcc.Graph(id='uplink_graph'),
-                            ], width=4),
+@server.route('/api/v1/jobs/<job_id>', methods=['GET', 'DELETE'])
+def api_job(job_id):
+    state = job_queue.cancel(job_id) if request.method == 'DELETE' else job_queue.state(job_id)
+    if state is None:
+        raise APIError('Unknown job: {}'.format(job_id), 404)
+    return jsonify(state)
 
-                            dbc.Col([
-                                            dcc.Graph(id='downlink_graph'), 
-                            ], width=4),
 
-                            dbc.Col([
-                                            # drawFigure() 
-                            ], width=1),
-                        ], 
-                        align='center'), 
-                        html.Br(),
-                        ])
-    
+@server.route('/api/v1/jobs/<job_id>/result', methods=['GET'])
+def api_job_result(job_id):
+    state = read_job_state(job_id)
+    if state is None:
+        raise APIError('Unknown job: {}'.format(job_id), 404)
+    if state['status'] != 'done':
+        raise APIError('Job {} is {}'.format(job_id, state['status']), 409)
+    return send_file(os.path.abspath(_job_path(job_id, 'npy')), mimetype='application/octet-stream', as_attachment=True, download_name='{}_{}.npy'.format(state['kind'], job_id))
+#--------------------------------------------------------------------------------------------------------------------------
 
-    elif filtering == 'wifi':
-        return html.Div([
-                                html.Br(),
-                                html.Br(),
-                                html.Div(
-                                                ['WiFi link budget is currently not supported'], 
-                                                style={'color': 'black', 'font-weight': 'bold', "text-align": "center"}
-                                        ),
-                                html.Div(
-                                                ['VerkPlot team is happy to integrate it depending on user feedback'], 
-                                                style={'color': 'black', 'font-weight': 'bold', "text-align": "center"}
-                                        )
-                        ])
+
+
+#--------------------------------------------------------------------------------------------------------------------------
+@app.callback(
+    Output('job_store', 'data'),
+    [Input('job_start_button', 'n_clicks'),
+     Input('job_cancel_button', 'n_clicks')
+    ],
+    [State('job_kind', 'value'),
+     State('matrix_tech_filter', 'value'),
+     State('job_distance_max_input', 'value'),
+     State('job_distance_points_input', 'value'),
+     State('job_store', 'data')
+    ],
+    prevent_initial_call=True
+)
+
+
+def control_job(start_clicks, cancel_clicks, kind, technology_sel, distance_max, num_points, job_data):
+            if dash.ctx.triggered_id == 'job_cancel_button':
+                if not job_data:
+                    raise PreventUpdate
+                job_queue.cancel(job_data['id'])
+                return job_data
+
+            try:
+                job_id = job_queue.submit(kind, {'technology': technology_sel, 'distance_max': distance_max, 'num_points': num_points, 'sampling': 'log'})
+            except ValueError as error:
+                return {'id': None, 'error': str(error)}
+            return {'id': job_id}
 #--------------------------------------------------------------------------------------------------------------------------
 
 
 
 #--------------------------------------------------------------------------------------------------------------------------
 @app.callback(
-    Output('path_loss_graph', 'figure'),
-    Output('uplink_graph', 'figure'),
-    Output('downlink_graph', 'figure'),
-    Output('specification_table', 'children'),
-    [Input('transmitter_dropdown', 'value'),
-     Input('receiver_dropdown', 'value'),
-     Input('tech_filter', 'value')
+    Output('job_progress', 'value'),
+    Output('job_progress', 'label'),
+    Output('job_status', 'children'),
+    Output('job_interval', 'disabled'),
+    [Input('job_interval', 'n_intervals'),
+     Input('job_store', 'data')
     ]
 )
 
 
-def update_datatable(tx_dropdown, rx_dropdown, technology_sel):
-            if tx_dropdown and rx_dropdown:
-                # #Transmitter parameters filtered
-                df_transmitter = df[df['Device'] == tx_dropdown]
-                df_transmitter.reset_index(drop=True, inplace=True)
-
-                tx_power_transmitter = df_transmitter.loc[:, 'Transmit Power (dBm)'].tolist()
-                ant_efficiency_transmitter = df_transmitter.loc[:, 'Antenna Efficiency (dB)'].tolist()
-                rx_sensitivity_transmitter = df_transmitter.loc[:, 'Receive Sensitivity (dBm)'].tolist()
-
-                # #Receiver parameters filtered
-                df_receiver = df[df['Device'] == rx_dropdown]
-                df_receiver.reset_index(drop=True, inplace=True)
-                tx_power_receiver = df_receiver.loc[:,'Transmit Power (dBm)'].tolist()
-                ant_efficiency_receiver = df_receiver.loc[:,'Antenna Efficiency (dB)'].tolist()
-                rx_sensitivity_receiver = df_receiver.loc[:,'Receive Sensitivity (dBm)'].tolist()
-
-                # ======================== Plotly Table
-                df_merge = pd.concat([df_transmitter, df_receiver], axis=0)
-                df_merge.reset_index(drop=True, inplace=True)
-
-                tx_device_parameters = {'tx_power' : tx_power_transmitter, 'ant_efficiency': ant_efficiency_transmitter, 'rx_sensitivity': rx_sensitivity_transmitter}
-                rx_device_parameters = {'tx_power' : tx_power_receiver, 'ant_efficiency': ant_efficiency_receiver, 'rx_sensitivity': rx_sensitivity_receiver}
-
-                distance_meter = 100
-                # frequency_MHz = 915
-                height_TX = 1
-                height_RX = 2.9
-                distance_target = 100
-
-                distance_list = []
-                for i in range(0,distance_target+100, 1):
-                    distance_list.append(i)
-
-# Uplink calculations
-#--------------------------------------------------------------------------------------------------------------------------
-                if technology_sel == 'Sub GHz':
-                    frequency_MHz = 915
-                    FSPL_uplink, ITU_Indoor_PL_subG_uplink, Okumura_Hata_PL_uplink = subG_propagation_models(distance_list, frequency_MHz, height_TX, height_RX)
-                    rssi_FSPL_uplink = RSSI_calc(distance_list, tx_device_parameters['tx_power'][0], tx_device_parameters['ant_efficiency'][0], rx_device_parameters['ant_efficiency'][0], FSPL_uplink)
-                    rssi_ITU_Indoor_PL_subG_uplink = RSSI_calc(distance_list, tx_device_parameters['tx_power'][0], tx_device_parameters['ant_efficiency'][0], rx_device_parameters['ant_efficiency'][0], ITU_Indoor_PL_subG_uplink)
-                    rssi_Okumura_Hata_PL_uplink = RSSI_calc(distance_list, tx_device_parameters['tx_power'][0], tx_device_parameters['ant_efficiency'][0], rx_device_parameters['ant_efficiency'][0], Okumura_Hata_PL_uplink)
-                    # print('subG Propagation Model Uplink')
-                    # print(FSPL_uplink, ITU_Indoor_PL_subG_uplink, Okumura_Hata_PL_uplink)
-
-                elif technology_sel == 'BLE':
-                    frequency_MHz = 2440
-                    FSPL_uplink, ITU_Indoor_PL_BLE_uplink  = BLE_propagation_models(distance_list, frequency_MHz)
-                    rssi_FSPL_uplink = RSSI_calc(distance_list, tx_device_parameters['tx_power'][0], tx_device_parameters['ant_efficiency'][0], rx_device_parameters['ant_efficiency'][0], FSPL_uplink)
-                    rssi_ITU_Indoor_PL_BLE_uplink = RSSI_calc(distance_list, tx_device_parameters['tx_power'][0], tx_device_parameters['ant_efficiency'][0], rx_device_parameters['ant_efficiency'][0], ITU_Indoor_PL_BLE_uplink)
-                    # print('WiFi Propagation Model Downlink')
-                    # print(FSPL_uplink, ITU_Indoor_PL_BLE_uplink)
-
-                else:
-                    pass
-#--------------------------------------------------------------------------------------------------------------------------
-
-# Downlink calculations
-#--------------------------------------------------------------------------------------------------------------------------
-                if technology_sel == 'Sub GHz':
-                    frequency_MHz = 915
-                    FSPL_downlink, ITU_Indoor_PL_subG_downlink, Okumura_Hata_PL_downlink = subG_propagation_models(distance_list, frequency_MHz, height_RX, height_TX)
-                    rssi_FSPL_downlink = RSSI_calc(distance_list, rx_device_parameters['tx_power'][0], rx_device_parameters['ant_efficiency'][0], tx_device_parameters['ant_efficiency'][0], FSPL_downlink)
-                    rssi_ITU_Indoor_PL_subG_downlink = RSSI_calc(distance_list, rx_device_parameters['tx_power'][0], rx_device_parameters['ant_efficiency'][0], tx_device_parameters['ant_efficiency'][0], ITU_Indoor_PL_subG_downlink)
-                    rssi_Okumura_Hata_PL_downlink = RSSI_calc(distance_list, rx_device_parameters['tx_power'][0], rx_device_parameters['ant_efficiency'][0], tx_device_parameters['ant_efficiency'][0], Okumura_Hata_PL_downlink)
-                    # print('subG Propagation Model Downlink')
-                    # print(FSPL_downlink, ITU_Indoor_PL_subG_downlink, Okumura_Hata_PL_downlink)
-
-                elif technology_sel == 'BLE':
-                    frequency_MHz = 2440
-                    FSPL_downlink, ITU_Indoor_PL_BLE_downlink  = BLE_propagation_models(distance_list, frequency_MHz)
-                    rssi_FSPL_downlink = RSSI_calc(distance_list, rx_device_parameters['tx_power'][0], rx_device_parameters['ant_efficiency'][0], tx_device_parameters['ant_efficiency'][0], FSPL_downlink)
-                    rssi_ITU_Indoor_PL_BLE_downlink = RSSI_calc(distance_list, rx_device_parameters['tx_power'][0], rx_device_parameters['ant_efficiency'][0], tx_device_parameters['ant_efficiency'][0], ITU_Indoor_PL_BLE_downlink)
-                    # print('WiFi Propagation Model Downlink')
-                    # print(FSPL_downlink, ITU_Indoor_PL_BLE_downlink)
-
-                else:
-                    pass
-#--------------------------------------------------------------------------------------------------------------------------
+def poll_job(n_intervals, job_data):
+            if not job_data:
+                return 0, '', '', True
+            if not job_data.get('id'):
+                return 0, '', job_data.get('error', ''), True
 
-# Path loss, uplink and downlink RSSI plots
+            state = job_queue.state(job_data['id'])
+            if state is None:
+                return 0, '', 'Job {} not found'.format(job_data['id']), True
+
+            progress = round(100*state['progress'])
+            status = '{} - {} ({})'.format(JOB_KINDS[state['kind']], state['status'].upper(), state['id'])
+            if state['status'] == 'done':
+                status = [status, ' - ', html.A('Download result (.npy, tx x rx x model x distance)', href='/api/v1/jobs/{}/result'.format(state['id']))]
+            elif state['status'] == 'failed':
+                status = '{}: {}'.format(status, state.get('error', ''))
+
+            return progress, '{}%'.format(progress), status, state['status'] in JOB_FINAL_STATES
 #--------------------------------------------------------------------------------------------------------------------------
-                if technology_sel == 'Sub GHz':
-
-
-                    df_propagation_values = pd.DataFrame({
-                                                        'distance':distance_list,
-                                                        'FSPL_uplink':FSPL_uplink,
-                                                        'FSPL_downlink':FSPL_downlink,
-                                                        'ITU_Indoor_PL_subG_uplink':ITU_Indoor_PL_subG_uplink,
-                                                        'ITU_Indoor_PL_subG_downlink':ITU_Indoor_PL_subG_downlink,
-                                                        'Okumura_Hata_PL_uplink':Okumura_Hata_PL_uplink,
-                                                        'Okumura_Hata_PL_downlink':Okumura_Hata_PL_downlink,
-                                                        'rssi_FSPL_uplink':rssi_FSPL_uplink,
-                                                        'rssi_FSPL_downlink':rssi_FSPL_downlink,
-                                                        'rssi_ITU_Indoor_PL_subG_uplink':rssi_ITU_Indoor_PL_subG_uplink,
-                                                        'rssi_ITU_Indoor_PL_subG_downlink':rssi_ITU_Indoor_PL_subG_downlink,
-                                                        'rssi_Okumura_Hata_PL_uplink':rssi_Okumura_Hata_PL_uplink,
-                                                        'rssi_Okumura_Hata_PL_downlink':rssi_Okumura_Hata_PL_downlink
-                                                        })
-                    fig1 = px.line(df_propagation_values, x='distance', y=['FSPL_uplink', 'ITU_Indoor_PL_subG_uplink', 'Okumura_Hata_PL_uplink', 'FSPL_downlink', 'ITU_Indoor_PL_subG_downlink', 'Okumura_Hata_PL_downlink'], title="Path Loss - subG")
-                    # fig1 = px.line(df_propagation_values, x='distance', y=['FSPL_uplink', 'FSPL_downlink'], title="Path Loss - subG")
-                    fig2 = px.line(df_propagation_values, x='distance', y=['rssi_FSPL_uplink', 'rssi_ITU_Indoor_PL_subG_uplink', 'rssi_Okumura_Hata_PL_uplink'], title="RSSI uplink - subG")
-                    fig3 = px.line(df_propagation_values, x='distance', y=['rssi_FSPL_downlink', 'rssi_ITU_Indoor_PL_subG_downlink', 'rssi_Okumura_Hata_PL_downlink'], title="RSSI downlink - subG")
-
-                elif technology_sel == 'BLE':
-                    df_propagation_values = pd.DataFrame({
-                                                        'distance':distance_list,
-                                                        'FSPL_uplink':FSPL_uplink,
-                                                        'FSPL_downlink':FSPL_downlink,
-                                                        'ITU_Indoor_PL_BLE_uplink':ITU_Indoor_PL_BLE_uplink,
-                                                        'ITU_Indoor_PL_BLE_downlink':ITU_Indoor_PL_BLE_downlink,
-                                                        'rssi_FSPL_uplink':rssi_FSPL_uplink,
-                                                        'rssi_FSPL_downlink':rssi_FSPL_downlink,
-                                                        'rssi_ITU_Indoor_PL_BLE_uplink':rssi_ITU_Indoor_PL_BLE_uplink,
-                                                        'rssi_ITU_Indoor_PL_BLE_downlink':rssi_ITU_Indoor_PL_BLE_downlink
-                                                        })
-                    
-                    # if df_propagation_values.empty:
-                    #     raise PreventUpdate
-                    
-                    fig1 = px.line(df_propagation_values, x='distance', y=['FSPL_uplink', 'ITU_Indoor_PL_BLE_uplink', 'FSPL_downlink', 'ITU_Indoor_PL_BLE_downlink'], title="Path Loss - BLE")
-                    # fig1 = px.line(df_propagation_values, x='distance', y=['FSPL_uplink', 'FSPL_downlink'], title="Path Loss - BLE")
-                    fig2 = px.line(df_propagation_values, x='distance', y=['rssi_FSPL_uplink', 'rssi_ITU_Indoor_PL_BLE_uplink'], title="RSSI uplink- BLE")
-                    # fig2 = px.line(df_propagation_values, x='distance', y=['rssi_FSPL_uplink'], title="RSSI uplink- BLE")
-                    fig3 = px.line(df_propagation_values, x='distance', y=['rssi_FSPL_downlink', 'rssi_ITU_Indoor_PL_BLE_downlink'], title="RSSI downlink - BLE")
-                    # fig3 = px.line(df_propagation_values, x='distance', y=['rssi_FSPL_downlink'], title="RSSI downlink - BLE")
-
-
-                # fig1.add_hline(y=rx_sensitivity_receiver[0], line_dash='dash', annotation_text="Device Sensitivity Spec", annotation_position="top right") #, line_color='Red')
-                fig1.add_vline(x=distance_target, line_dash='dash', annotation_text="Target Distance = {} m".format(distance_target), annotation_position="bottom right", annotation_font = {'size' : 15})
-                fig1.update_xaxes(title = 'Distance (m)')
-                fig1.update_yaxes(title = 'Path Loss (dB)')
-                # fig1.update_layout(legend=dict(
-                #     orientation="h",
-                #     # entrywidth=70,
-                #     yanchor="bottom",
-                #     y=1.02,
-                #     xanchor="right",
-                #     x=1
-                #     ))
 
+# Production serving support
+# gunicorn.conf.py preloads this module in the gunicorn master and calls warm_up() before
+# any worker is forked. The spec table, device registry, default path loss tables, tab
+# and link budget layouts and the Dash index/layout/dependency responses are then built
+# once and inherited copy-on-write by every worker instead of being rebuilt per worker.
+#--------------------------------------------------------------------------------------------------------------------------
+def warm_up():
+    for technology, frequency_MHz in TECHNOLOGY_FREQUENCY_MHZ.items():
+        for sampling in ('linear', 'log'):
+            path_loss_table(technology, frequency_MHz, DEFAULT_TX_ANTENNA_HEIGHT_M, DEFAULT_RX_ANTENNA_HEIGHT_M, DEFAULT_DISTANCE_MAX_M, DEFAULT_DISTANCE_POINTS, sampling)
+        link_budget_layout(technology, device_registry)
+    device_search_index(device_registry)
+    for tab in ('tab-1', 'tab-2', 'tab-3', 'tab-4'):
+        tab_layout(tab, device_registry)
 
-                return (fig1), (fig2), (fig3), [
-                    dash_table.DataTable(
-                                                        id='datatable-interactivity',
-                                                        columns=[
-                                                                    # {"name": i, "id": i, "deletable": True, "selectable": True, "hideable": True}
-                                                                    {"name": i, "id": i} for i in df.columns
-                                                                ],
-                                                        data=df_merge.to_dict('records'),  # the contents of the table
-                                                    #     # editable=True,              # allow editing of data inside all cells
-                                                    #     filter_action="native",     # allow filtering of data by user ('native') or not ('none')
-                                                    #     sort_action="native",       # enables data to be sorted per-column by user or not ('none')
-                                                    #     sort_mode="single",         # sort across 'multi' or 'single' columns
-                                                    #     # column_selectable="multi",  # allow users to select 'multi' or 'single' columns
-                                                    #     # row_selectable="multi",     # allow users to select 'multi' or 'single' rows
-                                                    #     # row_deletable=True,         # choose if user can delete a row (True) or not (False)
-                                                    #     selected_columns=[],        # ids of columns that user selects
-                                                    #     selected_rows=[],           # indices of rows that user selects
-                                                    #     # page_action="native",       # all data is passed to the table up-front or not ('none')
-                                                    #     # page_current=0,             # page number that user is on
-                                                    #     # page_size=6,                # number of rows visible per page
-                                                        # style_cell={                # ensure adequate header width when text is shorter than cell's text
-                                                        #     'minWidth': 100, 'maxWidth': 100, 'width': 100,
-                                                        #     'textAlign': 'center'
-                                                        # },
-                                                        style_cell={'textAlign': 'center'},
-                                                        style_header = {'fontWeight': 'bold', 'backgroundColor': 'rgb(230, 230, 230)', 'border': '1px solid black'},
-                                                        style_data={'border': '1px solid black'},
-                                                    #     style_data={                # overflow cells' content into multiple lines
-                                                    #         'whiteSpace': 'normal',
-                                                    #         'height': 'auto'
-                                                    #     }
-                                                    ),
-        ]  
-                
-                       
-            elif not tx_dropdown or not rx_dropdown:
-                return {}, {}, {}, {}
-#--------------------------------------------------------------------------------------------------------------------------  
+    client = server.test_client()
+    for route in ('', '_dash-layout', '_dash-dependencies'):
+        client.get(app.config.requests_pathname_prefix + route)
+#--------------------------------------------------------------------------------------------------------------------------
 
 # Run App
 #--------------------------------------------------------------------------------------------------------------------------
 if __name__ == '__main__':
+    start_spec_watcher()
     app.run_server(debug=False)
 #--------------------------------------------------------------------------------------------------------------------------